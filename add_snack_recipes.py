@@ -1,5 +1,9 @@
 import sqlite3
 import json
+from database import RecipeDatabase, recipe_content_hash
+
+# Make sure the schema (content_hash column and unique index) is current
+RecipeDatabase('telugu_recipes.db')
 
 # Connect to the database
 conn = sqlite3.connect('telugu_recipes.db')
@@ -96,11 +100,15 @@ snack_recipes = [
 
 # Function to add a recipe to the database
 def add_recipe(recipe):
-    # Insert into recipes table
+    # Insert into recipes table; a recipe that is already stored is skipped
+    content_hash = recipe_content_hash(recipe['name'], recipe['ingredients'])
     cursor.execute(
-        "INSERT INTO recipes (name, category, ingredients, instructions, cooking_time, tags) VALUES (?, ?, ?, ?, ?, ?)",
-        (recipe['name'], recipe['category'], json.dumps(recipe['ingredients']), recipe['instructions'], recipe['cooking_time'], json.dumps(recipe['tags']))
+        "INSERT OR IGNORE INTO recipes (name, category, ingredients, instructions, cooking_time, tags, content_hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (recipe['name'], recipe['category'], json.dumps(recipe['ingredients']), recipe['instructions'], recipe['cooking_time'], json.dumps(recipe['tags']), content_hash)
     )
+    if cursor.rowcount == 0:
+        cursor.execute("SELECT id FROM recipes WHERE content_hash = ?", (content_hash,))
+        return cursor.fetchone()[0]
     
     # Get the ID of the inserted recipe
     recipe_id = cursor.lastrowid
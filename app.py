@@ -1,42 +1,133 @@
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, Response, render_template, request, jsonify, redirect, url_for, make_response
+from werkzeug.http import is_resource_modified
 from database import RecipeDatabase
 from nutrition_api import NutritionAPI
 from recipe_processor import RecipeProcessor
 from diet_generator import TeluguDietGenerator
-from config import FLASK_SECRET_KEY, FLASK_DEBUG
+from plan_cache import PlanCache
+from job_queue import JobQueue
+from fast_json import FastJSONProvider
+from compression import ResponseCompressor
+from recipe_export import iter_ndjson, iter_csv
+from recipe_table import PlanSummary
+from batch_planner import BatchPlanner
+from config import (FLASK_SECRET_KEY, FLASK_DEBUG, API_CACHE_MAX_AGE,
+                    PLAN_BATCH_MAX, PLAN_EVENTS_POLL_INTERVAL, PLAN_EVENTS_HEARTBEAT, WEB_PROCESSES)
+from datetime import date
+from functools import wraps
 import json
+import time
+import secrets
 
 app = Flask(__name__)
 app.secret_key = FLASK_SECRET_KEY
 app.debug = FLASK_DEBUG
+app.json = FastJSONProvider(app)
+ResponseCompressor(app)
 
 # Initialize components
 db = RecipeDatabase()
-nutrition_api = NutritionAPI()
+# Request threads never wait on the API quota, which every web worker shares
+nutrition_api = NutritionAPI(blocking=False, processes=WEB_PROCESSES)
 processor = RecipeProcessor()
 diet_generator = TeluguDietGenerator()
+plan_cache = PlanCache()
+jobs = JobQueue()
+batch_planner = BatchPlanner(generator=diet_generator, processes=WEB_PROCESSES)
+
+def _parse_seed(value):
+    """Optional integer seed for reproducible diet plans"""
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+def _request_seed(value):
+    """(seed, whether the client chose it): a request's seed, or a freshly drawn one
+    returned with the plan so it can be replayed"""
+    seed = _parse_seed(value)
+    if seed is None:
+        return secrets.randbelow(2 ** 32), False
+    return seed, True
+
+def _plan_key(user_input, seed, start_date):
+    """Plan cache key of a request, from its parsed preferences"""
+    preferences = diet_generator._parse_user_input(user_input)
+    return plan_cache.make_key(preferences, seed, start_date, diet_generator.catalogue_version())
+
+def _cached_diet_menu(user_input, seed, seeded=True, on_day=None):
+    """Generate a diet menu, reusing a cached plan for identical requests on the same day.
+
+    Only plans for a seed the client chose (`seeded`) are cached: a drawn
+    seed is never asked for again, so its plan could never be a hit.
+    """
+    start_date = date.today()
+    key = _plan_key(user_input, seed, start_date) if seeded else None
+
+    diet_plan = plan_cache.get(key) if seeded else None
+    if diet_plan is None:
+        diet_plan = diet_generator.generate_diet_menu(user_input, seed=seed, start_date=start_date, on_day=on_day)
+        if not diet_plan.get('error'):
+            diet_plan['seed'] = seed
+            if seeded:
+                plan_cache.put(key, diet_plan)
+    elif on_day is not None:
+        for day_key, day_data in diet_plan['meal_plan'].items():
+            on_day(day_key, day_data)
+    return diet_plan
+
+def _plan_job(user_input, seed, seeded=True, progress=None):
+    """Background job generating a diet plan, publishing each day as an event"""
+    total = diet_generator._parse_user_input(user_input)['duration']
+
+    def on_day(day_key, day_data):
+        progress(day_data['day'], total, event=dict(day_data, date_key=day_key))
+
+    diet_plan = _cached_diet_menu(user_input, seed, seeded, on_day=on_day)
+    if diet_plan.get('error'):
+        raise RuntimeError(diet_plan['error'])
+    return diet_plan
+
+def catalogue_cached(view):
+    """Tag a read-only API response with the catalogue version and answer 304 while it is unchanged"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        version, last_modified = db.get_catalogue_version()
+        etag = f"{version}-{int(last_modified.timestamp())}"
+        if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            response = make_response(view(*args, **kwargs))
+        else:
+            # Skip the query and serialization entirely
+            response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.cache_control.public = True
+        response.cache_control.max_age = API_CACHE_MAX_AGE
+        response.cache_control.must_revalidate = True
+        return response
+    return wrapper
 
 @app.route('/')
 def index():
     """Main page with search and recipe display"""
-    recipes = db.get_all_recipes()
+    recipes = db.get_all_recipes(with_text=False)
     return render_template('index.html', recipes=recipes)
 
 @app.route('/search')
 def search():
     """Search recipes"""
     query = request.args.get('q', '')
+    # The result list shows no instructions, so they are not read
     if query:
-        recipes = db.search_recipes(query)
+        recipes = db.search_recipes(query, with_text=False)
     else:
-        recipes = db.get_all_recipes()
+        recipes = db.get_all_recipes(with_text=False)
     return render_template('search_results.html', recipes=recipes, query=query)
 
 @app.route('/recipe/<int:recipe_id>')
 def recipe_detail(recipe_id):
     """Show detailed recipe information"""
-    recipes = db.get_all_recipes()
-    recipe = next((r for r in recipes if r['id'] == recipe_id), None)
+    recipe = db.get_recipe_detail(recipe_id)
     if recipe:
         return render_template('recipe_detail.html', recipe=recipe)
     return redirect(url_for('index'))
@@ -64,12 +155,14 @@ def add_recipe():
     return render_template('add_recipe.html')
 
 @app.route('/api/recipes')
+@catalogue_cached
 def api_recipes():
     """API endpoint to get all recipes"""
     recipes = db.get_all_recipes()
     return jsonify(recipes)
 
 @app.route('/api/search')
+@catalogue_cached
 def api_search():
     """API endpoint to search recipes"""
     query = request.args.get('q', '')
@@ -80,36 +173,61 @@ def api_search():
     return jsonify(recipes)
 
 @app.route('/api/categories')
+@catalogue_cached
 def api_categories():
     """API endpoint to get all categories"""
     categories = db.get_categories()
     return jsonify(categories)
 
 @app.route('/api/tags')
+@catalogue_cached
 def api_tags():
     """API endpoint to get all tags"""
     tags = db.get_tags()
     return jsonify(tags)
 
 @app.route('/api/recipes/category/<category>')
+@catalogue_cached
 def api_recipes_by_category(category):
     """API endpoint to get recipes by category"""
     recipes = db.get_recipes_by_category(category)
     return jsonify(recipes)
 
 @app.route('/api/recipes/tags')
+@catalogue_cached
 def api_recipes_by_tags():
     """API endpoint to get recipes by tags"""
     tags = request.args.getlist('tags')
     recipes = db.get_recipes_by_tags(tags)
     return jsonify(recipes)
 
+@app.route('/api/recipes/export')
+def api_export_recipes():
+    """API endpoint streaming every recipe as NDJSON (default) or CSV.
+    
+    Recipes come in id order; pass the last id received as after_id to
+    resume an interrupted export.  instructions=0 leaves out the text.
+    """
+    export_format = request.args.get('format', 'ndjson')
+    after_id = request.args.get('after_id', 0, type=int)
+    with_text = request.args.get('instructions', '1') != '0'
+    
+    recipes = db.iter_recipes(after_id=after_id, with_text=with_text)
+    if export_format == 'ndjson':
+        return Response(iter_ndjson(recipes, app.json.dumps_bytes), mimetype='application/x-ndjson')
+    if export_format == 'csv':
+        # A resumed export continues the same file, so it gets no second header
+        return Response(iter_csv(recipes, header=after_id == 0), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename=recipes.csv'})
+    return jsonify({'error': f'Unknown export format: {export_format}'}), 400
+
 @app.route('/advanced_search')
 def advanced_search():
     """Advanced search page"""
     return render_template('advanced_search.html')
 
 @app.route('/api/advanced_search')
+@catalogue_cached
 def api_advanced_search():
     """API endpoint for advanced search with multiple filters"""
     query = request.args.get('q', '')
@@ -151,22 +269,31 @@ def api_advanced_search():
 
 @app.route('/initialize')
 def initialize():
-    """Initialize the database with sample recipes"""
-    processor.process_pulihora_recipes()
-    return redirect(url_for('index'))
+    """Initialize the database with sample recipes in a background job"""
+    job_id = jobs.submit('initialize', processor.process_pulihora_recipes)
+    return redirect(url_for('index', job=job_id))
 
 @app.route('/initialize_all')
 def initialize_all():
-    """Initialize the database with all Telugu recipes"""
-    processor.process_all_telugu_recipes()
-    return redirect(url_for('index'))
+    """Initialize the database with all Telugu recipes in a background job"""
+    job_id = jobs.submit('initialize_all', processor.process_all_telugu_recipes)
+    return redirect(url_for('index', job=job_id))
+
+@app.route('/api/jobs/<job_id>')
+def api_job_status(job_id):
+    """API endpoint for the status and progress of a background job"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
 
 @app.route('/diet_menu', methods=['GET', 'POST'])
 def diet_menu():
     """Generate personalized diet menu"""
     if request.method == 'POST':
         user_input = request.form.get('user_input', '')
-        diet_plan = diet_generator.generate_diet_menu(user_input)
+        seed, seeded = _request_seed(request.form.get('seed'))
+        diet_plan = _cached_diet_menu(user_input, seed, seeded)
         return render_template('diet_menu.html', diet_plan=diet_plan, user_input=user_input)
     
     return render_template('diet_menu.html')
@@ -176,10 +303,171 @@ def api_generate_diet():
     """API endpoint to generate diet menu"""
     data = request.get_json()
     user_input = data.get('user_input', '')
+    seed, seeded = _request_seed(data.get('seed'))
     
-    diet_plan = diet_generator.generate_diet_menu(user_input)
+    diet_plan = _cached_diet_menu(user_input, seed, seeded)
     return jsonify(diet_plan)
 
+@app.route('/api/generate_diet/stream', methods=['POST'])
+def api_generate_diet_stream():
+    """API endpoint streaming a diet plan as NDJSON: one line per day as it is planned, then a summary line"""
+    data = request.get_json() or {}
+    user_input = data.get('user_input', '')
+    seed, _ = _request_seed(data.get('seed'))
+    preferences = diet_generator._parse_user_input(user_input)
+    
+    def stream():
+        summary = PlanSummary()
+        for day_key, day_data in diet_generator.iter_meal_plan(user_input, seed=seed, start_date=date.today()):
+            summary.add_day(day_data)
+            yield app.json.dumps_bytes(dict(day_data, date_key=day_key))
+        yield app.json.dumps_bytes({
+            'nutrition_summary': summary.nutrition_summary(),
+            'recommendations': diet_generator._generate_telugu_recommendations(preferences),
+            'preferences': preferences,
+            'seed': seed
+        })
+    
+    return Response(stream(), mimetype='application/x-ndjson')
+
+@app.route('/api/generate_diet/batch', methods=['POST'])
+def api_generate_diet_batch():
+    """API endpoint generating plans for many users at once, returned in request order.
+    
+    Takes {"requests": [{"user_input": ..., "seed": ...}, ...]} or
+    {"user_inputs": [...]}.  Cached plans are reused for items with a seed;
+    the rest are spread over the batch process pool.
+    """
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    user_inputs = data.get('user_inputs', [])
+    if not isinstance(user_inputs, list) or not all(isinstance(text, str) for text in user_inputs):
+        return jsonify({'error': 'user_inputs must be a list of strings'}), 400
+    items = data.get('requests') or [{'user_input': text} for text in user_inputs]
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return jsonify({'error': 'requests must be a list of objects'}), 400
+    if not items:
+        return jsonify({'error': 'No user inputs given'}), 400
+    if len(items) > PLAN_BATCH_MAX:
+        return jsonify({'error': f'At most {PLAN_BATCH_MAX} plans per batch'}), 400
+    
+    start_date = date.today()
+    seeds = [_request_seed(item.get('seed')) for item in items]
+    requests = [(item.get('user_input', ''), seed) for item, (seed, _) in zip(items, seeds)]
+    # Unseeded items each draw their own seed, so they are neither cached nor shared
+    keys = [_plan_key(user_input, seed, start_date) if seeded else ('unseeded', index)
+            for index, ((user_input, seed), (_, seeded)) in enumerate(zip(requests, seeds))]
+    plans = [plan_cache.get(key) if seeded else None for key, (_, seeded) in zip(keys, seeds)]
+    
+    # Generate each distinct missing plan once
+    pending = {}
+    for index, key in enumerate(keys):
+        if plans[index] is None:
+            pending.setdefault(key, index)
+    
+    started = time.perf_counter()
+    generated = batch_planner.generate([requests[index] for index in pending.values()], start_date)
+    elapsed = time.perf_counter() - started
+    
+    for (key, index), plan in zip(pending.items(), generated):
+        if not plan.get('error'):
+            plan['seed'] = requests[index][1]
+            if seeds[index][1]:
+                plan_cache.put(key, plan)
+    by_key = dict(zip(pending, generated))
+    plans = [plan if plan is not None else by_key[key] for plan, key in zip(plans, keys)]
+    
+    return jsonify({
+        'plans': plans,
+        'count': len(plans),
+        'generated': len(generated),
+        'seconds': round(elapsed, 3),
+        'plans_per_second': round(len(generated) / elapsed, 1) if generated and elapsed else None
+    })
+
+@app.route('/api/generate_diet/async', methods=['POST'])
+def api_generate_diet_async():
+    """API endpoint starting diet plan generation in the background; returns a plan id at once"""
+    data = request.get_json()
+    user_input = data.get('user_input', '')
+    seed, seeded = _request_seed(data.get('seed'))
+    
+    # Identical requests while a plan is still being generated share one job
+    plan_id = jobs.submit(f"plan:{_plan_key(user_input, seed, date.today())}", _plan_job, user_input, seed, seeded)
+    return jsonify({
+        'plan_id': plan_id,
+        'status_url': url_for('api_plan_status', plan_id=plan_id),
+        'events_url': url_for('api_plan_events', plan_id=plan_id)
+    }), 202
+
+def _plan_summary(plan):
+    """A finished plan without its days"""
+    return {key: value for key, value in (plan or {}).items() if key != 'meal_plan'}
+
+@app.route('/api/plans/<plan_id>')
+def api_plan_status(plan_id):
+    """API endpoint polling a background plan: status, progress and the days generated after `after`.
+    
+    Clients passing `after` already hold the days they were sent, so once
+    the plan is done they get its summary and the full plan is left out.
+    """
+    job = jobs.get(plan_id)
+    if job is None or not job['name'].startswith('plan:'):
+        return jsonify({'error': 'Plan not found'}), 404
+    
+    after = request.args.get('after', 0, type=int)
+    return jsonify({
+        'plan_id': plan_id,
+        'status': job['status'],
+        'done': job['done'],
+        'total': job['total'],
+        'error': job['error'],
+        'days': [day for _, day in jobs.events(plan_id, after)],
+        'summary': _plan_summary(job['result']) if job['status'] == 'done' else None,
+        'plan': None if after else job['result']
+    })
+
+@app.route('/api/plans/<plan_id>/events')
+def api_plan_events(plan_id):
+    """Server-sent events for a background plan: one `day` event per day, then `done` or `error`.
+    
+    Event ids are day sequence numbers, so a reconnecting client resumes
+    from its Last-Event-ID.
+    """
+    job = jobs.get(plan_id)
+    if job is None or not job['name'].startswith('plan:'):
+        return jsonify({'error': 'Plan not found'}), 404
+    after = request.headers.get('Last-Event-ID', 0, type=int)
+    
+    def stream(after):
+        last_sent = time.monotonic()
+        while True:
+            # Read the status first so no day published before it finished is missed
+            job = jobs.get(plan_id)
+            if job is None:
+                yield f"event: error\ndata: {app.json.dumps({'error': 'Plan expired'})}\n\n"
+                return
+            for seq, day in jobs.events(plan_id, after):
+                yield f"id: {seq}\nevent: day\ndata: {app.json.dumps(day)}\n\n"
+                after = seq
+                last_sent = time.monotonic()
+            
+            if job['status'] == 'done':
+                yield f"event: done\ndata: {app.json.dumps(_plan_summary(job['result']))}\n\n"
+                return
+            if job['status'] == 'failed':
+                yield f"event: error\ndata: {app.json.dumps({'error': job['error']})}\n\n"
+                return
+            
+            if time.monotonic() - last_sent >= PLAN_EVENTS_HEARTBEAT:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            time.sleep(PLAN_EVENTS_POLL_INTERVAL)
+    
+    return Response(stream(after), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/diet_suggestions')
 def diet_suggestions():
     """Get diet suggestions based on user input"""
@@ -0,0 +1,72 @@
+"""
+Batch diet plan generation on a process pool.
+
+Each worker process builds one TeluguDietGenerator when it starts.
+Workers are forked from a single-threaded fork server that has imported
+batch_preload, so they inherit an already loaded recipe catalogue and its
+candidate pools copy-on-write instead of reloading them per plan, and no
+worker is ever forked from a threaded web worker.  Plans come back in
+request order.
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from config import PLAN_BATCH_WORKERS
+from diet_generator import TeluguDietGenerator
+
+_generator = None
+
+
+def _init_worker():
+    global _generator
+    _generator = TeluguDietGenerator()
+
+
+def _generate(job):
+    user_input, seed, start_date = job
+    return _generator.generate_diet_menu(user_input, seed=seed, start_date=start_date)
+
+
+class BatchPlanner:
+    """Generate many diet plans at once across worker processes.
+
+    `processes` is how many processes on this host run their own
+    BatchPlanner (the web workers); by default they split the cores.
+    """
+
+    def __init__(self, workers=PLAN_BATCH_WORKERS, generator=None, processes=1):
+        self.workers = workers or max(1, (os.cpu_count() or 1) // processes)
+        self.generator = generator  # used when plans are generated in this process
+        self._executor = None
+
+    def generate(self, requests, start_date=None):
+        """Plans for (user_input, seed) pairs, in the same order"""
+        jobs = [(user_input, seed, start_date) for user_input, seed in requests]
+        if not jobs:
+            return []
+
+        if self.workers == 1 or len(jobs) == 1:
+            if self.generator is None:
+                self.generator = TeluguDietGenerator()
+            return [self.generator.generate_diet_menu(user_input, seed=seed, start_date=start_date)
+                    for user_input, seed, start_date in jobs]
+
+        # A few jobs per round trip keeps pickling overhead down without starving workers
+        chunksize = max(1, len(jobs) // (self.workers * 4))
+        return list(self._pool().map(_generate, jobs, chunksize=chunksize))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _pool(self):
+        if self._executor is None:
+            context = None
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                context = multiprocessing.get_context('forkserver')
+                context.set_forkserver_preload(['batch_preload'])
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                                 initializer=_init_worker)
+        return self._executor
@@ -0,0 +1,14 @@
+"""
+Imported once by the batch planner's fork server (see batch_planner.py).
+
+Loading the recipe catalogue here means every pool worker forked from the
+server starts with it in memory, shared copy-on-write.  The fork server is
+single-threaded, so unlike the web workers it is safe to fork from.
+"""
+
+from recipe_catalogue import get_recipe_catalogue
+from candidate_pools import get_candidate_pools
+
+_catalogue = get_recipe_catalogue()
+for _recipes in (_catalogue.veg_recipes(), _catalogue.non_veg_recipes()):
+    get_candidate_pools(_recipes)
@@ -0,0 +1,88 @@
+import bisect
+import threading
+from collections import OrderedDict
+
+# Which recipes suit each meal type: name keywords and/or a calorie window.
+# 'max_exclusive' marks an open upper bound (calories < max).
+MEAL_TYPE_RULES = {
+    'breakfast': {'keywords': ('egg', 'omelet', 'boiled')},
+    'lunch': {'min': 300},
+    'dinner': {'min': 250, 'max': 400},
+    'snack': {'max': 300, 'max_exclusive': True}
+}
+
+# Number of catalogue versions whose pools are kept in memory
+MAX_CACHED_POOLS = 8
+
+_pool_cache = OrderedDict()
+_pool_lock = threading.Lock()
+
+
+def catalogue_version(recipes):
+    """Cheap fingerprint of the fields the pools depend on"""
+    return hash(tuple((r['id'], r['name'], r['nutrition']['calories']) for r in recipes))
+
+
+def get_candidate_pools(recipes, version=None):
+    """Return the CandidatePools for a recipe list, building them once per catalogue version.
+
+    Without a `version` the list is fingerprinted, which reads every recipe;
+    look the pools up once per plan and reuse them for each slot.
+    """
+    if version is None:
+        version = catalogue_version(recipes)
+
+    with _pool_lock:
+        pools = _pool_cache.get(version)
+        if pools is None:
+            pools = CandidatePools(recipes)
+            _pool_cache[version] = pools
+            if len(_pool_cache) > MAX_CACHED_POOLS:
+                _pool_cache.popitem(last=False)
+        else:
+            _pool_cache.move_to_end(version)
+
+    return pools
+
+
+class CandidatePools:
+    """Recipe indices grouped per meal type and sorted by calories.
+
+    Calorie windows are answered with two bisects over the sorted calorie
+    list, so a slot costs O(log N + k) instead of a rescan of every recipe.
+    """
+
+    def __init__(self, recipes):
+        self.recipes = recipes
+        self.ids = frozenset(r['id'] for r in recipes)
+
+        # All recipe indices ordered by calories, with the matching sort keys
+        self.order = sorted(range(len(recipes)), key=lambda i: recipes[i]['nutrition']['calories'])
+        self.sorted_calories = [recipes[i]['nutrition']['calories'] for i in self.order]
+
+        self.pools = {meal_type: self._build_pool(rules) for meal_type, rules in MEAL_TYPE_RULES.items()}
+
+    def _build_pool(self, rules):
+        """Calorie-sorted indices matching a meal type's rules"""
+        if 'keywords' in rules:
+            keywords = rules['keywords']
+            return [i for i in self.order
+                    if any(word in self.recipes[i]['name'].lower() for word in keywords)]
+
+        return self.calorie_window(rules.get('min'), rules.get('max'),
+                                   max_exclusive=rules.get('max_exclusive', False))
+
+    def calorie_window(self, min_calories=None, max_calories=None, max_exclusive=False):
+        """Indices of recipes whose calories fall within [min, max], in calorie order"""
+        lo = 0 if min_calories is None else bisect.bisect_left(self.sorted_calories, min_calories)
+        if max_calories is None:
+            hi = len(self.order)
+        elif max_exclusive:
+            hi = bisect.bisect_left(self.sorted_calories, max_calories)
+        else:
+            hi = bisect.bisect_right(self.sorted_calories, max_calories)
+        return self.order[lo:hi]
+
+    def meal_type_candidates(self, meal_type):
+        """Indices preferred for a meal type (empty for unknown meal types)"""
+        return self.pools.get(meal_type, [])
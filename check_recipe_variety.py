@@ -5,6 +5,8 @@ Check the variety and distribution of recipes in the CSV file
 
 import pandas as pd
 from diet_generator import TeluguDietGenerator
+from recipe_catalogue import get_recipe_catalogue
+from recipe_similarity import get_similarity_graph
 
 def analyze_recipe_variety():
     print("🔍 Analyzing Recipe Variety in CSV...")
@@ -21,15 +23,21 @@ def analyze_recipe_variety():
     
     print(f"Unique dish names: {len(unique_dishes)}")
     
-    # Count occurrences of each dish type
-    dish_counts = {}
-    for dish in dish_names:
-        base_name = dish.split('#')[0].strip()  # Remove #number
-        dish_counts[base_name] = dish_counts.get(base_name, 0) + 1
+    # Group near-duplicate recipes (same ingredients, '#N' variants) into dish types
+    graph = get_similarity_graph(recipes)
+    clusters = graph.clusters(min_size=1)
     
+    print(f"Distinct dishes after near-duplicate detection: {len(clusters)}")
     print("\nDish type distribution:")
-    for dish_type, count in sorted(dish_counts.items()):
-        print(f"  {dish_type}: {count} variations")
+    for cluster in sorted(clusters, key=lambda cluster: recipes[cluster[0]]['name']):
+        print(f"  {recipes[cluster[0]]['name']}: {len(cluster)} variations")
+    
+    # Near-duplicates across every recipe source
+    catalogue = get_recipe_catalogue()
+    print("\nNear-duplicate clusters across SQLite and CSV sources:")
+    for cluster in catalogue.duplicate_clusters()[:10]:
+        sources = sorted({recipe.source for recipe in cluster})
+        print(f"  {cluster[0]['name']}: {len(cluster)} recipes ({', '.join(sources)})")
     
     # Check calorie distribution
     calories = [recipe['nutrition']['calories'] for recipe in recipes]
@@ -0,0 +1,77 @@
+"""
+gzip / Brotli compression of Flask responses.
+
+Large JSON and text bodies are compressed when the client accepts it.
+Brotli is used when the brotli package is installed and the client
+offers it; gzip otherwise.  Small bodies, streamed responses and bodies
+that already carry a Content-Encoding are left alone.
+"""
+
+import gzip
+from config import COMPRESS_MIN_SIZE, COMPRESS_LEVEL
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+COMPRESSIBLE_MIMETYPES = ('application/json', 'application/x-ndjson', 'text/html', 'text/css',
+                          'text/csv', 'text/plain', 'application/javascript')
+
+
+def choose_encoding(accept_encodings):
+    """Best encoding the client accepts, or None"""
+    if BROTLI_AVAILABLE and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, level=COMPRESS_LEVEL):
+    if encoding == 'br':
+        # Brotli quality runs 0-11; map the gzip-style 1-9 level onto it
+        return brotli.compress(data, quality=min(11, level + 2))
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+class ResponseCompressor:
+    """Compress responses of a Flask app above a size threshold"""
+
+    def __init__(self, app=None, min_size=COMPRESS_MIN_SIZE, level=COMPRESS_LEVEL):
+        self.min_size = min_size
+        self.level = level
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        from flask import request
+
+        @app.after_request
+        def compress_response(response):
+            return self.process(request, response)
+
+    def process(self, request, response):
+        if (response.status_code < 200 or response.status_code >= 300
+                or response.is_streamed or response.direct_passthrough
+                or 'Content-Encoding' in response.headers
+                or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.accept_encodings)
+        if encoding is None:
+            return response
+
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+
+        response.set_data(compress(data, encoding, self.level))
+        response.headers['Content-Encoding'] = encoding
+        # The bytes differ from the identity body, so a strong ETag would be wrong
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
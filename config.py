@@ -6,13 +6,59 @@ load_dotenv()
 # Nutrition API Configuration
 NUTRITION_API_KEY = os.getenv('NUTRITION_API_KEY', '')
 NUTRITION_API_URL = "https://api.edamam.com/api/nutrition-data"
+NUTRITION_API_TIMEOUT = float(os.getenv('NUTRITION_API_TIMEOUT', '10'))  # seconds per request
+NUTRITION_API_RETRIES = int(os.getenv('NUTRITION_API_RETRIES', '3'))  # retries with backoff
+NUTRITION_CACHE_PATH = os.getenv('NUTRITION_CACHE_PATH', 'nutrition_cache.db')  # empty disables
+NUTRITION_CACHE_TTL = int(os.getenv('NUTRITION_CACHE_TTL', str(30 * 24 * 3600)))  # seconds; 0 never expires
+NUTRITION_FALLBACK_TTL = float(os.getenv('NUTRITION_FALLBACK_TTL', '300'))  # seconds local estimates stand in for failed API lookups; 0 retries every time
+NUTRITION_LINE_ROWS = int(os.getenv('NUTRITION_LINE_ROWS', '50000'))  # ingredient lines memoized in memory per process
+NUTRITION_API_REQUESTS_PER_MINUTE = float(os.getenv('NUTRITION_API_REQUESTS_PER_MINUTE', '10'))  # provider quota; 0 disables
+NUTRITION_API_BURST = int(os.getenv('NUTRITION_API_BURST', '5'))  # requests allowed back to back
+NUTRITION_BACKFILL_WORKERS = int(os.getenv('NUTRITION_BACKFILL_WORKERS', '4'))
+NUTRITION_BACKFILL_BATCH = int(os.getenv('NUTRITION_BACKFILL_BATCH', '50'))  # recipes per bulk insert/checkpoint
 
 # Database Configuration
 DATABASE_PATH = "telugu_recipes.db"
+RECIPE_TEXT_CACHE_SIZE = int(os.getenv('RECIPE_TEXT_CACHE_SIZE', '128'))  # instruction texts kept in memory
+EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', '500'))  # rows read per query by /api/recipes/export
+
+# Background Jobs Configuration
+JOB_QUEUE_PATH = os.getenv('JOB_QUEUE_PATH', DATABASE_PATH)  # SQLite file holding the jobs table
+JOB_QUEUE_WORKERS = int(os.getenv('JOB_QUEUE_WORKERS', '2'))  # jobs run at the same time
+JOB_TTL = int(os.getenv('JOB_TTL', '3600'))  # seconds a finished job, its result and events are kept
+
+# Meal Planning Configuration
+MEAL_PLAN_WORK_BUDGET = int(os.getenv('MEAL_PLAN_WORK_BUDGET', '40000000'))  # DP cells per plan (about 2s on one core); later days are picked greedily
+PLAN_CACHE_SIZE = int(os.getenv('PLAN_CACHE_SIZE', '256'))  # plans kept in memory
+PLAN_CACHE_PATH = os.getenv('PLAN_CACHE_PATH', '')  # SQLite file to persist plans; empty disables
+PLAN_BATCH_WORKERS = int(os.getenv('PLAN_BATCH_WORKERS', '0'))  # batch plan processes per web worker; 0 splits the cores between web workers
+PLAN_BATCH_MAX = int(os.getenv('PLAN_BATCH_MAX', '500'))  # most plans accepted in one batch request
+PLAN_EVENTS_POLL_INTERVAL = float(os.getenv('PLAN_EVENTS_POLL_INTERVAL', '0.25'))  # seconds between checks for new plan days
+PLAN_EVENTS_HEARTBEAT = float(os.getenv('PLAN_EVENTS_HEARTBEAT', '15'))  # seconds between keep-alive comments on idle streams
+MINHASH_PERMUTATIONS = int(os.getenv('MINHASH_PERMUTATIONS', '64'))  # hashes per recipe signature
+MINHASH_BANDS = int(os.getenv('MINHASH_BANDS', '16'))  # LSH bands; recipes sharing any band are compared
+SIMILARITY_THRESHOLD = float(os.getenv('SIMILARITY_THRESHOLD', '0.6'))  # estimated Jaccard at which recipes count as near-duplicates
+SIMILARITY_NEIGHBOURS = int(os.getenv('SIMILARITY_NEIGHBOURS', '16'))  # most near-duplicates kept per recipe
+SIMILARITY_MAX_DF = float(os.getenv('SIMILARITY_MAX_DF', '0.5'))  # features in more than this share of recipes are ignored
+SIMILARITY_MAX_CLUSTER = int(os.getenv('SIMILARITY_MAX_CLUSTER', '24'))  # most recipes merged into one near-duplicate cluster
+SIMILARITY_PENALTY = float(os.getenv('SIMILARITY_PENALTY', '40'))  # kcal-equivalent cost of serving a near-duplicate
+SIMILARITY_WINDOW = int(os.getenv('SIMILARITY_WINDOW', '6'))  # days a served dish keeps penalizing its near-duplicates
 
 # Flask Configuration
 FLASK_SECRET_KEY = os.getenv('FLASK_SECRET_KEY', 'your-secret-key-here')
-FLASK_DEBUG = True 
+FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'true').lower() in ('1', 'true', 'yes')
+API_CACHE_MAX_AGE = int(os.getenv('API_CACHE_MAX_AGE', '0'))  # seconds read APIs may be served without revalidating
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))  # bytes; smaller responses are sent as-is
+COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))  # gzip level 1-9 (Brotli quality is level + 2)
+
+# Production Server Configuration (gunicorn.conf.py)
+WEB_BIND = os.getenv('WEB_BIND', '0.0.0.0:8000')
+WEB_WORKERS = int(os.getenv('WEB_WORKERS', str(os.cpu_count() or 1)))  # pre-forked processes
+WEB_PROCESSES = 1  # processes serving the app on this host; gunicorn.conf.py sets it to WEB_WORKERS
+WEB_THREADS = int(os.getenv('WEB_THREADS', '4'))  # request threads per worker
+WEB_TIMEOUT = int(os.getenv('WEB_TIMEOUT', '60'))  # seconds before a stuck worker is restarted
+WEB_GRACEFUL_TIMEOUT = int(os.getenv('WEB_GRACEFUL_TIMEOUT', '30'))  # seconds to finish requests on reload
+WEB_MAX_REQUESTS = int(os.getenv('WEB_MAX_REQUESTS', '2000'))  # recycle workers after this many; 0 never
 
 # OpenAI Configuration
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
@@ -1,11 +1,37 @@
 import sqlite3
 import json
-from datetime import datetime
-from config import DATABASE_PATH
+import hashlib
+from datetime import datetime, timezone
+from config import DATABASE_PATH, EXPORT_BATCH_SIZE
+from recipe_text import TextCache
+
+# Columns read for recipe lists; instructions are left out unless a caller needs them
+RECIPE_COLUMNS = ('r.id, r.name, r.ingredients, r.cooking_time, r.difficulty, '
+                  'r.category, r.cuisine_type, r.tags, r.created_at')
+NUTRITION_COLUMNS = ('calories', 'protein', 'carbs', 'fat', 'fiber', 'sugar', 'sodium')
+# Each recipe has one nutrition row; a new one overwrites it
+NUTRITION_REPLACE = '''ON CONFLICT (recipe_id) DO UPDATE SET
+                calories = excluded.calories,
+                protein = excluded.protein,
+                carbs = excluded.carbs,
+                fat = excluded.fat,
+                fiber = excluded.fiber,
+                sugar = excluded.sugar,
+                sodium = excluded.sodium,
+                nutrition_data = excluded.nutrition_data,
+                created_at = CURRENT_TIMESTAMP'''
+
+def recipe_content_hash(name, ingredients):
+    """Digest of a recipe's normalized name and ingredient set, used to spot duplicates"""
+    normalized_name = ' '.join(str(name).lower().split())
+    normalized_ingredients = sorted(' '.join(str(i).lower().split()) for i in ingredients)
+    payload = json.dumps([normalized_name, normalized_ingredients], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
 
 class RecipeDatabase:
-    def __init__(self):
-        self.db_path = DATABASE_PATH
+    def __init__(self, db_path=DATABASE_PATH):
+        self.db_path = db_path
+        self.text_cache = TextCache(self._load_recipe_text)
         self.init_database()
     
     def init_database(self):
@@ -26,7 +52,8 @@ class RecipeDatabase:
                 cuisine_type TEXT DEFAULT 'Telugu',
                 tags TEXT DEFAULT '[]',
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                content_hash TEXT
             )
         ''')
         
@@ -48,36 +75,187 @@ class RecipeDatabase:
             )
         ''')
         
+        # Older databases predate content_hash: add it, fill it in and drop duplicate loads
+        columns = {row[1] for row in cursor.execute('PRAGMA table_info(recipes)')}
+        if 'content_hash' not in columns:
+            cursor.execute('ALTER TABLE recipes ADD COLUMN content_hash TEXT')
+        self._hash_and_dedupe(cursor)
+        cursor.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_recipes_content_hash ON recipes (content_hash)')
+        self._unique_nutrition(cursor)
+        
+        # Catalogue version: bumped by triggers on any recipe or nutrition write, so
+        # writes from scripts and other processes also invalidate HTTP caches
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS catalogue_version (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                version INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        cursor.execute('INSERT OR IGNORE INTO catalogue_version (id, version) VALUES (1, 0)')
+        for table in ('recipes', 'nutrition'):
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS bump_version_{table}_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE catalogue_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE id = 1;
+                    END
+                ''')
+        
         conn.commit()
         conn.close()
     
+    def _hash_and_dedupe(self, cursor):
+        """Hash recipes stored without a content_hash, keeping the oldest row of each duplicate set.
+        
+        When only a removed duplicate has nutrition, that nutrition moves to
+        the kept recipe rather than being lost.
+        """
+        cursor.execute('SELECT id, name, ingredients FROM recipes WHERE content_hash IS NULL ORDER BY id')
+        unhashed = cursor.fetchall()
+        if not unhashed:
+            return
+        
+        kept = {content_hash: recipe_id for recipe_id, content_hash in
+                cursor.execute('SELECT id, content_hash FROM recipes WHERE content_hash IS NOT NULL')}
+        updates = []
+        duplicates = []
+        for recipe_id, name, ingredients in unhashed:
+            content_hash = recipe_content_hash(name, json.loads(ingredients))
+            if content_hash in kept:
+                duplicates.append((recipe_id,))
+                cursor.execute('''
+                    UPDATE nutrition SET recipe_id = ?
+                    WHERE recipe_id = ? AND NOT EXISTS (SELECT 1 FROM nutrition WHERE recipe_id = ?)
+                ''', (kept[content_hash], recipe_id, kept[content_hash]))
+            else:
+                kept[content_hash] = recipe_id
+                updates.append((content_hash, recipe_id))
+        
+        cursor.executemany('DELETE FROM nutrition WHERE recipe_id = ?', duplicates)
+        cursor.executemany('DELETE FROM recipes WHERE id = ?', duplicates)
+        cursor.executemany('UPDATE recipes SET content_hash = ? WHERE id = ?', updates)
+        if duplicates:
+            print(f"Removed {len(duplicates)} duplicate recipes")
+    
+    def _unique_nutrition(self, cursor):
+        """Keep one nutrition row per recipe (the latest) and enforce it with a unique index"""
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_nutrition_recipe_unique'")
+        if cursor.fetchone():
+            return
+        cursor.execute('''
+            DELETE FROM nutrition
+            WHERE recipe_id IS NOT NULL
+              AND id NOT IN (SELECT MAX(id) FROM nutrition WHERE recipe_id IS NOT NULL GROUP BY recipe_id)
+        ''')
+        if cursor.rowcount:
+            print(f"Removed {cursor.rowcount} superseded nutrition rows")
+        cursor.execute('DROP INDEX IF EXISTS idx_nutrition_recipe_id')
+        cursor.execute('CREATE UNIQUE INDEX idx_nutrition_recipe_unique ON nutrition (recipe_id)')
+    
     def add_recipe(self, name, ingredients, instructions, cooking_time=None, difficulty=None, category='main_course', cuisine_type='Telugu', tags=None):
-        """Add a new recipe to the database"""
+        """Add a new recipe to the database (an identical recipe returns the stored id)"""
+        return self.upsert_recipe(name, ingredients, instructions, cooking_time, difficulty, category, cuisine_type, tags)
+    
+    def upsert_recipe(self, name, ingredients, instructions, cooking_time=None, difficulty=None, category='main_course', cuisine_type='Telugu', tags=None):
+        """Insert a recipe, or update the stored one with the same name and ingredients"""
+        return self.upsert_recipes_bulk([{
+            'name': name,
+            'ingredients': ingredients,
+            'instructions': instructions,
+            'cooking_time': cooking_time,
+            'difficulty': difficulty,
+            'category': category,
+            'cuisine_type': cuisine_type,
+            'tags': tags or []
+        }])[0]
+    
+    def upsert_recipes_bulk(self, recipes):
+        """Upsert many recipe dicts in one transaction and return their ids.
+        
+        Recipes are keyed by content hash; a stored recipe is only rewritten
+        when one of its other fields changed, so reloading the same recipes
+        leaves the table as it was.
+        """
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        if tags is None:
-            tags = []
+        recipe_ids = []
+        for recipe in recipes:
+            content_hash = recipe.get('content_hash') or recipe_content_hash(recipe['name'], recipe['ingredients'])
+            cursor.execute('''
+                INSERT INTO recipes (name, ingredients, instructions, cooking_time, difficulty, category, cuisine_type, tags, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (content_hash) DO UPDATE SET
+                    instructions = excluded.instructions,
+                    cooking_time = excluded.cooking_time,
+                    difficulty = excluded.difficulty,
+                    category = excluded.category,
+                    cuisine_type = excluded.cuisine_type,
+                    tags = excluded.tags,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE instructions IS NOT excluded.instructions
+                   OR cooking_time IS NOT excluded.cooking_time
+                   OR difficulty IS NOT excluded.difficulty
+                   OR category IS NOT excluded.category
+                   OR cuisine_type IS NOT excluded.cuisine_type
+                   OR tags IS NOT excluded.tags
+            ''', (
+                recipe['name'],
+                json.dumps(recipe['ingredients']),
+                recipe['instructions'],
+                recipe.get('cooking_time'),
+                recipe.get('difficulty'),
+                recipe.get('category', 'main_course'),
+                recipe.get('cuisine_type', 'Telugu'),
+                json.dumps(recipe.get('tags', [])),
+                content_hash
+            ))
+            cursor.execute('SELECT id FROM recipes WHERE content_hash = ?', (content_hash,))
+            recipe_ids.append(cursor.fetchone()[0])
         
-        cursor.execute('''
-            INSERT INTO recipes (name, ingredients, instructions, cooking_time, difficulty, category, cuisine_type, tags)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (name, json.dumps(ingredients), instructions, cooking_time, difficulty, category, cuisine_type, json.dumps(tags)))
-        
-        recipe_id = cursor.lastrowid
         conn.commit()
         conn.close()
-        return recipe_id
+        # Instructions may have changed
+        self.text_cache.clear()
+        return recipe_ids
+    
+    def add_recipes_bulk(self, recipes):
+        """Insert many recipe dicts in one transaction and return their ids"""
+        return self.upsert_recipes_bulk(recipes)
+    
+    def get_content_hashes(self):
+        """Content hashes of every stored recipe"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT content_hash FROM recipes')
+        hashes = {content_hash for (content_hash,) in cursor}
+        conn.close()
+        return hashes
     
     def add_nutrition(self, recipe_id, nutrition_data):
-        """Add nutrition information for a recipe"""
+        """Set nutrition information for a recipe, replacing any it already has"""
+        self.add_nutrition_bulk([(recipe_id, nutrition_data)], replace=True)
+    
+    def add_nutrition_bulk(self, items, replace=False):
+        """Add nutrition for many (recipe_id, nutrition_data) pairs in one transaction.
+        
+        Each recipe has one nutrition row; `replace` overwrites existing rows,
+        otherwise recipes that already have nutrition keep it.
+        """
+        items = list(items)
+        if not items:
+            return 0
+        
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
-        cursor.execute('''
+        cursor.executemany(f'''
             INSERT INTO nutrition (recipe_id, calories, protein, carbs, fat, fiber, sugar, sodium, nutrition_data)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+            {NUTRITION_REPLACE if replace else 'ON CONFLICT (recipe_id) DO NOTHING'}
+        ''', [(
             recipe_id,
             nutrition_data.get('calories', 0),
             nutrition_data.get('protein', 0),
@@ -87,51 +265,105 @@ class RecipeDatabase:
             nutrition_data.get('sugar', 0),
             nutrition_data.get('sodium', 0),
             json.dumps(nutrition_data)
-        ))
+        ) for recipe_id, nutrition_data in items])
         
         conn.commit()
         conn.close()
+        return len(items)
+    
+    def get_catalogue_version(self):
+        """(version, last modified UTC datetime) of the recipe and nutrition tables"""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        cursor.execute('SELECT version, updated_at FROM catalogue_version WHERE id = 1')
+        version, updated_at = cursor.fetchone()
+        conn.close()
+        return version, datetime.strptime(updated_at, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
+    
+    def get_all_recipes(self, with_text=True):
+        """Get all recipes with nutrition data; with_text=False leaves out the instructions"""
+        return self._query_recipes(with_text=with_text)
+    
+    def get_recipe_detail(self, recipe_id):
+        """Get one recipe with its instructions and nutrition, or None"""
+        recipes = self._query_recipes('WHERE r.id = ?', (recipe_id,), with_text=True)
+        return recipes[0] if recipes else None
+    
+    def get_recipe_text(self, recipe_id):
+        """Instructions of one recipe, served from a small LRU cache"""
+        return self.text_cache.get(recipe_id)
+    
+    def _load_recipe_text(self, recipe_id):
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute('SELECT instructions FROM recipes WHERE id = ?', (recipe_id,)).fetchone()
+        conn.close()
+        return row[0] if row else None
     
-    def get_all_recipes(self):
-        """Get all recipes with nutrition data"""
+    def _query_recipes(self, where='', params=(), with_text=False):
+        """Recipe dicts with nutrition; the long instructions column is only read when asked for"""
         conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT r.*, n.calories, n.protein, n.carbs, n.fat, n.fiber, n.sugar, n.sodium
+        columns = RECIPE_COLUMNS + (', r.instructions' if with_text else '')
+        cursor.execute(f'''
+            SELECT {columns}, n.calories, n.protein, n.carbs, n.fat, n.fiber, n.sugar, n.sodium
             FROM recipes r
             LEFT JOIN nutrition n ON r.id = n.recipe_id
+            {where}
             ORDER BY r.name
-        ''')
+        ''', params)
         
-        recipes = []
-        for row in cursor.fetchall():
-            recipe = {
-                'id': row[0],
-                'name': row[1],
-                'ingredients': json.loads(row[2]),
-                'instructions': row[3],
-                'cooking_time': row[4],
-                'difficulty': row[5],
-                'category': row[6],
-                'cuisine_type': row[7],
-                'tags': json.loads(row[8]) if row[8] else [],
-                'created_at': row[9],
-                'nutrition': {
-                    'calories': row[11],
-                    'protein': row[12],
-                    'carbs': row[13],
-                    'fat': row[14],
-                    'fiber': row[15],
-                    'sugar': row[16],
-                    'sodium': row[17]
-                }
-            }
-            recipes.append(recipe)
+        recipes = [self._row_to_recipe(row, with_text) for row in cursor.fetchall()]
         
         conn.close()
         return recipes
     
+    def iter_recipes(self, after_id=0, with_text=True, batch_size=EXPORT_BATCH_SIZE):
+        """Yield recipe dicts in id order, starting after after_id.
+        
+        Rows are read batch_size at a time with keyset paging on the id, so
+        memory stays flat however many recipes there are, and no read lock
+        is held while the caller is busy with a batch.  Each recipe comes with
+        its nutrition row.
+        """
+        columns = RECIPE_COLUMNS + (', r.instructions' if with_text else '')
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            while True:
+                rows = conn.execute(f'''
+                    SELECT {columns}, n.calories, n.protein, n.carbs, n.fat, n.fiber, n.sugar, n.sodium
+                    FROM recipes r
+                    LEFT JOIN nutrition n ON n.recipe_id = r.id
+                    WHERE r.id > ?
+                    ORDER BY r.id
+                    LIMIT ?
+                ''', (after_id, batch_size)).fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._row_to_recipe(row, with_text)
+                after_id = rows[-1]['id']
+        finally:
+            conn.close()
+    
+    def _row_to_recipe(self, row, with_text=False):
+        recipe = {
+            'id': row['id'],
+            'name': row['name'],
+            'ingredients': json.loads(row['ingredients']),
+            'cooking_time': row['cooking_time'],
+            'difficulty': row['difficulty'],
+            'category': row['category'],
+            'cuisine_type': row['cuisine_type'],
+            'tags': json.loads(row['tags']) if row['tags'] else [],
+            'created_at': row['created_at'],
+            'nutrition': {key: row[key] for key in NUTRITION_COLUMNS}
+        }
+        if with_text:
+            recipe['instructions'] = row['instructions']
+        return recipe
     
     def get_recipe(self, recipe_id):
         """Get a single recipe by ID with nutrition information"""
@@ -171,94 +403,15 @@ class RecipeDatabase:
         except Exception as e:
             print(f"Error getting recipe: {e}")
             return None
-    def get_recipes_by_category(self, category):
+    def get_recipes_by_category(self, category, with_text=True):
         """Get recipes by category"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT r.*, n.calories, n.protein, n.carbs, n.fat, n.fiber, n.sugar, n.sodium
-            FROM recipes r
-            LEFT JOIN nutrition n ON r.id = n.recipe_id
-            WHERE r.category = ?
-            ORDER BY r.name
-        ''', (category,))
-        
-        recipes = []
-        for row in cursor.fetchall():
-            recipe = {
-                'id': row[0],
-                'name': row[1],
-                'ingredients': json.loads(row[2]),
-                'instructions': row[3],
-                'cooking_time': row[4],
-                'difficulty': row[5],
-                'category': row[6],
-                'cuisine_type': row[7],
-                'tags': json.loads(row[8]) if row[8] else [],
-                'created_at': row[9],
-                'nutrition': {
-                    'calories': row[11],
-                    'protein': row[12],
-                    'carbs': row[13],
-                    'fat': row[14],
-                    'fiber': row[15],
-                    'sugar': row[16],
-                    'sodium': row[17]
-                }
-            }
-            recipes.append(recipe)
-        
-        conn.close()
-        return recipes
+        return self._query_recipes('WHERE r.category = ?', (category,), with_text=with_text)
     
-    def get_recipes_by_tags(self, tags):
+    def get_recipes_by_tags(self, tags, with_text=True):
         """Get recipes by tags"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Convert tags list to JSON string for LIKE search
-        tag_conditions = []
-        for tag in tags:
-            tag_conditions.append(f"r.tags LIKE '%{tag}%'")
-        
-        where_clause = " OR ".join(tag_conditions) if tag_conditions else "1=1"
-        
-        cursor.execute(f'''
-            SELECT r.*, n.calories, n.protein, n.carbs, n.fat, n.fiber, n.sugar, n.sodium
-            FROM recipes r
-            LEFT JOIN nutrition n ON r.id = n.recipe_id
-            WHERE {where_clause}
-            ORDER BY r.name
-        ''')
-        
-        recipes = []
-        for row in cursor.fetchall():
-            recipe = {
-                'id': row[0],
-                'name': row[1],
-                'ingredients': json.loads(row[2]),
-                'instructions': row[3],
-                'cooking_time': row[4],
-                'difficulty': row[5],
-                'category': row[6],
-                'cuisine_type': row[7],
-                'tags': json.loads(row[8]) if row[8] else [],
-                'created_at': row[9],
-                'nutrition': {
-                    'calories': row[11],
-                    'protein': row[12],
-                    'carbs': row[13],
-                    'fat': row[14],
-                    'fiber': row[15],
-                    'sugar': row[16],
-                    'sodium': row[17]
-                }
-            }
-            recipes.append(recipe)
-        
-        conn.close()
-        return recipes
+        tag_conditions = ' OR '.join('r.tags LIKE ?' for _ in tags) or '1=1'
+        return self._query_recipes(f'WHERE {tag_conditions}', [f'%{tag}%' for tag in tags],
+                                   with_text=with_text)
     
     def get_categories(self):
         """Get all available categories"""
@@ -286,46 +439,10 @@ class RecipeDatabase:
         conn.close()
         return sorted(list(all_tags))
     
-    def search_recipes(self, query):
+    def search_recipes(self, query, with_text=True):
         """Search recipes by name or ingredients"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT r.*, n.calories, n.protein, n.carbs, n.fat, n.fiber, n.sugar, n.sodium
-            FROM recipes r
-            LEFT JOIN nutrition n ON r.id = n.recipe_id
-            WHERE r.name LIKE ? OR r.ingredients LIKE ?
-            ORDER BY r.name
-        ''', (f'%{query}%', f'%{query}%'))
-        
-        recipes = []
-        for row in cursor.fetchall():
-            recipe = {
-                'id': row[0],
-                'name': row[1],
-                'ingredients': json.loads(row[2]),
-                'instructions': row[3],
-                'cooking_time': row[4],
-                'difficulty': row[5],
-                'category': row[6],
-                'cuisine_type': row[7],
-                'tags': json.loads(row[8]) if row[8] else [],
-                'created_at': row[9],
-                'nutrition': {
-                    'calories': row[11],
-                    'protein': row[12],
-                    'carbs': row[13],
-                    'fat': row[14],
-                    'fiber': row[15],
-                    'sugar': row[16],
-                    'sodium': row[17]
-                }
-            }
-            recipes.append(recipe)
-        
-        conn.close()
-        return recipes 
+        return self._query_recipes('WHERE r.name LIKE ? OR r.ingredients LIKE ?',
+                                   (f'%{query}%', f'%{query}%'), with_text=with_text)
     
     def get_recipe(self, recipe_id):
         """Get a single recipe by ID with nutrition information"""
@@ -1,9 +1,20 @@
 import json
 import random
-import os
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime
 from database import RecipeDatabase
 from nutrition_api import NutritionAPI
+from meal_optimizer import MealPlanOptimizer
+from candidate_pools import get_candidate_pools
+from recipe_similarity import get_similarity_graph
+from recipe_table import RecipeTable, MealPlanArray, render_day
+from recipe_catalogue import get_recipe_catalogue
+
+# Share of the daily calorie target given to each meal slot, by number of slots
+MEAL_CALORIE_SHARES = {
+    3: [0.25, 0.40, 0.35],              # breakfast, lunch, dinner
+    4: [0.20, 0.35, 0.30, 0.15]         # breakfast, lunch, dinner, snack
+}
 
 class TeluguDietGenerator:
     def __init__(self):
@@ -11,8 +22,8 @@ class TeluguDietGenerator:
         # Initialize database connection
         self.db = RecipeDatabase()
         
-        # Remove any vegetarian recipe references
-        self.recipes = []  # Will be loaded from CSV
+        # Recipes come from the catalogue shared by every module
+        self.catalogue = get_recipe_catalogue()
         
         # Diet preferences in Telugu - only non-vegetarian
         self.diet_preferences = {
@@ -52,287 +63,16 @@ class TeluguDietGenerator:
         }
     
     def _load_non_veg_recipes(self):
-        """Load non-vegetarian recipes from CSV file"""
-        recipes = []
-        csv_file = os.path.join(os.path.dirname(__file__), 'non_veg_diet_recipes.csv')
-
-        try:
-            import pandas as pd
-            # Use pandas to properly handle multi-line CSV entries with proper quoting
-            df = pd.read_csv(csv_file, quotechar='"', skipinitialspace=True, encoding='utf-8')
-
-            for index, row in df.iterrows():
-                try:
-                    recipe_name = str(row['Dish']).strip()
-                    ingredients = str(row['Ingredients (with quantities)']).strip()
-                    calories = int(row['Calories']) if pd.notna(row['Calories']) else 0
-                    protein = int(row['Protein_g']) if pd.notna(row['Protein_g']) else 0
-                    carbs = int(row['Carbs_g']) if pd.notna(row['Carbs_g']) else 0
-                    fat = int(row['Fat_g']) if pd.notna(row['Fat_g']) else 0
-                    fiber = int(row['Fiber_g']) if pd.notna(row['Fiber_g']) else 0
-                    instructions = str(row['Preparation']).strip() if pd.notna(row['Preparation']) else "Cook as directed"
-
-                    recipe = {
-                        'id': f'nonveg_{index + 1}',
-                        'name': recipe_name,
-                        'ingredients': [ing.strip() for ing in ingredients.split(',')],
-                        'instructions': instructions,
-                        'preparation': instructions,  # Add preparation field for Streamlit compatibility
-                        'nutrition': {
-                            'calories': calories,
-                            'protein': protein,
-                            'carbs': carbs,
-                            'fat': fat,
-                            'fiber': fiber
-                        },
-                        'category': 'non_vegetarian',
-                        'tags': ['non_vegetarian'],
-                        'cooking_time': 30  # Default cooking time
-                    }
-
-                    recipes.append(recipe)
-
-                except Exception as e:
-                    print(f"Error parsing row {index}: {e}")
-                    continue
-
-            print(f"Successfully loaded {len(recipes)} non-vegetarian recipes from CSV")
-
-        except ImportError:
-            print("pandas not available, using fallback CSV parsing")
-            recipes = self._load_csv_fallback(csv_file)
-        except FileNotFoundError:
-            print(f"CSV file not found: {csv_file}")
-            print("Using sample non-vegetarian recipes as fallback")
-            recipes = self._create_sample_nonveg_recipes()
-        except Exception as e:
-            print(f"Error loading CSV file: {e}")
-            recipes = self._create_sample_nonveg_recipes()
-
-        return recipes
+        """Non-vegetarian recipes from the shared catalogue"""
+        return self.catalogue.non_veg_recipes()
 
     def _load_veg_recipes(self):
-        """Load vegetarian recipes from CSV file"""
-        recipes = []
-        csv_file = os.path.join(os.path.dirname(__file__), 'veg_diet_recipes.csv')
-
-        try:
-            import pandas as pd
-            # Use pandas to properly handle multi-line CSV entries with proper quoting
-            df = pd.read_csv(csv_file, quotechar='"', skipinitialspace=True, encoding='utf-8')
-
-            for index, row in df.iterrows():
-                try:
-                    recipe_name = str(row['Dish']).strip()
-                    ingredients = str(row['Ingredients']).strip()  # Note: different column name for veg recipes
-
-                    # Parse nutrition information
-                    calories = int(row['Calories']) if pd.notna(row['Calories']) else 300
-                    protein = float(row['Protein_g']) if pd.notna(row['Protein_g']) else 10
-                    carbs = float(row['Carbs_g']) if pd.notna(row['Carbs_g']) else 40
-                    fat = float(row['Fat_g']) if pd.notna(row['Fat_g']) else 10
-                    fiber = float(row['Fiber_g']) if pd.notna(row['Fiber_g']) else 5
-
-                    # Get preparation instructions
-                    preparation = str(row['Preparation']).strip() if pd.notna(row['Preparation']) else "Cook as directed"
-
-                    # Create recipe object
-                    recipe = {
-                        'id': f'veg_{index}',
-                        'name': recipe_name,
-                        'ingredients': ingredients.split(',') if ',' in ingredients else [ingredients],
-                        'nutrition': {
-                            'calories': calories,
-                            'protein': protein,
-                            'carbs': carbs,
-                            'fat': fat,
-                            'fiber': fiber
-                        },
-                        'instructions': preparation,
-                        'preparation': preparation,  # For compatibility
-                        'category': 'vegetarian',
-                        'tags': ['vegetarian'],
-                        'cooking_time': 30
-                    }
-
-                    recipes.append(recipe)
-
-                except Exception as e:
-                    print(f"Error parsing vegetarian row {index}: {e}")
-                    continue
-
-            print(f"Successfully loaded {len(recipes)} vegetarian recipes from CSV")
-
-        except ImportError:
-            print("pandas not available, using fallback CSV parsing for vegetarian recipes")
-            recipes = self._load_veg_csv_fallback(csv_file)
-        except FileNotFoundError:
-            print(f"Vegetarian CSV file not found: {csv_file}")
-            print("Using sample vegetarian recipes as fallback")
-            recipes = self._create_sample_veg_recipes()
-        except Exception as e:
-            print(f"Error loading vegetarian CSV file: {e}")
-            recipes = self._create_sample_veg_recipes()
-
-        return recipes
-
-    def _load_csv_fallback(self, csv_file):
-        """Fallback CSV parsing without pandas"""
-        recipes = []
-        try:
-            import csv
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                # Read the entire file content first
-                content = file.read()
+        """Vegetarian recipes from the shared catalogue"""
+        return self.catalogue.veg_recipes()
 
-                # Split by lines but handle multi-line entries
-                lines = content.split('\n')
-                current_row = []
-                in_quotes = False
-
-                for line in lines[1:]:  # Skip header
-                    if not line.strip():
-                        continue
-
-                    # Simple parsing - look for complete rows
-                    if line.count(',') >= 6 and not in_quotes:
-                        if current_row:
-                            # Process previous row
-                            self._process_csv_row(current_row, recipes, len(recipes) + 1)
-                        current_row = [line]
-                    else:
-                        if current_row:
-                            current_row.append(line)
-
-                # Process last row
-                if current_row:
-                    self._process_csv_row(current_row, recipes, len(recipes) + 1)
-
-        except Exception as e:
-            print(f"Fallback CSV parsing failed: {e}")
-            return self._create_sample_nonveg_recipes()
-
-        return recipes
-
-    def _load_veg_csv_fallback(self, csv_file):
-        """Fallback CSV parsing for vegetarian recipes without pandas"""
-        recipes = []
-        try:
-            import csv
-            with open(csv_file, 'r', encoding='utf-8') as file:
-                reader = csv.DictReader(file)
-                for index, row in enumerate(reader):
-                    try:
-                        recipe = {
-                            'id': f'veg_{index}',
-                            'name': row['Dish'].strip(),
-                            'ingredients': row['Ingredients'].split(','),
-                            'nutrition': {
-                                'calories': int(row['Calories']) if row['Calories'] else 300,
-                                'protein': float(row['Protein_g']) if row['Protein_g'] else 10,
-                                'carbs': float(row['Carbs_g']) if row['Carbs_g'] else 40,
-                                'fat': float(row['Fat_g']) if row['Fat_g'] else 10,
-                                'fiber': float(row['Fiber_g']) if row['Fiber_g'] else 5
-                            },
-                            'instructions': row['Preparation'].strip() if row['Preparation'] else "Cook as directed",
-                            'preparation': row['Preparation'].strip() if row['Preparation'] else "Cook as directed",
-                            'category': 'vegetarian',
-                            'tags': ['vegetarian'],
-                            'cooking_time': 30
-                        }
-                        recipes.append(recipe)
-                    except Exception as e:
-                        print(f"Error parsing vegetarian fallback row {index}: {e}")
-                        continue
-        except Exception as e:
-            print(f"Vegetarian fallback CSV parsing failed: {e}")
-            return self._create_sample_veg_recipes()
-
-        return recipes
-
-    def _create_sample_veg_recipes(self):
-        """Create sample vegetarian recipes as fallback"""
-        return [
-            {
-                'id': 'veg_khichdi',
-                'name': 'Vegetable Khichdi',
-                'ingredients': ['1/2 cup rice', '1/4 cup moong dal', '1 cup mixed vegetables', 'spices'],
-                'nutrition': {'calories': 320, 'protein': 11, 'carbs': 48, 'fat': 8, 'fiber': 6},
-                'instructions': 'Cook rice and dal with vegetables and spices until soft',
-                'preparation': 'Cook rice and dal with vegetables and spices until soft',
-                'category': 'vegetarian',
-                'tags': ['vegetarian'],
-                'cooking_time': 30
-            },
-            {
-                'id': 'veg_palak_paneer',
-                'name': 'Palak Paneer',
-                'ingredients': ['200g spinach', '100g paneer', '1 onion', 'spices'],
-                'nutrition': {'calories': 280, 'protein': 14, 'carbs': 12, 'fat': 20, 'fiber': 5},
-                'instructions': 'Cook spinach with paneer and spices',
-                'preparation': 'Cook spinach with paneer and spices',
-                'category': 'vegetarian',
-                'tags': ['vegetarian'],
-                'cooking_time': 25
-            },
-            {
-                'id': 'veg_chickpea_salad',
-                'name': 'Chickpea Salad',
-                'ingredients': ['1 cup chickpeas', '1 cucumber', '1 tomato', 'lemon juice'],
-                'nutrition': {'calories': 250, 'protein': 12, 'carbs': 35, 'fat': 8, 'fiber': 10},
-                'instructions': 'Mix chickpeas with vegetables and dressing',
-                'preparation': 'Mix chickpeas with vegetables and dressing',
-                'category': 'vegetarian',
-                'tags': ['vegetarian'],
-                'cooking_time': 15
-            }
-        ]
-
-    def _process_csv_row(self, row_lines, recipes, recipe_id):
-        """Process a CSV row that might span multiple lines"""
-        try:
-            # Join all lines and try to parse
-            full_line = ' '.join(row_lines).strip()
-
-            # Simple regex-based parsing for the specific CSV format
-            import re
-
-            # Pattern to match: Name,"ingredients",calories,protein,carbs,fat,fiber,"instructions"
-            pattern = r'^([^,]+),"([^"]+)",(\d+),(\d+),(\d+),(\d+),(\d+),"(.+)"$'
-            match = re.match(pattern, full_line, re.DOTALL)
-
-            if match:
-                recipe_name = match.group(1).strip()
-                ingredients = match.group(2).strip()
-                calories = int(match.group(3))
-                protein = int(match.group(4))
-                carbs = int(match.group(5))
-                fat = int(match.group(6))
-                fiber = int(match.group(7))
-                instructions = match.group(8).strip()
-
-                recipe = {
-                    'id': f'nonveg_{recipe_id}',
-                    'name': recipe_name,
-                    'ingredients': [ing.strip() for ing in ingredients.split(',')],
-                    'instructions': instructions,
-                    'nutrition': {
-                        'calories': calories,
-                        'protein': protein,
-                        'carbs': carbs,
-                        'fat': fat,
-                        'fiber': fiber
-                    },
-                    'category': 'non_vegetarian',
-                    'tags': ['non_vegetarian'],
-                    'cooking_time': 30
-                }
-
-                recipes.append(recipe)
-
-        except Exception as e:
-            print(f"Error processing CSV row: {e}")
-            pass
+    def catalogue_version(self):
+        """Version of the recipe catalogues, changing whenever a CSV file is modified"""
+        return self.catalogue.version()
 
     def _guess_category(self, dish_name):
         name = dish_name.lower()
@@ -343,34 +83,28 @@ class TeluguDietGenerator:
         else:
             return 'main_course'
     
-    def generate_diet_menu(self, user_input):
+    def generate_diet_menu(self, user_input, seed=None, start_date=None, on_day=None):
         """
-        Generate a personalized Telugu diet menu based on user input
+        Generate a personalized Telugu diet menu based on user input.
+        Passing a seed (and start_date) makes the plan reproducible.
+        on_day(day_key, day_data) receives each day as soon as it is planned.
         """
         try:
             # Parse user input
             preferences = self._parse_user_input(user_input)
             
             # Get available recipes based on diet type
-            if preferences['diet_type'] == 'vegetarian':
-                all_recipes = self._load_veg_recipes()
-            elif preferences['diet_type'] == 'non_vegetarian':
-                all_recipes = self._load_non_veg_recipes()
-            else:
-                # Default to non-vegetarian for backward compatibility
-                all_recipes = self._load_non_veg_recipes()
-
-            # Ensure we have recipes loaded
-            if not all_recipes:
+            filtered_recipes = self._plan_recipes(preferences)
+            if not filtered_recipes:
                 return {'error': f'No {preferences["diet_type"]} recipes available'}
             
-            filtered_recipes = self._filter_recipes(all_recipes, preferences)
-            
-            # Generate meal plan
-            meal_plan = self._create_meal_plan(filtered_recipes, preferences)
+            # Generate meal plan as an index array; the nested dict is only for rendering
+            plan = self._create_plan_array(filtered_recipes, preferences,
+                                           rng=random.Random(seed), start_date=start_date, on_day=on_day)
+            meal_plan = plan.to_dict(self._get_telugu_date)
             
             # Calculate nutrition summary
-            nutrition_summary = self._calculate_nutrition_summary(meal_plan)
+            nutrition_summary = plan.nutrition_summary()
             
             # Generate Telugu recommendations
             recommendations = self._generate_telugu_recommendations(preferences)
@@ -391,6 +125,18 @@ class TeluguDietGenerator:
                 'recommendations': []
             }
     
+    def _plan_recipes(self, preferences):
+        """Recipes of the preferred diet type that pass the preference filters"""
+        if preferences['diet_type'] == 'vegetarian':
+            all_recipes = self._load_veg_recipes()
+        else:
+            # Default to non-vegetarian for backward compatibility
+            all_recipes = self._load_non_veg_recipes()
+        
+        if not all_recipes:
+            return []
+        return self._filter_recipes(all_recipes, preferences)
+    
     def _parse_user_input(self, user_input):
         """Parse user input to extract preferences"""
         preferences = {
@@ -519,198 +265,117 @@ class TeluguDietGenerator:
 
         return filtered
     
-    def _create_meal_plan(self, recipes, preferences):
-        """Create a meal plan for the specified duration"""
-        meal_plan = {}
-        
-        # Make a copy of recipes to avoid modifying the original list
-        available_recipes = recipes.copy()
-        
-        for day in range(1, preferences['duration'] + 1):
-            date = datetime.now() + timedelta(days=day-1)
-            day_key = date.strftime('%Y-%m-%d')
-            
-            # Set a different seed for each day to ensure variety
-            day_seed = f"{preferences['diet_type']}_{preferences['health_goal']}_{day}"
-            day_seed_val = sum(ord(c) for c in day_seed)
-            random.seed(day_seed_val)
-            
-            meal_plan[day_key] = {
-                'day': day,
-                'date': date.strftime('%A, %B %d'),
-                'telugu_date': self._get_telugu_date(date),
-                'meals': {}
-            }
-            
-            # Track selected recipes for this day to avoid duplicates
-            selected_recipes_ids = set()
-            
-            # Generate meals for the day
-            if preferences['meals_per_day'] >= 3:
-                for meal_type in ['breakfast', 'lunch', 'dinner']:
-                    meal = self._select_meal(recipes, meal_type, selected_recipes_ids)
-
-                    # Try to avoid duplicates within the same day if we have enough recipes
-                    if meal and len(recipes) > preferences['meals_per_day']:
-                        attempts = 0
-                        while meal.get('id') in selected_recipes_ids and attempts < 3:
-                            meal = self._select_meal(recipes, meal_type, selected_recipes_ids)
-                            attempts += 1
-
-                    meal_plan[day_key]['meals'][meal_type] = meal
-                    if meal:
-                        selected_recipes_ids.add(meal.get('id'))
-
-            if preferences['meals_per_day'] >= 4:
-                snack = self._select_meal(recipes, 'snack', selected_recipes_ids)
-
-                # Try to avoid duplicates if possible
-                if snack and len(recipes) > preferences['meals_per_day']:
-                    attempts = 0
-                    while snack.get('id') in selected_recipes_ids and attempts < 3:
-                        snack = self._select_meal(recipes, 'snack', selected_recipes_ids)
-                        attempts += 1
-
-                meal_plan[day_key]['meals']['snack'] = snack
-                if snack:
-                    selected_recipes_ids.add(snack.get('id'))
-            
-            # Reset random seed after each day
-            random.seed()
-        
-        return meal_plan
+    def _create_meal_plan(self, recipes, preferences, rng=None, start_date=None):
+        """Create a meal plan for the specified duration using a plan-scoped random generator"""
+        plan = self._create_plan_array(recipes, preferences, rng, start_date)
+        return plan.to_dict(self._get_telugu_date)
+
+    def _create_plan_array(self, recipes, preferences, rng=None, start_date=None, on_day=None):
+        """Create the meal plan as an index array into the recipe table"""
+        if start_date is None:
+            start_date = datetime.now()
+
+        table, meal_types, day_picks = self._plan_picks(recipes, preferences, rng)
+        daily_picks = []
+        for day, picks in enumerate(day_picks):
+            daily_picks.append(picks)
+            if on_day is not None:
+                on_day(*render_day(table, meal_types, start_date, day, picks, self._get_telugu_date))
+
+        return MealPlanArray(table, daily_picks, meal_types, start_date)
+
+    def iter_meal_plan(self, user_input, seed=None, start_date=None):
+        """Yield (day_key, day_data) for each day of a diet plan as soon as it is planned.
+
+        Gives the same days as generate_diet_menu with the same seed and
+        start_date, but only the current day is ever built, so long plans run
+        in constant memory.  Feed the days to a PlanSummary for totals.
+        """
+        preferences = self._parse_user_input(user_input)
+        if start_date is None:
+            start_date = datetime.now()
+
+        table, meal_types, day_picks = self._plan_picks(self._plan_recipes(preferences), preferences,
+                                                        random.Random(seed))
+        for day, picks in enumerate(day_picks):
+            yield render_day(table, meal_types, start_date, day, picks, self._get_telugu_date)
+
+    def _plan_picks(self, recipes, preferences, rng=None):
+        """(table, meal types, iterator of each day's recipe indices) for a plan"""
+        if rng is None:
+            rng = random.Random()
+
+        # Meal slots for the day; fewer than 3 meals leaves the day empty
+        meal_types = []
+        if preferences['meals_per_day'] >= 3:
+            meal_types = ['breakfast', 'lunch', 'dinner']
+        if preferences['meals_per_day'] >= 4:
+            meal_types.append('snack')
+
+        table = RecipeTable(recipes)
+        if not (meal_types and recipes):
+            return table, meal_types, iter([[] for _ in range(preferences['duration'])])
+
+        # Pick meals that best hit the calorie and macro targets for each day,
+        # keeping near-duplicate dishes apart
+        optimizer = MealPlanOptimizer(table, similarity=get_similarity_graph(recipes))
+        pools = get_candidate_pools(recipes)
+        slot_candidates = [self._meal_type_candidates(recipes, meal_type, pools) for meal_type in meal_types]
+        day_picks = optimizer.iter_plan(
+            preferences['calorie_target'],
+            MEAL_CALORIE_SHARES[len(meal_types)],
+            preferences['duration'],
+            slot_candidates,
+            rng=np.random.default_rng(rng.getrandbits(64))
+        )
+        return table, meal_types, day_picks
+
+    def _meal_type_candidates(self, recipes, meal_type, pools=None):
+        """Indices of recipes suited to a meal type, using the same preferences as _select_meal"""
+        if pools is None:
+            pools = get_candidate_pools(recipes)
+        preferred = pools.meal_type_candidates(meal_type)
+
+        # Fall back to every recipe when no recipe matches the preference
+        return preferred or list(range(len(recipes)))
     
     
-    def _select_meal(self, recipes, meal_type, used_recipes=None):
-        """Select a meal from available non-vegetarian recipes with enhanced randomization"""
+    def _select_meal(self, recipes, meal_type, used_recipes=None, rng=None, pools=None):
+        """Select a meal from available non-vegetarian recipes using the plan's random generator"""
         if used_recipes is None:
             used_recipes = set()
-
-        # Enhanced randomization with multiple entropy sources
-        import time
-        import hashlib
-
-        # Create a unique seed based on current time, meal type, and used recipes
-        entropy_string = f"{time.time()}_{meal_type}_{len(used_recipes)}_{random.random()}"
-        seed_hash = hashlib.md5(entropy_string.encode()).hexdigest()
-        seed_value = int(seed_hash[:8], 16) % 100000
-        random.seed(seed_value)
-
-        # Enhanced filtering for better variety
-        # 1. First try recipes not used in this session
-        available_recipes = [r for r in recipes if r['id'] not in used_recipes]
-
-        # 2. If we have enough unused recipes, use them
-        if len(available_recipes) >= 3:
-            pass  # Use unused recipes
+        if rng is None:
+            rng = random.Random()
+
+        if not recipes:
+            return None
+
+        # Candidate pools are built once per catalogue version, sorted by calories;
+        # callers picking many meals pass them in to skip the lookup
+        if pools is None:
+            pools = get_candidate_pools(recipes)
+
+        # Only skip recipes used in this session while at least 3 unused ones remain
+        unused_count = len(recipes) - len(pools.ids.intersection(used_recipes))
+        skip_used = unused_count >= 3
+
+        # Prefer recipes suited to the meal type (egg dishes for breakfast,
+        # heartier lunches, moderate dinners, lighter snacks)
+        preferred = [i for i in pools.meal_type_candidates(meal_type)
+                     if not skip_used or recipes[i]['id'] not in used_recipes]
+        if preferred:
+            return recipes[rng.choice(preferred)]
+
+        if skip_used:
+            available = [r for r in recipes if r['id'] not in used_recipes]
         else:
-            # 3. If running low on unused recipes, include all but prefer unused ones
-            unused_recipes = [r for r in recipes if r['id'] not in used_recipes]
-            used_recipes_list = [r for r in recipes if r['id'] in used_recipes]
-
-            # Shuffle both lists for randomness
-            random.shuffle(unused_recipes)
-            random.shuffle(used_recipes_list)
-
-            # Combine with unused recipes first
-            available_recipes = unused_recipes + used_recipes_list
+            available = recipes
 
-        if not available_recipes:
-            available_recipes = recipes  # Reset if all recipes used
+        return rng.choice(available)
 
-        # Shuffle the available recipes for better variety
-        random.shuffle(available_recipes)
-
-        # Select based on meal type preferences
-        if meal_type == 'breakfast':
-            # Prefer lighter, egg-based dishes for breakfast
-            breakfast_preferred = [r for r in available_recipes
-                                 if any(word in r['name'].lower()
-                                       for word in ['egg', 'omelet', 'boiled'])]
-            if breakfast_preferred:
-                selected = random.choice(breakfast_preferred)
-            else:
-                selected = random.choice(available_recipes)
-
-        elif meal_type == 'lunch':
-            # Prefer heartier dishes for lunch
-            lunch_preferred = [r for r in available_recipes
-                              if r['nutrition']['calories'] >= 300]
-            if lunch_preferred:
-                selected = random.choice(lunch_preferred)
-            else:
-                selected = random.choice(available_recipes)
-
-        elif meal_type == 'dinner':
-            # Prefer moderate calorie dishes for dinner
-            dinner_preferred = [r for r in available_recipes
-                               if 250 <= r['nutrition']['calories'] <= 400]
-            if dinner_preferred:
-                selected = random.choice(dinner_preferred)
-            else:
-                selected = random.choice(available_recipes)
-
-        elif meal_type == 'snack':
-            # Prefer lighter dishes for snacks
-            snack_preferred = [r for r in available_recipes
-                              if r['nutrition']['calories'] < 300]
-            if snack_preferred:
-                selected = random.choice(snack_preferred)
-            else:
-                selected = random.choice(available_recipes)
-
-        else:
-            selected = random.choice(available_recipes)
-
-        return selected
     def _calculate_nutrition_summary(self, meal_plan):
         """Calculate total nutrition for the meal plan"""
-        total_nutrition = {
-            'calories': 0,
-            'protein': 0,
-            'carbs': 0,
-            'fat': 0,
-            'fiber': 0,
-            'sugar': 0,
-            'sodium': 0
-        }
-        
-        meal_count = 0
-        
-        for day_data in meal_plan.values():
-            for meal in day_data['meals'].values():
-                if meal and meal.get('nutrition'):
-                    for key in total_nutrition:
-                        if key in meal['nutrition'] and meal['nutrition'][key] is not None:
-                            total_nutrition[key] += meal['nutrition'][key]
-                    meal_count += 1
-        
-        # Calculate averages per meal and per day
-        days_count = len(meal_plan)
-
-        if meal_count > 0:
-            avg_per_meal = {}
-            avg_per_day = {}
-
-            for key in total_nutrition:
-                avg_per_meal[key] = round(total_nutrition[key] / meal_count, 1)
-                avg_per_day[key] = round(total_nutrition[key] / days_count, 1) if days_count > 0 else 0
-
-            # Return both formats for compatibility
-            return {
-                **avg_per_meal,  # For backward compatibility
-                'avg_calories_per_day': avg_per_day['calories'],
-                'avg_protein_per_day': avg_per_day['protein'],
-                'avg_carbs_per_day': avg_per_day['carbs'],
-                'avg_fat_per_day': avg_per_day['fat'],
-                'avg_fiber_per_day': avg_per_day['fiber'],
-                'total_calories': total_nutrition['calories'],
-                'total_protein': total_nutrition['protein'],
-                'meal_count': meal_count,
-                'days_count': days_count
-            }
-
-        return total_nutrition
+        return MealPlanArray.from_meal_plan(meal_plan).nutrition_summary()
     
     def _generate_telugu_recommendations(self, preferences):
         """Generate Telugu recommendations based on preferences"""
@@ -811,88 +476,3 @@ class TeluguDietGenerator:
             ]
         
         return suggestions
-
-    def _create_sample_nonveg_recipes(self):
-        """Create sample non-vegetarian recipes as fallback - NO VEGETARIAN RECIPES"""
-        return [
-            {
-                'id': 'nonveg_chicken_curry',
-                'name': 'Chicken Curry',
-                'ingredients': ['500g chicken', '2 onions', '3 tomatoes', '1 tbsp ginger-garlic paste', 'spices'],
-                'nutrition': {'calories': 350, 'protein': 25, 'carbs': 15, 'fat': 20, 'fiber': 3},
-                'instructions': 'Cook chicken with spices and vegetables until tender',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 45
-            },
-            {
-                'id': 'nonveg_egg_curry',
-                'name': 'Egg Curry',
-                'ingredients': ['6 eggs', '2 onions', '2 tomatoes', '1 tbsp oil', 'curry leaves'],
-                'nutrition': {'calories': 280, 'protein': 18, 'carbs': 12, 'fat': 18, 'fiber': 2},
-                'instructions': 'Boil eggs and cook in spicy gravy',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 30
-            },
-            {
-                'id': 'nonveg_fish_fry',
-                'name': 'Fish Fry',
-                'ingredients': ['500g fish', '1 tbsp red chili powder', '1 tsp turmeric', 'oil for frying'],
-                'nutrition': {'calories': 320, 'protein': 30, 'carbs': 5, 'fat': 18, 'fiber': 1},
-                'instructions': 'Marinate fish and deep fry until golden',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 25
-            },
-            {
-                'id': 'nonveg_mutton_biryani',
-                'name': 'Mutton Biryani',
-                'ingredients': ['500g mutton', '2 cups basmati rice', '1 cup yogurt', 'biryani spices'],
-                'nutrition': {'calories': 450, 'protein': 28, 'carbs': 45, 'fat': 22, 'fiber': 2},
-                'instructions': 'Layer cooked mutton and rice, cook on dum',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 90
-            },
-            {
-                'id': 'nonveg_egg_omelet',
-                'name': 'Masala Omelet',
-                'ingredients': ['3 eggs', '1 onion', '2 green chilies', '1 tomato', 'coriander leaves'],
-                'nutrition': {'calories': 220, 'protein': 15, 'carbs': 8, 'fat': 14, 'fiber': 2},
-                'instructions': 'Beat eggs with vegetables and cook as omelet',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 10
-            },
-            {
-                'id': 'nonveg_chicken_biryani',
-                'name': 'Chicken Biryani',
-                'ingredients': ['500g chicken', '2 cups basmati rice', '1 cup yogurt', 'biryani spices'],
-                'nutrition': {'calories': 420, 'protein': 26, 'carbs': 42, 'fat': 18, 'fiber': 2},
-                'instructions': 'Layer cooked chicken and rice, cook on dum',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 75
-            },
-            {
-                'id': 'nonveg_prawn_curry',
-                'name': 'Prawn Curry',
-                'ingredients': ['500g prawns', '1 coconut', '2 onions', '3 tomatoes', 'curry spices'],
-                'nutrition': {'calories': 300, 'protein': 22, 'carbs': 18, 'fat': 16, 'fiber': 3},
-                'instructions': 'Cook prawns in coconut curry',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 35
-            },
-            {
-                'id': 'nonveg_chicken_tikka',
-                'name': 'Chicken Tikka',
-                'ingredients': ['500g chicken', '1 cup yogurt', '1 tbsp garam masala', '1 tbsp ginger-garlic paste'],
-                'nutrition': {'calories': 290, 'protein': 35, 'carbs': 8, 'fat': 12, 'fiber': 1},
-                'instructions': 'Marinate chicken and grill until cooked',
-                'category': 'non_vegetarian',
-                'tags': ['non_vegetarian'],
-                'cooking_time': 40
-            }
-        ]
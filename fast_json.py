@@ -0,0 +1,50 @@
+"""
+Fast JSON provider for Flask.
+
+Uses orjson when it is installed and the stdlib encoder otherwise.  Both
+write UTF-8 directly instead of escaping Telugu text into \\uXXXX
+sequences, and responses are always compact.
+"""
+
+import json
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    # Dates and dataclasses go through Flask's default() so output matches the stdlib path
+    ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME |
+                      orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_APPEND_NEWLINE)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider emitting compact UTF-8, through orjson when available"""
+
+    ensure_ascii = False
+    sort_keys = False
+    compact = True
+
+    def dumps_bytes(self, obj):
+        """Serialize obj to UTF-8 JSON bytes ending in a newline"""
+        if ORJSON_AVAILABLE:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)
+        return (json.dumps(obj, default=self.default, ensure_ascii=False,
+                           separators=(',', ':')) + '\n').encode('utf-8')
+
+    def dumps(self, obj, **kwargs):
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.dumps(obj, default=self.default, option=ORJSON_OPTIONS)[:-1].decode('utf-8')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if ORJSON_AVAILABLE and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
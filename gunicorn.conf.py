@@ -0,0 +1,48 @@
+"""
+Gunicorn settings for serving the Flask app in production.
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+Workers are pre-forked after the app is preloaded (see wsgi.py), each
+serving requests on a few threads.  Signals to the master:
+
+    HUP   graceful reload: start fresh workers, let old ones finish their
+          requests (up to graceful_timeout), keep the preloaded app
+    USR2  re-exec the master for a code upgrade, then QUIT the old master
+    TTIN / TTOU   add / remove one worker
+"""
+
+import config
+from config import (WEB_BIND, WEB_WORKERS, WEB_THREADS, WEB_TIMEOUT,
+                    WEB_GRACEFUL_TIMEOUT, WEB_MAX_REQUESTS)
+
+bind = WEB_BIND
+workers = WEB_WORKERS
+
+# Read by the app when it is preloaded below: per-host resources (batch plan
+# cores, the nutrition API quota) are split between the workers
+config.WEB_PROCESSES = workers
+threads = WEB_THREADS
+worker_class = 'gthread'
+
+# Build the app and recipe catalogue once in the master; workers share it copy-on-write
+preload_app = True
+
+timeout = WEB_TIMEOUT
+graceful_timeout = WEB_GRACEFUL_TIMEOUT
+keepalive = 5
+
+# Recycle workers now and then so slow leaks cannot build up; jitter avoids all restarting at once
+max_requests = WEB_MAX_REQUESTS
+max_requests_jitter = WEB_MAX_REQUESTS // 10
+
+accesslog = '-'
+errorlog = '-'
+
+
+def when_ready(server):
+    server.log.info(f"Serving with {workers} workers x {threads} threads on {bind}")
+
+
+def post_fork(server, worker):
+    server.log.info(f"Worker {worker.pid} started")
@@ -0,0 +1,149 @@
+import time
+import threading
+import numpy as np
+from ingredient_parser import parse_ingredient_line, line_key
+from nutrition_cache import NutritionCache
+from recipe_table import NUTRIENT_KEYS
+from config import NUTRITION_FALLBACK_TTL, NUTRITION_LINE_ROWS
+
+# Rows allocated up front; the matrix doubles from here up to max_lines
+INITIAL_ROWS = 64
+
+
+class IngredientNutrition:
+    """Nutrition memoized per normalized ingredient line and summed per recipe.
+
+    Each distinct line ('2 cup rice') is resolved once through `fetch_line`
+    and kept as a row of an (n_lines, n_nutrients) matrix; `cache`
+    persists the rows so other processes and later runs reuse them.  A
+    recipe's nutrition is the sum of its line rows, so a variant recipe
+    only costs lookups for the lines it does not share.  At most
+    `max_lines` lines are held in memory; later lines are looked up (from
+    `cache` if persisted) each time they are needed.
+
+    When `fetch_line` returns None (e.g. the API is down) `fallback` is
+    used instead; that row is not persisted and is retried after
+    `fallback_ttl` seconds, so lines recover once the API is back.
+    """
+
+    def __init__(self, fetch_line, cache=None, fallback=None, max_lines=NUTRITION_LINE_ROWS,
+                 fallback_ttl=NUTRITION_FALLBACK_TTL):
+        self.fetch_line = fetch_line
+        self.fallback = fallback
+        self.cache = cache or NutritionCache(db_path='')
+        self.max_lines = max_lines
+        self.fallback_ttl = fallback_ttl
+        self.rows = {}
+        self._matrix = np.zeros((min(INITIAL_ROWS, max_lines), len(NUTRIENT_KEYS)))
+        # Monotonic deadline of each row that holds a fallback estimate
+        self._expires = {}
+        self.lookups = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rows)
+
+    @property
+    def matrix(self):
+        """(n_lines, n_nutrients) view of the memoized line rows"""
+        return self._matrix[:len(self.rows)]
+
+    def line_rows(self, ingredients):
+        """(n_lines, n_nutrients) array with the nutrition of each ingredient line.
+
+        Lines not seen before (or whose fallback estimate expired) are
+        fetched.  Safe to share between threads: lookups run outside the
+        lock and only the row bookkeeping is serialized.
+        """
+        if isinstance(ingredients, str):
+            ingredients = [ingredients]
+        lines = []
+        for line in ingredients:
+            parsed = parse_ingredient_line(line)
+            key = line_key(parsed)
+            if key:
+                lines.append((key, parsed, line))
+
+        now = time.monotonic()
+        with self._lock:
+            missing = {key: (parsed, line) for key, parsed, line in lines if not self._fresh(key, now)}
+
+        fetched = {}
+        for key, (parsed, line) in missing.items():
+            nutrition, estimated = self._lookup(key, parsed, line)
+            fetched[key] = ([nutrition.get(name, 0) or 0 for name in NUTRIENT_KEYS], estimated)
+
+        values = np.zeros((len(lines), len(NUTRIENT_KEYS)))
+        with self._lock:
+            for key, (row, estimated) in fetched.items():
+                self._remember(key, row, estimated, now)
+            for position, (key, _, _) in enumerate(lines):
+                if key in fetched:
+                    values[position] = fetched[key][0]
+                else:
+                    values[position] = self._matrix[self.rows[key]]
+        return values
+
+    def _fresh(self, key, now):
+        """Whether a memoized row can be used as is"""
+        if key not in self.rows:
+            return False
+        deadline = self._expires.get(key)
+        return deadline is None or deadline > now
+
+    def _remember(self, key, row, estimated, now):
+        """Store a line's row, growing the matrix geometrically up to max_lines"""
+        index = self.rows.get(key)
+        if index is None:
+            if len(self.rows) >= self.max_lines:
+                return
+            index = len(self.rows)
+            if index == len(self._matrix):
+                grown = np.zeros((min(2 * len(self._matrix), self.max_lines), len(NUTRIENT_KEYS)))
+                grown[:index] = self._matrix
+                self._matrix = grown
+            self.rows[key] = index
+        self._matrix[index] = row
+        if estimated:
+            self._expires[key] = now + self.fallback_ttl
+        else:
+            self._expires.pop(key, None)
+
+    def _lookup(self, key, parsed, line):
+        """(nutrition, whether it is a fallback estimate) for one line"""
+        nutrition = self.cache.get(key)
+        if nutrition is not None:
+            return nutrition, False
+
+        self.lookups += 1
+        nutrition = self.fetch_line(parsed, line)
+        if nutrition is not None:
+            self.cache.put(key, nutrition)
+            return nutrition, False
+        if self.fallback is not None:
+            return self.fallback(parsed, line), True
+        return {}, True
+
+    def recipe_nutrition(self, ingredients):
+        """Summed nutrition dict for one recipe's ingredient lines"""
+        totals = self.line_rows(ingredients).sum(axis=0)
+        return {key: round(float(value), 1) for key, value in zip(NUTRIENT_KEYS, totals)}
+
+    def bulk_nutrition(self, ingredient_lists):
+        """(n_recipes, n_nutrients) array for many recipes in one sparse product.
+
+        The recipes-by-lines incidence matrix is kept in COO form (one entry
+        per recipe line) and multiplied into the line rows with a
+        scatter-add, so recomputing the catalogue never loops per nutrient.
+        """
+        recipe_index = []
+        line_values = []
+        for recipe, ingredients in enumerate(ingredient_lists):
+            values = self.line_rows(ingredients)
+            recipe_index.extend([recipe] * len(values))
+            line_values.append(values)
+
+        totals = np.zeros((len(ingredient_lists), len(NUTRIENT_KEYS)))
+        if recipe_index:
+            np.add.at(totals, np.array(recipe_index), np.concatenate(line_values))
+        return totals
@@ -0,0 +1,98 @@
+import re
+from collections import namedtuple
+
+# Canonical unit names and the spellings that map to them
+UNIT_ALIASES = {
+    'cup': ('cup', 'cups', 'c'),
+    'tbsp': ('tbsp', 'tbsps', 'tablespoon', 'tablespoons', 'tbs'),
+    'tsp': ('tsp', 'tsps', 'teaspoon', 'teaspoons'),
+    'g': ('g', 'gm', 'gms', 'gram', 'grams'),
+    'kg': ('kg', 'kgs', 'kilogram', 'kilograms'),
+    'ml': ('ml', 'millilitre', 'milliliter', 'millilitres', 'milliliters'),
+    'l': ('l', 'litre', 'liter', 'litres', 'liters'),
+    'oz': ('oz', 'ounce', 'ounces'),
+    'lb': ('lb', 'lbs', 'pound', 'pounds'),
+    'inch': ('inch', 'inches'),
+    'pinch': ('pinch', 'pinches'),
+    'clove': ('clove', 'cloves'),
+    'sprig': ('sprig', 'sprigs'),
+    'slice': ('slice', 'slices'),
+    'piece': ('piece', 'pieces', 'pc', 'pcs'),
+    'can': ('can', 'cans', 'tin', 'tins')
+}
+UNITS = {alias: unit for unit, aliases in UNIT_ALIASES.items() for alias in aliases}
+
+_NUMBER = r'\d+\s+\d+/\d+|\d+/\d+|\d+(?:\.\d+)?'
+_QUANTITY = re.compile(rf'^\s*({_NUMBER})(?:\s*(?:-|to)\s*({_NUMBER}))?\s*', re.IGNORECASE)
+_UNIT = re.compile(r'^([a-z]+)\.?\b\s*(?:of\s+)?', re.IGNORECASE)
+_NOTE = re.compile(r'\(.*?\)|,.*$|\bfor\s+\w+$|\bto\s+taste\b', re.IGNORECASE)
+
+_LEADING = re.compile(r'^(?:approx\.?|approximately|about|around)\s+', re.IGNORECASE)
+_FRACTIONS = {'½': '1/2', '⅓': '1/3', '⅔': '2/3', '¼': '1/4', '¾': '3/4', '⅛': '1/8'}
+
+IngredientLine = namedtuple('IngredientLine', ['quantity', 'unit', 'food'])
+
+
+def _number(text):
+    """Parse '2', '1.5', '1/2' or '1 1/2'"""
+    total = 0.0
+    for part in text.split():
+        if '/' in part:
+            numerator, denominator = part.split('/')
+            total += float(numerator) / float(denominator) if float(denominator) else 0.0
+        else:
+            total += float(part)
+    return total
+
+
+def parse_ingredient_line(line):
+    """Split an ingredient line into (quantity, unit, food).
+
+    Ranges such as '2-3 green chilies' use their midpoint; lines without a
+    quantity ('Salt to taste') get quantity None.
+    """
+    text = str(line)
+    for char, fraction in _FRACTIONS.items():
+        text = text.replace(char, f' {fraction}')
+    text = _LEADING.sub('', ' '.join(text.lower().split()))
+    quantity = None
+    unit = ''
+
+    match = _QUANTITY.match(text)
+    if match:
+        quantity = _number(match.group(1))
+        if match.group(2):
+            quantity = (quantity + _number(match.group(2))) / 2
+        text = text[match.end():]
+
+        # '200g chicken' has no space between the number and the unit
+        unit_match = _UNIT.match(text)
+        if unit_match and unit_match.group(1) in UNITS:
+            unit = UNITS[unit_match.group(1)]
+            text = text[unit_match.end():]
+
+    food = ' '.join(_NOTE.sub('', text).split()).strip(' ,.-')
+    return IngredientLine(quantity, unit, food or text.strip())
+
+
+def line_key(parsed):
+    """Stable text key for a parsed line, e.g. '2 cup rice'"""
+    quantity = '' if parsed.quantity is None else f'{parsed.quantity:g}'
+    return ' '.join(part for part in (quantity, parsed.unit, parsed.food) if part)
+
+
+def split_ingredients(text):
+    """Split a CSV 'Ingredients' cell on commas outside parentheses"""
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(depth - 1, 0)
+        if char == ',' and depth == 0:
+            parts.append(''.join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
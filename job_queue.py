@@ -0,0 +1,209 @@
+import os
+import json
+import uuid
+import socket
+import sqlite3
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from config import JOB_QUEUE_PATH, JOB_QUEUE_WORKERS, JOB_TTL
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+class JobQueue:
+    """Run long tasks off the request path on a small thread pool.
+
+    Every job has a row in a SQLite `jobs` table holding its status
+    (queued, running, done or failed), progress, result and error, so its
+    state can be polled by id from any request.  Jobs may also publish
+    partial results as numbered events in `job_events`.  A finished job
+    and its events are deleted `ttl` seconds after it finishes.  Submitting
+    a job while one with the same name is still active returns the active
+    job's id.
+
+    Several processes (e.g. gunicorn workers) may share one database, so
+    each job records the host and pid running it; unfinished jobs are only
+    failed once that process is gone.
+    """
+
+    def __init__(self, db_path=JOB_QUEUE_PATH, workers=JOB_QUEUE_WORKERS, ttl=JOB_TTL):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self._lock = threading.Lock()
+        self.init_database()
+
+    def init_database(self):
+        """Create the jobs tables and fail jobs a dead process left unfinished"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                done INTEGER DEFAULT 0,
+                total INTEGER,
+                result TEXT,
+                error TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                started_at TIMESTAMP,
+                finished_at TIMESTAMP,
+                owner_host TEXT,
+                owner_pid INTEGER
+            )
+        ''')
+        columns = {row[1] for row in conn.execute('PRAGMA table_info(jobs)')}
+        if 'owner_pid' not in columns:
+            conn.execute('ALTER TABLE jobs ADD COLUMN owner_host TEXT')
+            conn.execute('ALTER TABLE jobs ADD COLUMN owner_pid INTEGER')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS job_events (
+                job_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (job_id, seq)
+            )
+        ''')
+        self._fail_orphans(conn)
+        self._prune(conn)
+        conn.commit()
+        conn.close()
+
+    def _prune(self, conn):
+        """Delete jobs, with their results and events, that finished more than ttl seconds ago"""
+        expired = f'''
+            SELECT id FROM jobs WHERE status NOT IN {ACTIVE_STATUSES}
+            AND finished_at <= datetime('now', ?)
+        '''
+        cutoff = (f'-{self.ttl} seconds',)
+        conn.execute(f'DELETE FROM job_events WHERE job_id IN ({expired})', cutoff)
+        conn.execute(f'DELETE FROM jobs WHERE id IN ({expired})', cutoff)
+
+    def _fail_orphans(self, conn):
+        """Fail active jobs whose owning process on this host has exited.
+
+        Jobs owned by another host are left alone, since there is no way to
+        tell from here whether that process is still running them.
+        """
+        host = socket.gethostname()
+        rows = conn.execute(f'SELECT id, owner_host, owner_pid FROM jobs WHERE status IN {ACTIVE_STATUSES}')
+        orphans = [(job_id,) for job_id, owner_host, owner_pid in rows.fetchall()
+                   if owner_pid is None or (owner_host == host and not _process_alive(owner_pid))]
+        conn.executemany('''
+            UPDATE jobs SET status = 'failed', error = 'interrupted by restart', finished_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+        ''', orphans)
+
+    def submit(self, name, func, *args, **kwargs):
+        """Queue func(*args, progress=..., **kwargs) and return the job id.
+
+        `progress(done, total, event=None)` records how far the job has
+        got and, with `event`, publishes a partial result (see events()).
+        Events and the function's return value must be JSON-serializable.
+        """
+        with self._lock:
+            conn = sqlite3.connect(self.db_path)
+            # A recycled worker may have left an active job with this name behind
+            self._fail_orphans(conn)
+            row = conn.execute(f'''
+                SELECT id FROM jobs WHERE name = ? AND status IN {ACTIVE_STATUSES}
+                ORDER BY created_at DESC LIMIT 1
+            ''', (name,)).fetchone()
+            if row:
+                conn.close()
+                return row[0]
+
+            job_id = uuid.uuid4().hex
+            conn.execute("INSERT INTO jobs (id, name, status, owner_host, owner_pid) VALUES (?, ?, 'queued', ?, ?)",
+                         (job_id, name, socket.gethostname(), os.getpid()))
+            conn.commit()
+            conn.close()
+
+        self.executor.submit(self._run, job_id, func, args, kwargs)
+        return job_id
+
+    def get(self, job_id):
+        """Status dict for a job, or None if the id is unknown"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        conn.close()
+        return self._to_dict(row) if row else None
+
+    def events(self, job_id, after=0):
+        """(seq, data) pairs a job has published, numbered from 1, after seq `after`"""
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('SELECT seq, data FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq',
+                            (job_id, after)).fetchall()
+        conn.close()
+        return [(seq, json.loads(data)) for seq, data in rows]
+
+    def recent(self, limit=20):
+        """Most recently created jobs, newest first"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute('SELECT * FROM jobs ORDER BY created_at DESC, rowid DESC LIMIT ?',
+                            (limit,)).fetchall()
+        conn.close()
+        return [self._to_dict(row) for row in rows]
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs; with `wait`, block until running ones finish"""
+        self.executor.shutdown(wait=wait)
+
+    def _run(self, job_id, func, args, kwargs):
+        self._update(job_id, "status = 'running', started_at = CURRENT_TIMESTAMP")
+
+        published = [0]
+
+        def progress(done, total=None, event=None):
+            if event is None:
+                self._update(job_id, 'done = ?, total = ?', (done, total))
+                return
+            published[0] += 1
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('INSERT INTO job_events (job_id, seq, data) VALUES (?, ?, ?)',
+                         (job_id, published[0], json.dumps(event, default=str)))
+            conn.execute('UPDATE jobs SET done = ?, total = ? WHERE id = ?', (done, total, job_id))
+            conn.commit()
+            conn.close()
+
+        try:
+            result = func(*args, progress=progress, **kwargs)
+            self._update(job_id, "status = 'done', result = ?, finished_at = CURRENT_TIMESTAMP",
+                         (json.dumps(result, default=str),))
+        except Exception as e:
+            print(f"Job {job_id} failed: {e}")
+            traceback.print_exc()
+            self._update(job_id, "status = 'failed', error = ?, finished_at = CURRENT_TIMESTAMP", (str(e),))
+
+        conn = sqlite3.connect(self.db_path)
+        self._prune(conn)
+        conn.commit()
+        conn.close()
+
+    def _update(self, job_id, assignments, params=()):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(f'UPDATE jobs SET {assignments} WHERE id = ?', (*params, job_id))
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        del job['owner_host'], job['owner_pid']
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['progress'] = round(job['done'] / job['total'], 3) if job['total'] else None
+        return job
+
+
+def _process_alive(pid):
+    """Whether a process with this pid exists on this host"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # it exists but belongs to another user
+    return True
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Load test for the production server.
+
+    python load_test.py --url http://127.0.0.1:8000       # load a running server
+    python load_test.py --scale                            # start gunicorn with 1, 2, 4 ... workers
+
+Clients run in several processes, each with a few keep-alive threads, and
+cycle through a mix of read and plan-generation requests.  --scale prints
+requests/sec per worker count, so throughput can be compared with the
+number of cores.
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import subprocess
+import http.client
+from urllib.parse import urlsplit
+from multiprocessing import Pool
+
+# (method, path, JSON body) requests cycled through by every client thread
+REQUEST_MIX = [
+    ('GET', '/api/recipes', None),
+    ('GET', '/api/search?q=rice', None),
+    ('GET', '/api/categories', None),
+    ('POST', '/api/generate_diet', {'user_input': 'vegetarian weight loss 1500 calories', 'seed': None}),
+]
+
+
+def _client_thread(host, port, duration, seed, results):
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    ok = errors = 0
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        method, path, body = rng.choice(REQUEST_MIX)
+        if body is not None:
+            # A handful of seeds, so plans are a mix of generated and cached
+            body = json.dumps(dict(body, seed=rng.randint(1, 20)))
+        start = time.perf_counter()
+        try:
+            conn.request(method, path, body=body, headers={'Content-Type': 'application/json'})
+            response = conn.getresponse()
+            response.read()
+            if response.status < 400:
+                ok += 1
+            else:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            conn.close()
+            conn = http.client.HTTPConnection(host, port, timeout=30)
+        latencies.append(time.perf_counter() - start)
+    conn.close()
+    results.append((ok, errors, latencies))
+
+
+def _client_process(args):
+    host, port, duration, threads, seed = args
+    results = []
+    pool = [threading.Thread(target=_client_thread, args=(host, port, duration, seed * 1000 + i, results))
+            for i in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return results
+
+
+def run_load(url, concurrency=16, duration=10.0, processes=None):
+    """Drive the server at `url` with `concurrency` connections for `duration` seconds"""
+    parts = urlsplit(url)
+    processes = max(1, min(processes or os.cpu_count() or 1, concurrency))
+    per_process = [concurrency // processes + (1 if i < concurrency % processes else 0)
+                   for i in range(processes)]
+
+    start = time.perf_counter()
+    with Pool(processes) as pool:
+        batches = pool.map(_client_process, [(parts.hostname, parts.port or 80, duration, threads, i)
+                                             for i, threads in enumerate(per_process)])
+    elapsed = time.perf_counter() - start
+
+    ok = sum(r[0] for batch in batches for r in batch)
+    errors = sum(r[1] for batch in batches for r in batch)
+    latencies = sorted(l for batch in batches for r in batch for l in r[2])
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1) if latencies else 0.0
+
+    return {
+        'requests': ok,
+        'errors': errors,
+        'requests_per_sec': round(ok / elapsed, 1),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95)
+    }
+
+
+def wait_until_up(url, timeout=60):
+    parts = urlsplit(url)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=2)
+            conn.request('GET', '/api/categories')
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+
+def start_server(workers, threads, port):
+    """Start gunicorn with the production config and the given worker count"""
+    env = dict(os.environ, WEB_WORKERS=str(workers), WEB_THREADS=str(threads),
+               WEB_BIND=f'127.0.0.1:{port}', FLASK_DEBUG='false')
+    return subprocess.Popen(['gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application'],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def worker_counts(max_workers):
+    counts = []
+    count = 1
+    while count < max_workers:
+        counts.append(count)
+        count *= 2
+    return counts + [max_workers]
+
+
+def scale_test(max_workers, threads, concurrency, duration, port=8765):
+    """Requests/sec for 1, 2, 4 ... max_workers pre-forked workers"""
+    rows = []
+    for workers in worker_counts(max_workers):
+        server = start_server(workers, threads, port)
+        url = f'http://127.0.0.1:{port}'
+        try:
+            if not wait_until_up(url):
+                print(f"❌ Server with {workers} workers did not start (is gunicorn installed?)")
+                break
+            run_load(url, concurrency, 1.0)  # warm caches
+            stats = run_load(url, concurrency, duration)
+        finally:
+            server.terminate()
+            server.wait()
+        rows.append((workers, stats))
+        print(f"   {workers:>3} workers: {stats['requests_per_sec']:>8} req/s  "
+              f"p50 {stats['p50_ms']} ms  p95 {stats['p95_ms']} ms  errors {stats['errors']}")
+
+    if rows:
+        base = rows[0][1]['requests_per_sec'] or 1
+        print("\n📈 Speedup over one worker: " +
+              ', '.join(f"{w}w {s['requests_per_sec'] / base:.2f}x" for w, s in rows))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help='load an already running server')
+    parser.add_argument('--scale', action='store_true', help='start gunicorn at increasing worker counts')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threads', type=int, default=4, help='threads per gunicorn worker')
+    parser.add_argument('--concurrency', type=int, default=32, help='open client connections')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per measurement')
+    args = parser.parse_args()
+
+    print(f"🚦 Load test: {args.concurrency} connections, {args.duration:g}s per run, "
+          f"{os.cpu_count()} cores")
+    if args.scale:
+        scale_test(args.max_workers, args.threads, args.concurrency, args.duration)
+    elif args.url:
+        print(f"   {run_load(args.url, args.concurrency, args.duration)}")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
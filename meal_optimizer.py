@@ -0,0 +1,257 @@
+import numpy as np
+from config import MEAL_PLAN_WORK_BUDGET, SIMILARITY_PENALTY, SIMILARITY_WINDOW
+from recipe_table import RecipeTable
+
+MACRO_KEYS = ('protein', 'carbs', 'fat')
+
+# Share of daily calories expected from each macro, and energy per gram
+DEFAULT_MACRO_SPLIT = {'protein': 0.20, 'carbs': 0.50, 'fat': 0.30}
+KCAL_PER_GRAM = {'protein': 4, 'carbs': 4, 'fat': 9}
+
+
+class MealPlanOptimizer:
+    """Pick meals per day that minimize deviation from calorie and macro targets.
+
+    Each day is solved as a multiple-choice knapsack: a dynamic program over
+    the running calorie total (quantized to `calorie_step` kcal) chooses one
+    recipe per meal slot.  Slot costs combine macro deviation, how far the
+    recipe is from the slot's share of calories, and a penalty for recipes
+    already used earlier in the plan.  All costs are in kcal-equivalents.
+
+    With a `similarity` graph (see recipe_similarity) near-duplicates of
+    recipes served in the last `similarity_window` days are penalized in
+    proportion to their similarity, and they (and the rest of their
+    near-duplicate cluster) are kept off the same day.
+
+    `recipes` may be a list of recipe dicts or a RecipeTable; the returned
+    indices are rows of `self.table`.
+    """
+
+    def __init__(self, recipes, calorie_step=10, macro_weight=0.5, slot_weight=0.25,
+                 repeat_penalty=60, repeat_window=1, jitter=15, macro_split=None,
+                 work_budget=MEAL_PLAN_WORK_BUDGET, similarity=None,
+                 similarity_penalty=SIMILARITY_PENALTY, similarity_window=SIMILARITY_WINDOW):
+        self.table = recipes if isinstance(recipes, RecipeTable) else RecipeTable(recipes)
+        self.recipes = self.table.recipes
+        self.calories = self.table.column('calories')
+        self.macros = np.column_stack([self.table.column(key) for key in MACRO_KEYS])
+        self.calorie_step = calorie_step
+        self.calorie_bins = np.maximum(np.rint(self.calories / calorie_step), 0).astype(int)
+
+        self.macro_weight = macro_weight
+        self.slot_weight = slot_weight
+        self.repeat_penalty = repeat_penalty
+        self.repeat_window = repeat_window
+        self.jitter = jitter
+        self.macro_split = macro_split or DEFAULT_MACRO_SPLIT
+        self.work_budget = work_budget
+        self.similarity = similarity
+        self.similarity_penalty = similarity_penalty
+        self.similarity_window = similarity_window
+
+        # Cost of one gram of macro deviation, expressed in kcal
+        self.macro_kcal = np.array([KCAL_PER_GRAM[key] for key in MACRO_KEYS]) * macro_weight
+
+    def macro_targets(self, calories):
+        """Grams of protein, carbs and fat that make up `calories` under the macro split"""
+        return np.array([calories * self.macro_split[key] / KCAL_PER_GRAM[key] for key in MACRO_KEYS])
+
+    def plan(self, calorie_target, slot_shares, days, slot_candidates=None, rng=None, on_day=None):
+        """Return one list of recipe indices per day, one index per meal slot.
+
+        `slot_shares` gives each slot's fraction of `calorie_target`;
+        `slot_candidates` optionally restricts each slot to a list of recipe
+        indices.  Each dynamic program is charged its table size (candidates
+        times calorie bins); days after `work_budget` cells are spent fall
+        back to a greedy per-slot pick so that long plans always return
+        promptly.  The budget depends only on the inputs, so a seeded plan is
+        the same however loaded the host is.
+        `on_day(day, picks)` is called as soon as each day is solved.
+        """
+        plans = []
+        for day, picks in enumerate(self.iter_plan(calorie_target, slot_shares, days, slot_candidates, rng)):
+            plans.append(picks)
+            if on_day is not None:
+                on_day(day, picks)
+        return plans
+
+    def iter_plan(self, calorie_target, slot_shares, days, slot_candidates=None, rng=None):
+        """Yield each day's recipe indices as soon as it is solved (see plan()).
+
+        Usage and recency carry over between days, so variety and the work
+        budget match plan().
+        """
+        if not self.recipes:
+            return
+
+        if rng is None:
+            rng = np.random.default_rng()
+
+        work = 0
+        masks = self._candidate_masks(slot_shares, slot_candidates)
+        usage = np.zeros(len(self.recipes))
+        last_used = np.full(len(self.recipes), -np.inf)
+        # Strongest similarity to a recently served recipe, and when it was served
+        near_weight = np.zeros(len(self.recipes))
+        near_last_used = np.full(len(self.recipes), -np.inf)
+
+        for day in range(days):
+            near_cost = self._near_duplicate_costs(near_weight, near_last_used, day)
+            slot_costs = self._slot_costs(calorie_target, slot_shares, masks, usage,
+                                          last_used, day, rng, near_cost)
+            if work < self.work_budget:
+                work += self._dp_cells(slot_costs)
+                picks = self._solve_day(calorie_target, slot_costs)
+            else:
+                picks = self._greedy_day(calorie_target, slot_shares, slot_costs)
+
+            for index in picks:
+                usage[index] += 1
+                last_used[index] = day
+            self._mark_neighbours(picks, near_weight, near_last_used, day)
+            yield picks
+
+    def _candidate_masks(self, slot_shares, slot_candidates):
+        """Boolean mask of allowed recipes for each slot"""
+        masks = []
+        for slot in range(len(slot_shares)):
+            mask = np.ones(len(self.recipes), dtype=bool)
+            if slot_candidates is not None and len(slot_candidates[slot]) > 0:
+                mask[:] = False
+                mask[np.asarray(slot_candidates[slot], dtype=int)] = True
+            masks.append(mask)
+        return masks
+
+    def _mark_neighbours(self, picks, near_weight, near_last_used, day):
+        """Record that the near-duplicates of today's picks were just served"""
+        if self.similarity is None:
+            return
+        for index in picks:
+            neighbours, similarities = self.similarity.neighbours_of(index)
+            # Keep the stronger weight while an earlier one is still in the window
+            active = (day - near_last_used[neighbours]) <= self.similarity_window
+            near_weight[neighbours] = np.where(active, np.maximum(near_weight[neighbours], similarities),
+                                               similarities)
+            near_last_used[neighbours] = day
+
+    def _near_duplicate_costs(self, near_weight, near_last_used, day):
+        """Penalty for recipes similar to ones served within the similarity window"""
+        if self.similarity is None:
+            return 0
+        recent = (day - near_last_used) <= self.similarity_window
+        return self.similarity_penalty * near_weight * recent
+
+    def _slot_costs(self, calorie_target, slot_shares, masks, usage, last_used, day, rng, near_cost=0):
+        """Per-slot cost vectors over all recipes (inf where not allowed)"""
+        daily_macros = self.macro_targets(calorie_target)
+        recent = (day - last_used) <= self.repeat_window
+        noise = rng.uniform(0, self.jitter, len(self.recipes)) if self.jitter else 0
+
+        slot_costs = []
+        for share, mask in zip(slot_shares, masks):
+            macro_gap = np.abs(self.macros - daily_macros * share) @ self.macro_kcal
+            calorie_gap = np.abs(self.calories - calorie_target * share) * self.slot_weight
+            cost = macro_gap + calorie_gap + usage * self.repeat_penalty + near_cost + noise
+
+            # Skip recipes served in the last few days unless that empties the slot
+            allowed = mask & ~recent
+            if np.count_nonzero(allowed) < len(slot_shares):
+                allowed = mask
+            slot_costs.append(np.where(allowed, cost, np.inf))
+
+        return slot_costs
+
+    def _solve_day(self, calorie_target, slot_costs):
+        """Pick one distinct recipe per slot by dynamic programming over calorie totals"""
+        slot_costs = list(slot_costs)
+        picks = self._dp_pick(calorie_target, slot_costs)
+
+        # Ban repeats (and near-duplicates) within the day and re-solve; at most one pass per slot
+        for _ in range(len(slot_costs)):
+            seen = set()
+            repeated = False
+            for slot, index in enumerate(picks):
+                duplicates = self._day_duplicates(seen)
+                if duplicates[index]:
+                    banned = self._ban(slot_costs[slot], duplicates)
+                    if banned is None:
+                        banned = self._ban(slot_costs[slot], [index])
+                    if banned is not None:
+                        slot_costs[slot] = banned
+                        repeated = True
+                seen.add(index)
+            if not repeated:
+                break
+            picks = self._dp_pick(calorie_target, slot_costs)
+
+        return picks
+
+    def _day_duplicates(self, picks):
+        """Mask of the picks plus their near-duplicate clusters and neighbours"""
+        mask = np.zeros(len(self.recipes), dtype=bool)
+        if picks:
+            mask[list(picks)] = True
+            if self.similarity is not None:
+                mask |= self.similarity.near_duplicate_mask(picks)
+        return mask
+
+    @staticmethod
+    def _ban(cost, indices):
+        """Copy of `cost` with `indices` (a list or mask) disallowed, or None if that leaves nothing to pick"""
+        banned = cost.copy()
+        banned[indices] = np.inf
+        if not np.isfinite(banned).any():
+            return None
+        return banned
+
+    def _dp_size(self, slot_costs):
+        """Calorie bins needed to hold any combination of one allowed recipe per slot"""
+        return 1 + sum(int(self.calorie_bins[np.isfinite(cost)].max(initial=0)) for cost in slot_costs)
+
+    def _dp_cells(self, slot_costs):
+        """Table cells one dynamic program over these slot costs updates"""
+        return self._dp_size(slot_costs) * sum(np.count_nonzero(np.isfinite(cost)) for cost in slot_costs)
+
+    def _dp_pick(self, calorie_target, slot_costs):
+        """Minimize slot costs plus |daily calories - target| over one recipe per slot"""
+        size = self._dp_size(slot_costs)
+        best = np.full(size, np.inf)
+        best[0] = 0.0
+
+        choices = []
+        for cost in slot_costs:
+            next_best = np.full(size, np.inf)
+            choice = np.full(size, -1)
+            for index in np.flatnonzero(np.isfinite(cost)):
+                shift = self.calorie_bins[index]
+                candidate = best[:size - shift] + cost[index]
+                better = candidate < next_best[shift:]
+                next_best[shift:][better] = candidate[better]
+                choice[shift:][better] = index
+            best = next_best
+            choices.append(choice)
+
+        totals = np.arange(size) * self.calorie_step
+        total_bin = int(np.argmin(best + np.abs(totals - calorie_target)))
+
+        picks = []
+        for choice in reversed(choices):
+            index = int(choice[total_bin])
+            picks.append(index)
+            total_bin -= self.calorie_bins[index]
+        picks.reverse()
+        return picks
+
+    def _greedy_day(self, calorie_target, slot_shares, slot_costs):
+        """Cheap fallback: best recipe per slot against the slot's calorie share"""
+        picks = []
+        for share, cost in zip(slot_shares, slot_costs):
+            total = cost + np.abs(self.calories - calorie_target * share)
+            if picks:
+                banned = self._ban(total, self._day_duplicates(picks))
+                if banned is None and np.count_nonzero(np.isfinite(total)) > len(picks):
+                    banned = self._ban(total, picks)
+                if banned is not None:
+                    total = banned
+            picks.append(int(np.argmin(total)))
+        return picks
@@ -0,0 +1,141 @@
+import os
+import re
+import csv
+import numpy as np
+from ingredient_parser import parse_ingredient_line
+from recipe_table import NUTRIENT_KEYS
+
+FOOD_TABLE_PATH = os.path.join(os.path.dirname(__file__), 'food_table.csv')
+
+# Mass units convert directly; volume units go through the food's grams per cup
+GRAMS_PER_UNIT = {'g': 1, 'kg': 1000, 'oz': 28.35, 'lb': 453.6}
+CUPS_PER_UNIT = {'cup': 1, 'tbsp': 1 / 16, 'tsp': 1 / 48, 'ml': 1 / 240, 'l': 1000 / 240}
+FIXED_GRAMS = {'pinch': 0.3, 'clove': 5, 'inch': 8, 'sprig': 1, 'slice': 30, 'can': 140}
+
+DEFAULT_GRAMS_PER_CUP = 240  # water-like density when the table has none
+DEFAULT_GRAMS_PER_PIECE = 1  # bare counts of foods with no piece weight are leaves, seeds and the like
+UNQUANTIFIED_GRAMS = 5  # 'salt to taste', 'curry leaves', 'oil for cooking'
+
+_TOKEN = re.compile(r'[a-z]+')
+
+
+def _stem(token):
+    """Crude plural folding so 'tomatoes'/'tomato' and 'chilies'/'chili' match"""
+    if len(token) <= 3:
+        return token
+    if token.endswith('ies'):
+        return token[:-3] + 'i'
+    if token.endswith('y'):
+        return token[:-1] + 'i'
+    if token.endswith('oes') or token.endswith(('ches', 'shes', 'xes')):
+        return token[:-2]
+    if token.endswith('s') and not token.endswith('ss'):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    return [_stem(token) for token in _TOKEN.findall(text.lower())]
+
+
+class FoodTable:
+    """Per-100 g nutrient table with a token trie over food names and aliases"""
+
+    def __init__(self, path=FOOD_TABLE_PATH):
+        self.names = []
+        rows = []
+        self.grams_per_cup = []
+        self.grams_per_piece = []
+        self._trie = {}
+
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                index = len(self.names)
+                self.names.append(row['food'])
+                rows.append([float(row[key] or 0) for key in NUTRIENT_KEYS])
+                self.grams_per_cup.append(float(row['grams_per_cup'] or DEFAULT_GRAMS_PER_CUP))
+                self.grams_per_piece.append(float(row['grams_per_piece'] or DEFAULT_GRAMS_PER_PIECE))
+
+                aliases = [row['food']] + [a for a in (row['aliases'] or '').split('|') if a]
+                for alias in aliases:
+                    self._insert(tokenize(alias), index)
+
+        self.per_100g = np.array(rows)
+
+    def __len__(self):
+        return len(self.names)
+
+    def _insert(self, tokens, index):
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        # First definition wins so a food's own name beats a later alias
+        node.setdefault(None, index)
+
+    def match(self, text):
+        """Index of the food named by the longest phrase in `text`, or None.
+
+        Every start position walks the trie; the longest phrase wins and
+        ties go to the earliest one ('salt and pepper' -> salt).
+        """
+        tokens = tokenize(text)
+        best, best_length = None, 0
+        for start in range(len(tokens)):
+            node = self._trie
+            for end in range(start, len(tokens)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                length = end - start + 1
+                if None in node and length > best_length:
+                    best, best_length = node[None], length
+        return best
+
+    def grams(self, index, quantity, unit):
+        """Weight in grams of `quantity` `unit` of food `index`"""
+        if quantity is None:
+            return UNQUANTIFIED_GRAMS
+        if unit in GRAMS_PER_UNIT:
+            return quantity * GRAMS_PER_UNIT[unit]
+        if unit in CUPS_PER_UNIT:
+            return quantity * CUPS_PER_UNIT[unit] * self.grams_per_cup[index]
+        if unit in FIXED_GRAMS:
+            return quantity * FIXED_GRAMS[unit]
+        # Bare counts and 'piece': '2 eggs', '1 onion'
+        return quantity * self.grams_per_piece[index]
+
+
+class NutrientEngine:
+    """Offline nutrition from ingredient lines: parse, match, convert to grams, scale"""
+
+    def __init__(self, food_table=None):
+        self.foods = food_table or FoodTable()
+
+    def line_nutrition(self, line, parsed=None):
+        """Nutrition dict for one ingredient line (zeros if the food is unknown)"""
+        parsed = parsed or parse_ingredient_line(line)
+        index = self.foods.match(parsed.food)
+        if index is None:
+            return {key: 0.0 for key in NUTRIENT_KEYS}
+        grams = self.foods.grams(index, parsed.quantity, parsed.unit)
+        values = self.foods.per_100g[index] * grams / 100
+        return dict(zip(NUTRIENT_KEYS, values.tolist()))
+
+    def recipe_nutrition(self, ingredients):
+        """Summed nutrition dict for a list of ingredient lines"""
+        totals = {key: 0.0 for key in NUTRIENT_KEYS}
+        for line in ingredients:
+            for key, value in self.line_nutrition(line).items():
+                totals[key] += value
+        return {key: round(value, 1) for key, value in totals.items()}
+
+
+_engine = None
+
+
+def get_nutrient_engine():
+    """Shared engine so the food table is loaded once per process"""
+    global _engine
+    if _engine is None:
+        _engine = NutrientEngine()
+    return _engine
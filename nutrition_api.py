@@ -1,40 +1,106 @@
 import requests
 import json
-from config import NUTRITION_API_KEY, NUTRITION_API_URL
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from nutrition_cache import NutritionCache
+from ingredient_nutrition import IngredientNutrition
+from nutrient_engine import get_nutrient_engine
+from rate_limiter import TokenBucket
+from recipe_table import NUTRIENT_KEYS
+from config import (NUTRITION_API_KEY, NUTRITION_API_URL, NUTRITION_API_TIMEOUT,
+                    NUTRITION_API_RETRIES, NUTRITION_CACHE_PATH,
+                    NUTRITION_API_REQUESTS_PER_MINUTE, NUTRITION_API_BURST)
+
+def create_session(retries=NUTRITION_API_RETRIES):
+    """Pooled keep-alive session that retries transient failures with backoff"""
+    retry = Retry(total=retries, backoff_factor=0.5,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET']))
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=4, pool_maxsize=16)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
 
 class NutritionAPI:
-    def __init__(self):
-        self.api_key = NUTRITION_API_KEY
-        self.api_url = NUTRITION_API_URL
+    """Nutrition lookups through the Edamam API, falling back to the local food table.
+
+    Background jobs wait for the rate limiter; request handlers pass
+    `blocking=False` so that, once the quota is used up, a line gets the
+    local estimate at once and is retried later.  `processes` is the number
+    of processes (e.g. gunicorn workers) sharing the provider quota.
+    """
+
+    def __init__(self, api_key=None, api_url=None, cache=None, session=None, rate_limiter=None,
+                 blocking=True, processes=1):
+        self.api_key = NUTRITION_API_KEY if api_key is None else api_key
+        self.api_url = api_url or NUTRITION_API_URL
+        self.timeout = NUTRITION_API_TIMEOUT
+        self.session = session or create_session()
+        # Shared by every thread that uses this client so the provider quota holds;
+        # each process gets its share
+        processes = max(1, processes)
+        self.rate_limiter = rate_limiter or TokenBucket(NUTRITION_API_REQUESTS_PER_MINUTE / 60 / processes,
+                                                        max(1, NUTRITION_API_BURST // processes))
+        self.blocking = blocking
+        self.engine = get_nutrient_engine()
+        # Local data is cheap to recompute, so only persist real API results
+        self.cache = cache or NutritionCache(db_path=NUTRITION_CACHE_PATH if self.api_key else '')
+        self.ingredients = IngredientNutrition(self._fetch_line, cache=self.cache,
+                                               fallback=self._get_local_line_nutrition)
+        self.api_calls = 0
     
     def get_nutrition_data(self, ingredients):
         """
         Get nutrition data for a list of ingredients
-        Uses Edamam Nutrition API
+        Each ingredient line is resolved once (Edamam Nutrition API, or the
+        local food table without an API key) and the lines are summed per recipe
         """
+        return self.get_bulk_nutrition_data([ingredients])[0]
+    
+    def get_bulk_nutrition_data(self, ingredient_lists):
+        """Nutrition dicts for many recipes, computed in one vectorized pass"""
+        totals = self.ingredients.bulk_nutrition(ingredient_lists)
+        results = []
+        for row in totals.tolist():
+            nutrition = {key: round(value, 1) for key, value in zip(NUTRIENT_KEYS, row)}
+            if not self.api_key and nutrition['calories'] == 0:
+                nutrition['calories'] = 250  # Default calories for a typical dish
+            results.append(nutrition)
+        return results
+    
+    def _fetch_line(self, parsed, line):
+        """Nutrition for one ingredient line; None if the API lookup failed"""
         if not self.api_key:
-            # Return mock data if no API key is provided
-            return self._get_mock_nutrition_data(ingredients)
+            return self._get_local_line_nutrition(parsed, line)
         
         try:
-            # Prepare ingredients for API call
-            ingredient_text = " & ".join(ingredients)
-            
             params = {
                 'app_id': 'your-app-id',  # You'll need to register at Edamam
                 'app_key': self.api_key,
-                'ingr': ingredient_text
+                'ingr': line
             }
             
-            response = requests.get(self.api_url, params=params)
+            if self.blocking:
+                self.rate_limiter.acquire()
+            elif not self.rate_limiter.try_acquire():
+                return None  # out of quota: use the local estimate for now
+            self.api_calls += 1
+            response = self.session.get(self.api_url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
-            data = response.json()
-            return self._parse_nutrition_response(data)
+            return self._parse_nutrition_response(response.json())
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             print(f"Error fetching nutrition data: {e}")
-            return self._get_mock_nutrition_data(ingredients)
+            return None
+    
+    def cache_stats(self):
+        """Cache hit rate plus the number of network calls made"""
+        stats = self.cache.stats()
+        stats['api_calls'] = self.api_calls
+        stats['ingredient_lines'] = len(self.ingredients)
+        return stats
     
     def _parse_nutrition_response(self, data):
         """Parse nutrition API response"""
@@ -52,57 +118,18 @@ class NutritionAPI:
             return nutrition
         except Exception as e:
             print(f"Error parsing nutrition data: {e}")
-            return self._get_mock_nutrition_data([])
+            return None
     
-    def _get_mock_nutrition_data(self, ingredients):
-        """Generate mock nutrition data for testing"""
-        # Calculate approximate nutrition based on common ingredients
-        total_calories = 0
-        total_protein = 0
-        total_carbs = 0
-        total_fat = 0
-        total_fiber = 0
-        total_sugar = 0
-        total_sodium = 0
-        
-        # Common Telugu ingredients and their approximate nutrition per 100g
-        ingredient_nutrition = {
-            'rice': {'calories': 130, 'protein': 2.7, 'carbs': 28, 'fat': 0.3, 'fiber': 0.4, 'sugar': 0.1, 'sodium': 1},
-            'tamarind': {'calories': 239, 'protein': 2.8, 'carbs': 62.5, 'fat': 0.6, 'fiber': 5.1, 'sugar': 57.4, 'sodium': 28},
-            'turmeric': {'calories': 354, 'protein': 8, 'carbs': 65, 'fat': 10, 'fiber': 21, 'sugar': 3.2, 'sodium': 38},
-            'chili': {'calories': 40, 'protein': 1.9, 'carbs': 8.8, 'fat': 0.4, 'fiber': 1.5, 'sugar': 5.3, 'sodium': 7},
-            'onion': {'calories': 40, 'protein': 1.1, 'carbs': 9.3, 'fat': 0.1, 'fiber': 1.7, 'sugar': 4.7, 'sodium': 4},
-            'oil': {'calories': 884, 'protein': 0, 'carbs': 0, 'fat': 100, 'fiber': 0, 'sugar': 0, 'sodium': 0},
-            'salt': {'calories': 0, 'protein': 0, 'carbs': 0, 'fat': 0, 'fiber': 0, 'sugar': 0, 'sodium': 38758},
-            'mustard': {'calories': 508, 'protein': 26, 'carbs': 28, 'fat': 36, 'fiber': 12, 'sugar': 6.8, 'sodium': 5},
-            'curry': {'calories': 325, 'protein': 14, 'carbs': 58, 'fat': 14, 'fiber': 33, 'sugar': 2.8, 'sodium': 52},
-            'coriander': {'calories': 23, 'protein': 2.1, 'carbs': 3.7, 'fat': 0.5, 'fiber': 2.8, 'sugar': 0.9, 'sodium': 46}
-        }
-        
-        for ingredient in ingredients:
-            ingredient_lower = ingredient.lower()
-            for key, nutrition in ingredient_nutrition.items():
-                if key in ingredient_lower:
-                    # Assume 50g per ingredient for calculation
-                    total_calories += nutrition['calories'] * 0.5
-                    total_protein += nutrition['protein'] * 0.5
-                    total_carbs += nutrition['carbs'] * 0.5
-                    total_fat += nutrition['fat'] * 0.5
-                    total_fiber += nutrition['fiber'] * 0.5
-                    total_sugar += nutrition['sugar'] * 0.5
-                    total_sodium += nutrition['sodium'] * 0.5
-                    break
+    def _get_local_nutrition_data(self, ingredients):
+        """Offline nutrition from the bundled food table"""
+        nutrition = self.engine.recipe_nutrition(ingredients)
         
         # Ensure minimum values
-        if total_calories == 0:
-            total_calories = 250  # Default calories for a typical dish
+        if nutrition['calories'] == 0:
+            nutrition['calories'] = 250  # Default calories for a typical dish
         
-        return {
-            'calories': round(total_calories, 1),
-            'protein': round(total_protein, 1),
-            'carbs': round(total_carbs, 1),
-            'fat': round(total_fat, 1),
-            'fiber': round(total_fiber, 1),
-            'sugar': round(total_sugar, 1),
-            'sodium': round(total_sodium, 1)
-        } 
\ No newline at end of file
+        return nutrition
+    
+    def _get_local_line_nutrition(self, parsed, line):
+        """Offline nutrition for a single ingredient line"""
+        return self.engine.line_nutrition(line, parsed)
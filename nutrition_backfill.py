@@ -0,0 +1,136 @@
+import json
+import time
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from database import RecipeDatabase
+from nutrition_api import NutritionAPI
+from config import NUTRITION_BACKFILL_WORKERS, NUTRITION_BACKFILL_BATCH
+
+
+class NutritionBackfill:
+    """Compute nutrition for many recipes with a bounded pool of worker threads.
+
+    Lookups go through the NutritionAPI's shared token bucket, so the
+    provider quota holds however many workers run.  Each batch is written
+    with one bulk insert and then checkpointed, and an interrupted run
+    resumes after the last checkpointed recipe id.
+    """
+
+    def __init__(self, db=None, nutrition_api=None, workers=NUTRITION_BACKFILL_WORKERS,
+                 batch_size=NUTRITION_BACKFILL_BATCH, job_name='nutrition'):
+        self.db = db or RecipeDatabase()
+        self.nutrition_api = nutrition_api or NutritionAPI()
+        self.workers = workers
+        self.batch_size = batch_size
+        self.job_name = job_name
+        self.init_checkpoints()
+
+    def init_checkpoints(self):
+        """Create the checkpoint table"""
+        conn = sqlite3.connect(self.db.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+                job_name TEXT PRIMARY KEY,
+                last_recipe_id INTEGER NOT NULL,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def checkpoint(self):
+        """Last recipe id whose nutrition has been written, or 0"""
+        conn = sqlite3.connect(self.db.db_path)
+        row = conn.execute('SELECT last_recipe_id FROM backfill_checkpoints WHERE job_name = ?',
+                           (self.job_name,)).fetchone()
+        conn.close()
+        return row[0] if row else 0
+
+    def _save_checkpoint(self, recipe_id):
+        conn = sqlite3.connect(self.db.db_path)
+        conn.execute('''
+            INSERT OR REPLACE INTO backfill_checkpoints (job_name, last_recipe_id, updated_at)
+            VALUES (?, ?, CURRENT_TIMESTAMP)
+        ''', (self.job_name, recipe_id))
+        conn.commit()
+        conn.close()
+
+    def reset(self):
+        """Forget the checkpoint so the next run starts from the first recipe"""
+        conn = sqlite3.connect(self.db.db_path)
+        conn.execute('DELETE FROM backfill_checkpoints WHERE job_name = ?', (self.job_name,))
+        conn.commit()
+        conn.close()
+
+    def pending_recipes(self, recompute=False, recipe_ids=None):
+        """(id, ingredients) pairs after the checkpoint, in id order"""
+        query = 'SELECT r.id, r.ingredients FROM recipes r WHERE r.id > ?'
+        params = [self.checkpoint()]
+        if not recompute:
+            query += ' AND NOT EXISTS (SELECT 1 FROM nutrition n WHERE n.recipe_id = r.id)'
+        if recipe_ids is not None:
+            recipe_ids = list(recipe_ids)
+            if not recipe_ids:
+                return []
+            query += f" AND r.id IN ({','.join('?' * len(recipe_ids))})"
+            params.extend(recipe_ids)
+        query += ' ORDER BY r.id'
+
+        conn = sqlite3.connect(self.db.db_path)
+        rows = conn.execute(query, params).fetchall()
+        conn.close()
+        return [(recipe_id, json.loads(ingredients)) for recipe_id, ingredients in rows]
+
+    def run(self, recompute=False, recipe_ids=None, limit=None, progress=None):
+        """Backfill pending recipes and return throughput statistics.
+
+        `recompute` also refreshes recipes that already have nutrition;
+        `recipe_ids` restricts the run; `limit` stops after that many
+        recipes (leaving the checkpoint in place); `progress` is called
+        with (done, total) after every batch.
+        """
+        pending = self.pending_recipes(recompute, recipe_ids)
+        if limit is not None:
+            pending = pending[:limit]
+
+        start = time.perf_counter()
+        done = 0
+        failed = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            for offset in range(0, len(pending), self.batch_size):
+                batch = pending[offset:offset + self.batch_size]
+                results = list(executor.map(self._lookup, batch))
+                rows = [(recipe_id, nutrition) for (recipe_id, _), nutrition in zip(batch, results)
+                        if nutrition is not None]
+                failed += len(batch) - len(rows)
+
+                self.db.add_nutrition_bulk(rows, replace=True)
+                self._save_checkpoint(batch[-1][0])
+                done += len(batch)
+                if progress:
+                    progress(done, len(pending))
+
+        # A run that reached the end starts over next time
+        if limit is None:
+            self.reset()
+
+        seconds = time.perf_counter() - start
+        return {
+            'processed': done - failed,
+            'failed': failed,
+            'seconds': round(seconds, 3),
+            'recipes_per_sec': round(done / seconds, 1) if seconds > 0 else 0.0
+        }
+
+    def _lookup(self, item):
+        recipe_id, ingredients = item
+        try:
+            return self.nutrition_api.get_nutrition_data(ingredients)
+        except Exception as e:
+            print(f"Error computing nutrition for recipe {recipe_id}: {e}")
+            return None
+
+
+if __name__ == "__main__":
+    stats = NutritionBackfill().run(progress=lambda done, total: print(f"   {done}/{total} recipes"))
+    print(f"✅ Backfill finished: {stats}")
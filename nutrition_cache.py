@@ -0,0 +1,145 @@
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from config import NUTRITION_CACHE_PATH, NUTRITION_CACHE_TTL
+
+# Entries kept in memory in front of the SQLite table
+MEMORY_ENTRIES = 1024
+
+
+def normalize_ingredients(ingredients):
+    """Canonical text for an ingredient list: lowercased, whitespace-collapsed, sorted"""
+    if isinstance(ingredients, str):
+        ingredients = [ingredients]
+    lines = (' '.join(str(line).lower().split()) for line in ingredients)
+    return '\n'.join(sorted(line for line in lines if line))
+
+
+class NutritionCache:
+    """Nutrition lookups keyed on normalized ingredient text, with a TTL.
+
+    A small in-memory LRU sits in front of an SQLite table so repeated
+    ingests (and other processes) reuse earlier API results.
+    """
+
+    def __init__(self, db_path=NUTRITION_CACHE_PATH, ttl=NUTRITION_CACHE_TTL,
+                 max_entries=MEMORY_ENTRIES):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            self.init_database()
+
+    def init_database(self):
+        """Create the persistent cache table"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS nutrition_cache (
+                cache_key TEXT PRIMARY KEY,
+                ingredients TEXT NOT NULL,
+                nutrition TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(ingredients):
+        """Digest of the normalized ingredient text"""
+        return hashlib.sha1(normalize_ingredients(ingredients).encode('utf-8')).hexdigest()
+
+    def get(self, ingredients):
+        """Return cached nutrition for an ingredient list, or None if missing or expired"""
+        key = self.make_key(ingredients)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not self._expired(entry[0], now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+
+        entry = self._load(key) if self.db_path else None
+
+        with self._lock:
+            if entry is None or self._expired(entry[0], now):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, entry)
+        return entry[1]
+
+    def put(self, ingredients, nutrition):
+        """Store nutrition for an ingredient list"""
+        key = self.make_key(ingredients)
+        entry = (time.time(), nutrition)
+        with self._lock:
+            self._remember(key, entry)
+        if self.db_path:
+            self._store(key, normalize_ingredients(ingredients), entry)
+
+    def purge_expired(self):
+        """Delete expired rows from the persistent table"""
+        with self._lock:
+            self._entries.clear()
+        if not self.db_path:
+            return 0
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.execute('DELETE FROM nutrition_cache WHERE fetched_at < ?',
+                              (time.time() - self.ttl,))
+        conn.commit()
+        conn.close()
+        return cursor.rowcount
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _expired(self, fetched_at, now):
+        return self.ttl > 0 and now - fetched_at > self.ttl
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            row = conn.execute('SELECT fetched_at, nutrition FROM nutrition_cache WHERE cache_key = ?',
+                               (key,)).fetchone()
+            conn.close()
+            return (row[0], json.loads(row[1])) if row else None
+        except sqlite3.Error as e:
+            print(f"Error reading nutrition cache: {e}")
+            return None
+
+    def _store(self, key, ingredient_text, entry):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('''
+                INSERT OR REPLACE INTO nutrition_cache (cache_key, ingredients, nutrition, fetched_at)
+                VALUES (?, ?, ?, ?)
+            ''', (key, ingredient_text, json.dumps(entry[1]), entry[0]))
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error writing nutrition cache: {e}")
@@ -0,0 +1,135 @@
+import json
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from config import PLAN_CACHE_SIZE, PLAN_CACHE_PATH
+
+
+def normalize_preferences(preferences):
+    """Turn a preferences dict into a stable, hashable tuple"""
+    items = []
+    for key, value in sorted(preferences.items()):
+        if isinstance(value, (list, tuple, set)):
+            value = tuple(sorted(str(v).strip().lower() for v in value))
+        items.append((key, value))
+    return tuple(items)
+
+
+class PlanCache:
+    """LRU cache of generated diet plans, optionally persisted to SQLite.
+
+    Keys combine the normalized preferences, the seed, the start date and the
+    catalogue version, so a plan is only reused when it would be regenerated
+    identically.  Plans are held as JSON text and every get() decodes a
+    fresh copy, so callers may modify what they get without touching the
+    cached plan.
+    """
+
+    def __init__(self, max_entries=PLAN_CACHE_SIZE, db_path=PLAN_CACHE_PATH):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if self.db_path:
+            self.init_database()
+
+    def init_database(self):
+        """Create the persistent cache table"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS plan_cache (
+                cache_key TEXT PRIMARY KEY,
+                plan TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(preferences, seed, start_date, catalogue_version):
+        """Digest of everything that determines a generated plan"""
+        parts = (normalize_preferences(preferences), seed, str(start_date), str(catalogue_version))
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """Return a cached plan or None"""
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(text)
+
+        text = self._load(key) if self.db_path else None
+
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, text)
+        return json.loads(text)
+
+    def put(self, key, plan):
+        """Store a copy of a plan in memory and, if configured, on disk"""
+        text = json.dumps(plan, ensure_ascii=False)
+        with self._lock:
+            self._remember(key, text)
+        if self.db_path:
+            self._store(key, text)
+
+    def clear(self):
+        """Drop every cached plan"""
+        with self._lock:
+            self._entries.clear()
+        if self.db_path:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('DELETE FROM plan_cache')
+            conn.commit()
+            conn.close()
+
+    def stats(self):
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+        }
+
+    def _remember(self, key, text):
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            row = conn.execute('SELECT plan FROM plan_cache WHERE cache_key = ?', (key,)).fetchone()
+            conn.close()
+            return row[0] if row else None
+        except sqlite3.Error as e:
+            print(f"Error reading plan cache: {e}")
+            return None
+
+    def _store(self, key, text):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute('INSERT OR REPLACE INTO plan_cache (cache_key, plan) VALUES (?, ?)', (key, text))
+            # Keep the persisted cache bounded, dropping the oldest plans first
+            conn.execute('''
+                DELETE FROM plan_cache WHERE cache_key NOT IN (
+                    SELECT cache_key FROM plan_cache ORDER BY created_at DESC, rowid DESC LIMIT ?
+                )
+            ''', (self.max_entries * 10,))
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error writing plan cache: {e}")
@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional
 from database import RecipeDatabase
+from recipe_table import MealPlanArray
 
 # For vector embeddings
 try:
@@ -37,7 +38,7 @@ except ImportError:
 class TeluguDietRAG:
     def __init__(self, model_name: str = "all-MiniLM-L6-v2", openai_api_key: Optional[str] = None):
         self.db = RecipeDatabase()
-        self.recipes = self.db.get_all_recipes()
+        self.recipes = self.db.get_all_recipes(with_text=False)
         
         # Initialize embedding model if available
         self.embedding_model = None
@@ -327,33 +328,8 @@ class TeluguDietRAG:
             return None
     
     def _calculate_nutrition_summary(self, meal_plan: Dict[str, Any]) -> Dict[str, float]:
-        """Calculate total nutrition for the meal plan"""
-        total_nutrition = {
-            'calories': 0,
-            'protein': 0,
-            'carbs': 0,
-            'fat': 0,
-            'fiber': 0,
-            'sugar': 0,
-            'sodium': 0
-        }
-        
-        meal_count = 0
-        
-        for day_data in meal_plan.values():
-            for meal in day_data['meals'].values():
-                if meal and meal.get('nutrition'):
-                    for key in total_nutrition:
-                        if key in meal['nutrition'] and meal['nutrition'][key] is not None:
-                            total_nutrition[key] += meal['nutrition'][key]
-                    meal_count += 1
-        
-        # Calculate averages
-        if meal_count > 0:
-            for key in total_nutrition:
-                total_nutrition[key] = round(total_nutrition[key] / meal_count, 1)
-        
-        return total_nutrition
+        """Calculate average nutrition per meal for the meal plan"""
+        return MealPlanArray.from_meal_plan(meal_plan).per_meal_averages()
     
     def _generate_llm_recommendations(self, preferences: Dict[str, Any], lang: str = 'telugu') -> List[str]:
         """Generate recommendations using LLM"""
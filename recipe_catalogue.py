@@ -0,0 +1,489 @@
+import os
+import re
+import sys
+import json
+import math
+import sqlite3
+import threading
+from functools import partial
+from types import MappingProxyType
+from collections.abc import Mapping
+from config import DATABASE_PATH
+from database import RecipeDatabase
+from recipe_text import CsvTextColumn
+from recipe_similarity import get_similarity_graph
+
+# Recipe catalogues bundled with the app
+NON_VEG_CSV_PATH = os.path.join(os.path.dirname(__file__), 'non_veg_diet_recipes.csv')
+VEG_CSV_PATH = os.path.join(os.path.dirname(__file__), 'veg_diet_recipes.csv')
+
+DEFAULT_INSTRUCTIONS = "Cook as directed"
+
+# Tag tuples shared by every recipe carrying the same tags
+_tag_sets = {}
+
+
+def intern_tags(tags):
+    """One shared tuple of interned strings per distinct tag list"""
+    tags = tuple(sys.intern(str(tag)) for tag in tags or ())
+    return _tag_sets.setdefault(tags, tags)
+
+
+class Recipe(Mapping):
+    """Compact, read-only recipe record.
+
+    Fields live in slots instead of a per-recipe dict, tags and category
+    are interned, and 'preparation' is an alias of 'instructions' rather
+    than a second copy.  Instructions may be given as a zero-argument
+    callable, which is called whenever they are read (loaders keep their
+    own small cache), so the text is never pinned to the record.  The
+    record still reads like the recipe dicts it replaces (recipe['name'],
+    recipe.get('tags')); to_dict() gives a plain, JSON-ready dict.
+    """
+
+    __slots__ = ('id', 'name', 'ingredients', 'nutrition', 'category', 'tags', 'cooking_time',
+                 'source', '_instructions')
+
+    KEYS = ('id', 'name', 'ingredients', 'instructions', 'preparation', 'nutrition',
+            'category', 'tags', 'cooking_time')
+
+    def __init__(self, id, name, ingredients, instructions, nutrition, category,
+                 tags=(), cooking_time=None, source=None):
+        set_field = object.__setattr__
+        set_field(self, 'id', id)
+        set_field(self, 'name', name)
+        set_field(self, 'ingredients', tuple(ingredients))
+        set_field(self, 'nutrition', MappingProxyType(dict(nutrition or {})))
+        set_field(self, 'category', sys.intern(category) if category else category)
+        set_field(self, 'tags', intern_tags(tags))
+        set_field(self, 'cooking_time', cooking_time)
+        set_field(self, 'source', source)
+        set_field(self, '_instructions', instructions)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Recipe is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Recipe is immutable")
+
+    @property
+    def instructions(self):
+        if callable(self._instructions):
+            return self._instructions() or DEFAULT_INSTRUCTIONS
+        return self._instructions
+
+    @property
+    def preparation(self):
+        return self.instructions
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __eq__(self, other):
+        # Same key as __hash__; comparing every field would read the instructions
+        if isinstance(other, Recipe):
+            return (self.source, self.id) == (other.source, other.id)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.source, self.id))
+
+    def __repr__(self):
+        return f"Recipe({self.id!r}, {self.name!r})"
+
+    def to_dict(self):
+        """Plain dict copy with lists for the sequence fields"""
+        recipe = {key: self[key] for key in self.KEYS}
+        recipe['ingredients'] = list(self.ingredients)
+        recipe['nutrition'] = dict(self.nutrition)
+        recipe['tags'] = list(self.tags)
+        return recipe
+
+
+def _split_ingredients(text):
+    return [ingredient.strip() for ingredient in str(text).split(',')]
+
+
+def _number(value, default, cast):
+    # pandas reads empty numeric cells as NaN
+    if value is None or value == '' or (isinstance(value, float) and math.isnan(value)):
+        return default
+    return cast(value)
+
+
+def _read_csv_without_text(csv_file):
+    """DataFrame of every column but Preparation, plus a lazy reader for that column"""
+    import pandas as pd
+    # Use pandas to properly handle multi-line CSV entries with proper quoting
+    df = pd.read_csv(csv_file, quotechar='"', skipinitialspace=True, encoding='utf-8',
+                     usecols=lambda column: column != 'Preparation')
+    return df, CsvTextColumn(csv_file, 'Preparation')
+
+
+def load_non_veg_csv(csv_file=NON_VEG_CSV_PATH):
+    """Load non-vegetarian recipes from CSV file; preparation text is read on demand"""
+    recipes = []
+    try:
+        df, texts = _read_csv_without_text(csv_file)
+
+        for index, row in enumerate(df.itertuples(index=False)):
+            try:
+                row = dict(zip(df.columns, row))
+                recipes.append(Recipe(
+                    id=f'nonveg_{index + 1}',
+                    name=str(row['Dish']).strip(),
+                    ingredients=_split_ingredients(str(row['Ingredients (with quantities)']).strip()),
+                    instructions=partial(texts.get, index),
+                    nutrition={
+                        'calories': _number(row['Calories'], 0, int),
+                        'protein': _number(row['Protein_g'], 0, int),
+                        'carbs': _number(row['Carbs_g'], 0, int),
+                        'fat': _number(row['Fat_g'], 0, int),
+                        'fiber': _number(row['Fiber_g'], 0, int)
+                    },
+                    category='non_vegetarian',
+                    tags=['non_vegetarian'],
+                    cooking_time=30,  # Default cooking time
+                    source='non_veg'
+                ))
+            except Exception as e:
+                print(f"Error parsing row {index}: {e}")
+                continue
+
+        print(f"Successfully loaded {len(recipes)} non-vegetarian recipes from CSV")
+
+    except ImportError:
+        print("pandas not available, using fallback CSV parsing")
+        recipes = load_non_veg_csv_fallback(csv_file)
+    except FileNotFoundError:
+        print(f"CSV file not found: {csv_file}")
+        print("Using sample non-vegetarian recipes as fallback")
+        recipes = sample_non_veg_recipes()
+    except Exception as e:
+        print(f"Error loading CSV file: {e}")
+        recipes = sample_non_veg_recipes()
+
+    return recipes
+
+
+def load_veg_csv(csv_file=VEG_CSV_PATH):
+    """Load vegetarian recipes from CSV file; preparation text is read on demand"""
+    recipes = []
+    try:
+        df, texts = _read_csv_without_text(csv_file)
+
+        for index, row in enumerate(df.itertuples(index=False)):
+            try:
+                row = dict(zip(df.columns, row))
+                recipes.append(_veg_recipe(index, row['Dish'], row['Ingredients'],
+                                           partial(texts.get, index), row))
+            except Exception as e:
+                print(f"Error parsing vegetarian row {index}: {e}")
+                continue
+
+        print(f"Successfully loaded {len(recipes)} vegetarian recipes from CSV")
+
+    except ImportError:
+        print("pandas not available, using fallback CSV parsing for vegetarian recipes")
+        recipes = load_veg_csv_fallback(csv_file)
+    except FileNotFoundError:
+        print(f"Vegetarian CSV file not found: {csv_file}")
+        print("Using sample vegetarian recipes as fallback")
+        recipes = sample_veg_recipes()
+    except Exception as e:
+        print(f"Error loading vegetarian CSV file: {e}")
+        recipes = sample_veg_recipes()
+
+    return recipes
+
+
+def _veg_recipe(index, dish, ingredients, preparation, row):
+    return Recipe(
+        id=f'veg_{index}',
+        name=str(dish).strip(),
+        ingredients=_split_ingredients(str(ingredients).strip()),
+        instructions=preparation,
+        nutrition={
+            'calories': _number(row['Calories'], 300, int),
+            'protein': _number(row['Protein_g'], 10, float),
+            'carbs': _number(row['Carbs_g'], 40, float),
+            'fat': _number(row['Fat_g'], 10, float),
+            'fiber': _number(row['Fiber_g'], 5, float)
+        },
+        category='vegetarian',
+        tags=['vegetarian'],
+        cooking_time=30,
+        source='veg'
+    )
+
+
+def load_non_veg_csv_fallback(csv_file):
+    """Fallback CSV parsing without pandas"""
+    recipes = []
+    try:
+        with open(csv_file, 'r', encoding='utf-8') as file:
+            lines = file.read().split('\n')
+
+        # Rows can span lines; a line with enough commas starts a new one
+        current_row = []
+        for line in lines[1:]:  # Skip header
+            if not line.strip():
+                continue
+            if line.count(',') >= 6:
+                if current_row:
+                    _append_non_veg_row(current_row, recipes)
+                current_row = [line]
+            elif current_row:
+                current_row.append(line)
+
+        if current_row:
+            _append_non_veg_row(current_row, recipes)
+
+    except Exception as e:
+        print(f"Fallback CSV parsing failed: {e}")
+        return sample_non_veg_recipes()
+
+    return recipes
+
+
+# Name,"ingredients",calories,protein,carbs,fat,fiber,"instructions"
+_NON_VEG_ROW = re.compile(r'^([^,]+),"([^"]+)",(\d+),(\d+),(\d+),(\d+),(\d+),"(.+)"$', re.DOTALL)
+
+
+def _append_non_veg_row(row_lines, recipes):
+    """Parse a CSV row that might span multiple lines"""
+    try:
+        match = _NON_VEG_ROW.match(' '.join(row_lines).strip())
+        if match:
+            recipes.append(Recipe(
+                id=f'nonveg_{len(recipes) + 1}',
+                name=match.group(1).strip(),
+                ingredients=_split_ingredients(match.group(2).strip()),
+                instructions=match.group(8).strip(),
+                nutrition={key: int(match.group(group)) for group, key in
+                           enumerate(('calories', 'protein', 'carbs', 'fat', 'fiber'), start=3)},
+                category='non_vegetarian',
+                tags=['non_vegetarian'],
+                cooking_time=30,
+                source='non_veg'
+            ))
+    except Exception as e:
+        print(f"Error processing CSV row: {e}")
+
+
+def load_veg_csv_fallback(csv_file):
+    """Fallback CSV parsing for vegetarian recipes without pandas"""
+    recipes = []
+    try:
+        import csv
+        with open(csv_file, 'r', encoding='utf-8') as file:
+            for index, row in enumerate(csv.DictReader(file)):
+                try:
+                    preparation = row['Preparation'].strip() if row['Preparation'] else DEFAULT_INSTRUCTIONS
+                    recipes.append(_veg_recipe(index, row['Dish'], row['Ingredients'], preparation, row))
+                except Exception as e:
+                    print(f"Error parsing vegetarian fallback row {index}: {e}")
+                    continue
+    except Exception as e:
+        print(f"Vegetarian fallback CSV parsing failed: {e}")
+        return sample_veg_recipes()
+
+    return recipes
+
+
+def _sample(source, category, rows):
+    return [Recipe(recipe_id, name, ingredients, instructions,
+                   dict(zip(('calories', 'protein', 'carbs', 'fat', 'fiber'), nutrition)),
+                   category, [category], cooking_time, source)
+            for recipe_id, name, ingredients, nutrition, instructions, cooking_time in rows]
+
+
+def sample_veg_recipes():
+    """Sample vegetarian recipes used when the CSV cannot be read"""
+    return _sample('veg', 'vegetarian', [
+        ('veg_khichdi', 'Vegetable Khichdi',
+         ['1/2 cup rice', '1/4 cup moong dal', '1 cup mixed vegetables', 'spices'],
+         (320, 11, 48, 8, 6), 'Cook rice and dal with vegetables and spices until soft', 30),
+        ('veg_palak_paneer', 'Palak Paneer', ['200g spinach', '100g paneer', '1 onion', 'spices'],
+         (280, 14, 12, 20, 5), 'Cook spinach with paneer and spices', 25),
+        ('veg_chickpea_salad', 'Chickpea Salad', ['1 cup chickpeas', '1 cucumber', '1 tomato', 'lemon juice'],
+         (250, 12, 35, 8, 10), 'Mix chickpeas with vegetables and dressing', 15)
+    ])
+
+
+def sample_non_veg_recipes():
+    """Sample non-vegetarian recipes used when the CSV cannot be read"""
+    return _sample('non_veg', 'non_vegetarian', [
+        ('nonveg_chicken_curry', 'Chicken Curry',
+         ['500g chicken', '2 onions', '3 tomatoes', '1 tbsp ginger-garlic paste', 'spices'],
+         (350, 25, 15, 20, 3), 'Cook chicken with spices and vegetables until tender', 45),
+        ('nonveg_egg_curry', 'Egg Curry', ['6 eggs', '2 onions', '2 tomatoes', '1 tbsp oil', 'curry leaves'],
+         (280, 18, 12, 18, 2), 'Boil eggs and cook in spicy gravy', 30),
+        ('nonveg_fish_fry', 'Fish Fry', ['500g fish', '1 tbsp red chili powder', '1 tsp turmeric', 'oil for frying'],
+         (320, 30, 5, 18, 1), 'Marinate fish and deep fry until golden', 25),
+        ('nonveg_mutton_biryani', 'Mutton Biryani',
+         ['500g mutton', '2 cups basmati rice', '1 cup yogurt', 'biryani spices'],
+         (450, 28, 45, 22, 2), 'Layer cooked mutton and rice, cook on dum', 90),
+        ('nonveg_egg_omelet', 'Masala Omelet', ['3 eggs', '1 onion', '2 green chilies', '1 tomato', 'coriander leaves'],
+         (220, 15, 8, 14, 2), 'Beat eggs with vegetables and cook as omelet', 10),
+        ('nonveg_chicken_biryani', 'Chicken Biryani',
+         ['500g chicken', '2 cups basmati rice', '1 cup yogurt', 'biryani spices'],
+         (420, 26, 42, 18, 2), 'Layer cooked chicken and rice, cook on dum', 75),
+        ('nonveg_prawn_curry', 'Prawn Curry', ['500g prawns', '1 coconut', '2 onions', '3 tomatoes', 'curry spices'],
+         (300, 22, 18, 16, 3), 'Cook prawns in coconut curry', 35),
+        ('nonveg_chicken_tikka', 'Chicken Tikka',
+         ['500g chicken', '1 cup yogurt', '1 tbsp garam masala', '1 tbsp ginger-garlic paste'],
+         (290, 35, 8, 12, 1), 'Marinate chicken and grill until cooked', 40)
+    ])
+
+
+def load_database_recipes(db):
+    """Recipes stored in SQLite; instructions are fetched through the database's text cache"""
+    conn = sqlite3.connect(db.db_path)
+    try:
+        rows = conn.execute('''
+            SELECT r.id, r.name, r.ingredients, r.category, r.tags, r.cooking_time,
+                   n.calories, n.protein, n.carbs, n.fat, n.fiber, n.sugar, n.sodium
+            FROM recipes r
+            LEFT JOIN nutrition n ON n.recipe_id = r.id
+            ORDER BY r.id
+        ''').fetchall()
+    except sqlite3.OperationalError:
+        rows = []  # database not initialized yet
+    finally:
+        conn.close()
+
+    recipes = []
+    for recipe_id, name, ingredients, category, tags, cooking_time, *nutrients in rows:
+        nutrition = {key: value for key, value in
+                     zip(('calories', 'protein', 'carbs', 'fat', 'fiber', 'sugar', 'sodium'), nutrients)
+                     if value is not None}
+        recipes.append(Recipe(recipe_id, name, json.loads(ingredients),
+                              partial(db.get_recipe_text, recipe_id), nutrition,
+                              category, json.loads(tags) if tags else [], cooking_time, 'database'))
+    return recipes
+
+
+def _file_fingerprint(path):
+    try:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    except OSError:
+        return 'missing'
+
+
+def _database_fingerprint(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        # Bumped by triggers on every recipe or nutrition write, including in-place updates
+        return conn.execute('SELECT version FROM catalogue_version WHERE id = 1').fetchone()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+class RecipeCatalogue:
+    """One in-memory catalogue over the SQLite, vegetarian CSV and non-vegetarian CSV sources.
+
+    Each source is loaded on first use and reloaded only when its file (or
+    table contents) change, so every module asking for recipes shares the
+    same Recipe objects.  Lists handed out are fresh, so callers may
+    reorder or extend them freely.
+    """
+
+    def __init__(self, db_path=DATABASE_PATH, veg_csv_path=VEG_CSV_PATH, non_veg_csv_path=NON_VEG_CSV_PATH):
+        self.db_path = db_path
+        self.veg_csv_path = veg_csv_path
+        self.non_veg_csv_path = non_veg_csv_path
+        self.db = RecipeDatabase(db_path)
+        self._sources = {
+            'database': (lambda: _database_fingerprint(self.db_path), self._load_database),
+            'veg': (lambda: _file_fingerprint(self.veg_csv_path),
+                    lambda: load_veg_csv(self.veg_csv_path)),
+            'non_veg': (lambda: _file_fingerprint(self.non_veg_csv_path),
+                        lambda: load_non_veg_csv(self.non_veg_csv_path))
+        }
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def recipes(self, source):
+        """Recipes of one source: 'database', 'veg' or 'non_veg'"""
+        return list(self._load(source)[1])
+
+    def veg_recipes(self):
+        return self.recipes('veg')
+
+    def non_veg_recipes(self):
+        return self.recipes('non_veg')
+
+    def database_recipes(self):
+        return self.recipes('database')
+
+    def all_recipes(self):
+        """Recipes of every source: SQLite first, then vegetarian and non-vegetarian CSV"""
+        return [recipe for source in self._sources for recipe in self._load(source)[1]]
+
+    def get(self, recipe_id, source=None):
+        """Recipe by id (SQLite ids are ints, CSV ids strings like 'veg_3'), or None"""
+        sources = [source] if source else self._sources
+        for name in sources:
+            recipe = self._load(name)[2].get(recipe_id)
+            if recipe is not None:
+                return recipe
+        return None
+
+    def similarity_graph(self, sources=('database', 'veg', 'non_veg')):
+        """SimilarityGraph over the recipes of the given sources, rebuilt when one of them changes"""
+        version = ('catalogue', sources, self.version(sources))
+        recipes = [recipe for source in sources for recipe in self._load(source)[1]]
+        return recipes, get_similarity_graph(recipes, version=version)
+
+    def duplicate_clusters(self, sources=('database', 'veg', 'non_veg')):
+        """Groups of near-duplicate recipes across the given sources, largest first"""
+        recipes, graph = self.similarity_graph(sources)
+        return [[recipes[index] for index in cluster] for cluster in graph.clusters()]
+
+    def distinct_recipes(self, sources=('database', 'veg', 'non_veg')):
+        """Recipes of the given sources with only the first recipe of each near-duplicate cluster"""
+        recipes, graph = self.similarity_graph(sources)
+        return [recipe for index, recipe in enumerate(recipes) if graph.labels[index] == index]
+
+    def _load_database(self):
+        # Rows changed, so cached instructions may be stale
+        self.db.text_cache.clear()
+        return load_database_recipes(self.db)
+
+    def version(self, sources=('veg', 'non_veg')):
+        """Fingerprint of the given sources, changing whenever one of them is modified"""
+        return ':'.join(str(self._sources[source][0]()) for source in sources)
+
+    def _load(self, source):
+        fingerprint, loader = self._sources[source]
+        current = fingerprint()
+        with self._lock:
+            loaded = self._loaded.get(source)
+            if loaded is None or loaded[0] != current:
+                recipes = loader()
+                loaded = (current, recipes, {recipe.id: recipe for recipe in recipes})
+                self._loaded[source] = loaded
+            return loaded
+
+
+_catalogue = None
+
+
+def get_recipe_catalogue():
+    """Shared catalogue so every module works from the same recipe objects"""
+    global _catalogue
+    if _catalogue is None:
+        _catalogue = RecipeCatalogue()
+    return _catalogue
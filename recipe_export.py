@@ -0,0 +1,44 @@
+"""
+Streaming export of recipes as NDJSON or CSV.
+
+Both writers take any iterable of recipe dicts (normally
+RecipeDatabase.iter_recipes) and yield encoded chunks one recipe at a
+time, so they can back a streamed Flask response.
+"""
+
+import io
+import csv
+from database import NUTRITION_COLUMNS
+
+CSV_COLUMNS = ('id', 'name', 'category', 'cuisine_type', 'difficulty', 'cooking_time',
+               'ingredients', 'tags', 'created_at') + NUTRITION_COLUMNS + ('instructions',)
+
+
+def iter_ndjson(recipes, dumps_bytes):
+    """One JSON document per line; dumps_bytes must return UTF-8 ending in a newline"""
+    for recipe in recipes:
+        yield dumps_bytes(recipe)
+
+
+def iter_csv(recipes, header=True):
+    """CSV rows with nutrition flattened into columns and lists joined by '; '"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush():
+        chunk = buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    if header:
+        writer.writerow(CSV_COLUMNS)
+        yield flush()
+    for recipe in recipes:
+        nutrition = recipe.get('nutrition') or {}
+        writer.writerow([
+            recipe['id'], recipe['name'], recipe['category'], recipe['cuisine_type'],
+            recipe['difficulty'], recipe['cooking_time'],
+            '; '.join(recipe['ingredients']), '; '.join(recipe['tags']), recipe['created_at']
+        ] + [nutrition.get(key) for key in NUTRITION_COLUMNS] + [recipe.get('instructions', '')])
+        yield flush()
@@ -0,0 +1,189 @@
+import os
+import re
+import sys
+import time
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from database import RecipeDatabase, recipe_content_hash
+from nutrition_backfill import NutritionBackfill
+from recipe_processor import parse_recipe_text
+
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Blocks handed to the process pool at a time, so huge documents stream
+INGEST_CHUNK_SIZE = 256
+
+# '1. Ragi Mudda (రాగి ముద్ద) – Finger Millet Balls'
+_TITLE = re.compile(r'^\s*(\d+)[.)]\s+(\S.*)$')
+_INSTRUCTIONS = re.compile(r'^\s*(instructions|method|preparation)\b', re.IGNORECASE)
+# Citation markers pasted in as trailing digits: 'Toor Dal1', '(split pigeon peas)5'
+_MARKER = re.compile(r'(?<=[^\W\d_)])\d+$|(?<=\))\d+$')
+
+
+def iter_docx_lines(path):
+    """Yield paragraph texts of a .docx file without loading the whole XML tree"""
+    with zipfile.ZipFile(path) as archive:
+        with archive.open('word/document.xml') as document:
+            for event, element in ET.iterparse(document, events=('end',)):
+                if element.tag == WORD_NAMESPACE + 'p':
+                    yield ''.join(node.text or '' for node in element.iter(WORD_NAMESPACE + 't'))
+                    element.clear()
+
+
+def iter_txt_lines(path):
+    """Yield lines of a UTF-8 text file"""
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+def iter_pdf_lines(path):
+    """Yield text lines of a PDF, page by page (needs PyPDF2)"""
+    try:
+        from PyPDF2 import PdfReader
+    except ImportError:
+        print("PyPDF2 is not installed; skipping PDF", path)
+        return
+
+    reader = PdfReader(path)
+    for page in reader.pages:
+        for line in (page.extract_text() or '').splitlines():
+            yield line
+
+
+READERS = {
+    '.docx': iter_docx_lines,
+    '.txt': iter_txt_lines,
+    '.pdf': iter_pdf_lines
+}
+
+
+def iter_document_lines(path):
+    """Dispatch to the reader for the file extension"""
+    reader = READERS.get(os.path.splitext(path)[1].lower())
+    if reader is None:
+        print(f"Unsupported document type: {path}")
+        return iter(())
+    return reader(path)
+
+
+def split_recipe_blocks(lines):
+    """Group lines into recipe texts.
+
+    A block starts at a numbered title ('3. Sajja Rotte ...') and ends at
+    the first blank line after its instructions, so trailing translations
+    or notes before the next title are skipped.
+    """
+    block = []
+    steps = None  # instruction lines seen so far; None until the header
+    for line in lines:
+        line = line.strip()
+        title = _TITLE.match(line)
+        if title:
+            if block:
+                yield '\n'.join(block)
+            block = [title.group(2)]
+            steps = None
+            continue
+        if not block:
+            continue
+        if not line:
+            if steps:
+                yield '\n'.join(block)
+                block = []
+            continue
+        if steps is None and _INSTRUCTIONS.match(line):
+            steps = 0
+        elif steps is not None:
+            steps += 1
+        block.append(line)
+
+    if block:
+        yield '\n'.join(block)
+
+
+def parse_block(text):
+    """Parse one recipe block; returns None if it has no name or ingredients"""
+    recipe = parse_recipe_text(text)
+    recipe['name'] = _MARKER.sub('', recipe['name'])
+    # Drop sub-headings such as 'For the Outer Dough:'
+    recipe['ingredients'] = [_MARKER.sub('', line) for line in recipe['ingredients']
+                             if not line.endswith(':')]
+    if not recipe['name'] or not recipe['ingredients']:
+        return None
+    recipe['instructions'] = recipe['instructions'].strip()
+    recipe['cuisine_type'] = 'Telugu'
+    recipe['content_hash'] = recipe_content_hash(recipe['name'], recipe['ingredients'])
+    return recipe
+
+
+def _chunks(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_parsed_recipes(paths, workers=None):
+    """Stream parsed recipes from documents, parsing blocks in a process pool"""
+    blocks = (block for path in paths for block in split_recipe_blocks(iter_document_lines(path)))
+    if workers == 1:
+        for block in blocks:
+            yield parse_block(block)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in _chunks(blocks, INGEST_CHUNK_SIZE):
+            chunksize = max(1, len(chunk) // (4 * workers))
+            yield from executor.map(parse_block, chunk, chunksize=chunksize)
+
+
+def ingest_documents(paths, db=None, nutrition_api=None, workers=None, with_nutrition=True):
+    """Parse recipe documents, drop duplicates and bulk-load the rest.
+
+    Recipes whose content hash is already stored (or seen earlier in the
+    same run) are skipped.  Returns counts and throughput in recipes/sec.
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+    db = db or RecipeDatabase()
+    seen = db.get_content_hashes()
+
+    start = time.perf_counter()
+    stats = {'blocks': 0, 'parsed': 0, 'duplicates': 0, 'inserted': 0}
+    recipe_ids = []
+    for chunk in _chunks(iter_parsed_recipes(paths, workers), INGEST_CHUNK_SIZE):
+        new_recipes = []
+        for recipe in chunk:
+            stats['blocks'] += 1
+            if recipe is None:
+                continue
+            stats['parsed'] += 1
+            if recipe['content_hash'] in seen:
+                stats['duplicates'] += 1
+                continue
+            seen.add(recipe['content_hash'])
+            new_recipes.append(recipe)
+
+        recipe_ids.extend(db.add_recipes_bulk(new_recipes))
+        stats['inserted'] += len(new_recipes)
+
+    if with_nutrition and recipe_ids:
+        NutritionBackfill(db, nutrition_api, job_name='ingest').run(recipe_ids=recipe_ids)
+
+    seconds = time.perf_counter() - start
+    stats['seconds'] = round(seconds, 3)
+    stats['recipes_per_sec'] = round(stats['parsed'] / seconds, 1) if seconds > 0 else 0.0
+    return stats
+
+
+if __name__ == "__main__":
+    paths = sys.argv[1:] or [os.path.join(os.path.dirname(__file__), 'Recipes - Pulihora.docx')]
+    stats = ingest_documents(paths)
+    print(f"✅ Ingested {stats['inserted']} recipes from {len(paths)} document(s): {stats}")
@@ -0,0 +1,113 @@
+import re
+from collections import namedtuple
+from ingredient_parser import UNITS, parse_ingredient_line
+
+Token = namedtuple('Token', ['kind', 'value', 'line'])
+
+SECTIONS = {
+    'ingredients': 'ingredients',
+    'instructions': 'instructions',
+    'method': 'instructions',
+    'directions': 'instructions',
+    'preparation': 'instructions'
+}
+
+MINUTES_PER_UNIT = {'min': 1, 'mins': 1, 'minute': 1, 'minutes': 1,
+                    'hr': 60, 'hrs': 60, 'hour': 60, 'hours': 60}
+
+_TIME_UNITS = r'hours|hour|hrs|hr|minutes|minute|mins|min'
+_DURATION = re.compile(rf'(\d+)(?:\s*-\s*\d+)?\s*({_TIME_UNITS})\b', re.IGNORECASE)
+
+# One classifier per line: a section header ('Ingredients for the filling:'), or a 'time' line with a duration
+_LINE = re.compile(
+    r'^(?:.{0,40}?[\s(])?(?P<section>ingredients|instructions|method|directions|preparation)\)?(?:\s+for\s[^:]{1,60})?\s*:?\s*$'
+    rf'|^(?=.*\btime\b).*?(?P<minutes>\d+)(?:\s*-\s*\d+)?\s*(?P<time_unit>{_TIME_UNITS})\b',
+    re.IGNORECASE
+)
+
+# Free-text ingredient phrases: '2 cups rice', '2-3 tsp salt', or 'salt 1 tsp' ending an item
+_UNIT_TEXT = '|'.join(sorted(UNITS, key=len, reverse=True))
+_QUANTITY_TEXT = r'\d+/\d+|\d+(?:\.\d+)?(?:\s*(?:-|to)\s*\d+(?:\.\d+)?)?'
+_WORD = r'(?!(?:and|then|or|to|with|in|into|for|until|add|of)\b)[a-z]+'
+_FOOD = rf'{_WORD}(?:[ -]{_WORD}){{0,3}}'
+_PHRASE = re.compile(
+    rf'(?<![\w/.])(?:{_QUANTITY_TEXT})\s*(?:{_UNIT_TEXT})\b\.?\s+(?:of\s+)?{_FOOD}'
+    rf'|(?:(?<=[,;:\n])|^)[ \t]*{_FOOD}\s+(?:{_QUANTITY_TEXT})\s*(?:{_UNIT_TEXT})\b(?=\s*(?:[,;.\n]|$))',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def tokenize_recipe(text):
+    """Yield tokens for recipe text in a single pass over its lines.
+
+    Kinds: 'title', 'text', 'section', 'quantity', 'unit', 'ingredient',
+    'step' and 'time' (value in minutes).  Ingredient lines emit their
+    quantity and unit before the ingredient itself.
+    """
+    section = None
+    titled = False
+    for number, raw in enumerate(text.splitlines()):
+        line = raw.strip()
+        if not line:
+            continue
+
+        match = _LINE.match(line)
+        if match and match.group('section'):
+            section = SECTIONS[match.group('section').lower()]
+            yield Token('section', section, number)
+            continue
+        if match and section != 'instructions':
+            yield Token('time', int(match.group('minutes')) * MINUTES_PER_UNIT[match.group('time_unit').lower()], number)
+            continue
+
+        if section == 'ingredients':
+            parsed = parse_ingredient_line(line)
+            if parsed.quantity is not None:
+                yield Token('quantity', parsed.quantity, number)
+            if parsed.unit:
+                yield Token('unit', parsed.unit, number)
+            yield Token('ingredient', line, number)
+        elif section == 'instructions':
+            yield Token('step', line, number)
+            for duration in _DURATION.finditer(line):
+                minutes = int(duration.group(1)) * MINUTES_PER_UNIT[duration.group(2).lower()]
+                yield Token('time', minutes, number)
+        elif not titled:
+            titled = True
+            yield Token('title', line, number)
+        else:
+            yield Token('text', line, number)
+
+
+def parse_recipe_tokens(tokens):
+    """Build the recipe dict RecipeProcessor stores from a token stream"""
+    recipe_data = {
+        'name': '',
+        'ingredients': [],
+        'instructions': '',
+        'cooking_time': None,
+        'difficulty': 'Medium',
+        'category': 'main_course',
+        'tags': []
+    }
+
+    in_steps = False
+    for token in tokens:
+        if token.kind == 'title':
+            recipe_data['name'] = token.value
+        elif token.kind == 'section':
+            in_steps = token.value == 'instructions'
+        elif token.kind == 'ingredient':
+            recipe_data['ingredients'].append(token.value)
+        elif token.kind == 'step':
+            recipe_data['instructions'] += token.value + '\n'
+        elif token.kind == 'time' and not in_steps and recipe_data['cooking_time'] is None:
+            # Only an explicit 'Cooking time: ...' line sets the recipe's time
+            recipe_data['cooking_time'] = token.value
+
+    return recipe_data
+
+
+def extract_ingredient_phrases(text):
+    """Ingredient phrases found anywhere in free text, each span matched once"""
+    return [match.group(0).strip() for match in _PHRASE.finditer(text)]
@@ -1,13 +1,14 @@
-import re
 from database import RecipeDatabase
 from nutrition_api import NutritionAPI
+from nutrition_backfill import NutritionBackfill
+from recipe_lexer import tokenize_recipe, parse_recipe_tokens, extract_ingredient_phrases
 
 class RecipeProcessor:
     def __init__(self):
         self.db = RecipeDatabase()
         self.nutrition_api = NutritionAPI()
     
-    def process_all_telugu_recipes(self):
+    def process_all_telugu_recipes(self, progress=None):
         """Process and add comprehensive Telugu recipes to the database"""
         recipes = [
             # Breakfast Recipes
@@ -544,28 +545,15 @@ class RecipeProcessor:
             }
         ]
         
-        for recipe in recipes:
-            # Add recipe to database
-            recipe_id = self.db.add_recipe(
-                name=recipe['name'],
-                ingredients=recipe['ingredients'],
-                instructions=recipe['instructions'],
-                cooking_time=recipe['cooking_time'],
-                difficulty=recipe['difficulty'],
-                category=recipe.get('category', 'main_course'),
-                cuisine_type=recipe.get('cuisine_type', 'Telugu'),
-                tags=recipe.get('tags', [])
-            )
-            
-            # Get nutrition data
-            nutrition_data = self.nutrition_api.get_nutrition_data(recipe['ingredients'])
-            
-            # Add nutrition data to database
-            self.db.add_nutrition(recipe_id, nutrition_data)
-            
-            print(f"Added recipe: {recipe['name']}")
+        # Upsert by content hash, so running this again leaves the table unchanged
+        recipe_ids = self.db.upsert_recipes_bulk(recipes)
+        print(f"Stored {len(recipe_ids)} recipes")
+        
+        # Get nutrition data for the new recipes concurrently and store it in bulk
+        stats = self.backfill_nutrition(recipe_ids, progress=progress, job_name='processor_all')
+        return dict(stats, recipes=len(recipe_ids))
     
-    def process_pulihora_recipes(self):
+    def process_pulihora_recipes(self, progress=None):
         """Process and add sample Pulihora recipes to the database"""
         # Keep the original pulihora recipes for backward compatibility
         recipes = [
@@ -687,89 +675,40 @@ class RecipeProcessor:
             }
         ]
         
-        for recipe in recipes:
-            # Add recipe to database
-            recipe_id = self.db.add_recipe(
-                name=recipe['name'],
-                ingredients=recipe['ingredients'],
-                instructions=recipe['instructions'],
-                cooking_time=recipe['cooking_time'],
-                difficulty=recipe['difficulty']
-            )
-            
-            # Get nutrition data
-            nutrition_data = self.nutrition_api.get_nutrition_data(recipe['ingredients'])
-            
-            # Add nutrition data to database
-            self.db.add_nutrition(recipe_id, nutrition_data)
-            
-            print(f"Added recipe: {recipe['name']}")
+        # Upsert by content hash, so running this again leaves the table unchanged
+        recipe_ids = self.db.upsert_recipes_bulk(recipes)
+        print(f"Stored {len(recipe_ids)} recipes")
+        
+        # Get nutrition data for the new recipes concurrently and store it in bulk
+        stats = self.backfill_nutrition(recipe_ids, progress=progress, job_name='processor_pulihora')
+        return dict(stats, recipes=len(recipe_ids))
+    
+    def backfill_nutrition(self, recipe_ids=None, recompute=False, progress=None, job_name='processor'):
+        """Fill in nutrition with the rate-limited concurrent backfill"""
+        backfill = NutritionBackfill(self.db, self.nutrition_api, job_name=job_name)
+        stats = backfill.run(recompute=recompute, recipe_ids=recipe_ids, progress=progress)
+        print(f"Nutrition added for {stats['processed']} recipes ({stats['recipes_per_sec']} recipes/sec)")
+        return stats
     
     def extract_ingredients_from_text(self, text):
         """Extract ingredients from text using regex patterns"""
-        # Common patterns for ingredients
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*(cup|tbsp|tsp|gram|g|kg|ml|l|oz|pound|lb)s?\s+([a-zA-Z\s]+)',
-            r'([a-zA-Z\s]+)\s+(\d+(?:\.\d+)?)\s*(cup|tbsp|tsp|gram|g|kg|ml|l|oz|pound|lb)s?',
-            r'(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*(cup|tbsp|tsp|gram|g|kg|ml|l|oz|pound|lb)s?\s+([a-zA-Z\s]+)'
-        ]
-        
-        ingredients = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if len(match) >= 2:
-                    ingredient = ' '.join(match).strip()
-                    ingredients.append(ingredient)
-        
-        return ingredients
+        return extract_ingredients_from_text(text)
     
     def parse_recipe_text(self, text):
         """Parse recipe text and extract structured data"""
-        # This is a simplified parser - you can enhance it based on your document structure
-        lines = text.split('\n')
-        
-        recipe_data = {
-            'name': '',
-            'ingredients': [],
-            'instructions': '',
-            'cooking_time': None,
-            'difficulty': 'Medium',
-            'category': 'main_course',
-            'tags': []
-        }
-        
-        current_section = None
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            # Detect sections
-            if 'ingredients' in line.lower():
-                current_section = 'ingredients'
-                continue
-            elif 'instructions' in line.lower() or 'method' in line.lower():
-                current_section = 'instructions'
-                continue
-            elif 'time' in line.lower():
-                # Extract cooking time
-                time_match = re.search(r'(\d+)\s*(min|hour|hr)', line, re.IGNORECASE)
-                if time_match:
-                    recipe_data['cooking_time'] = int(time_match.group(1))
-                continue
-            
-            # Process content based on section
-            if current_section == 'ingredients':
-                if line and not line.startswith('Ingredients'):
-                    recipe_data['ingredients'].append(line)
-            elif current_section == 'instructions':
-                if line and not line.startswith('Instructions'):
-                    recipe_data['instructions'] += line + '\n'
-            else:
-                # Assume it's the recipe name if no section is detected
-                if not recipe_data['name']:
-                    recipe_data['name'] = line
-        
-        return recipe_data 
\ No newline at end of file
+        return parse_recipe_text(text)
+    
+    def ingest_documents(self, paths, workers=None):
+        """Load recipes from .docx/.txt/.pdf collections into the database"""
+        from recipe_ingest import ingest_documents
+        return ingest_documents(paths, db=self.db, nutrition_api=self.nutrition_api, workers=workers)
+
+
+def extract_ingredients_from_text(text):
+    """Extract ingredients from text with the compiled single-pass phrase pattern"""
+    return extract_ingredient_phrases(text)
+
+
+def parse_recipe_text(text):
+    """Parse recipe text and extract structured data"""
+    return parse_recipe_tokens(tokenize_recipe(text))
@@ -0,0 +1,272 @@
+import re
+import zlib
+import threading
+import numpy as np
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from ingredient_parser import parse_ingredient_line
+from config import (MINHASH_PERMUTATIONS, MINHASH_BANDS, SIMILARITY_THRESHOLD, SIMILARITY_NEIGHBOURS,
+                    SIMILARITY_MAX_DF, SIMILARITY_MAX_CLUSTER)
+
+# Number of recipe lists whose similarity graphs are kept in memory
+MAX_CACHED_GRAPHS = 8
+
+# Tempering and seasoning staples shared by most Telugu dishes; they say
+# nothing about which dish a recipe is.  Matched against the end of a food,
+# so 'pinch of asafoetida' and 'sesame oil' are dropped too.
+STAPLE_FOODS = (
+    'salt', 'oil', 'ghee', 'water', 'mustard seeds', 'cumin seeds', 'curry leaves', 'asafoetida',
+    'hing', 'turmeric', 'turmeric powder', 'urad dal', 'chana dal', 'red chillies', 'red chilli',
+    'green chillies', 'green chilli',
+)
+
+# Variant markers such as 'Tuna Salad #3' or 'Vegetable Khichdi Variant 3'
+_VARIANT = re.compile(r'#\s*\d+|\bvariant\s*\d+\b', re.IGNORECASE)
+_WORD = re.compile(r'[^\W\d_]+')
+
+# Universal hashing (a * x + b) mod p; p keeps every product inside 64 bits
+_PRIME = (1 << 31) - 1
+
+# Rows hashed against every permutation at once while building signatures
+_HASH_CHUNK = 1 << 16
+
+_graph_cache = OrderedDict()
+_graph_lock = threading.Lock()
+
+
+@lru_cache(maxsize=65536)
+def _food(line):
+    return parse_ingredient_line(line).food
+
+
+def _is_staple(food):
+    return any(food == staple or food.endswith(' ' + staple) for staple in STAPLE_FOODS)
+
+
+def recipe_features(recipe):
+    """Set of normalized ingredient foods (staples left out) and name words describing a recipe"""
+    features = set()
+    for line in recipe['ingredients']:
+        food = _food(str(line))
+        if food and not _is_staple(food):
+            features.add(food)
+    for word in _WORD.findall(_VARIANT.sub(' ', recipe['name']).lower()):
+        features.add(f'name:{word}')
+    return features
+
+
+def drop_common_features(feature_sets, max_df=SIMILARITY_MAX_DF):
+    """Feature sets without the features found in more than `max_df` of them"""
+    counts = Counter(feature for features in feature_sets for feature in features)
+    limit = max_df * len(feature_sets)
+    common = {feature for feature, count in counts.items() if count > limit}
+    if not common:
+        return feature_sets
+    return [features - common for features in feature_sets]
+
+
+def minhash_signatures(feature_sets, num_perm=MINHASH_PERMUTATIONS, seed=1):
+    """(len(feature_sets), num_perm) MinHash signatures; equal columns estimate Jaccard similarity"""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+    b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+    # crc32 is stable across processes, unlike hash() on strings
+    token_ids = {}
+    rows, tokens = [], []
+    for row, features in enumerate(feature_sets):
+        for feature in features:
+            token = token_ids.get(feature)
+            if token is None:
+                token = token_ids[feature] = zlib.crc32(feature.encode('utf-8')) % _PRIME
+            rows.append(row)
+            tokens.append(token)
+
+    signatures = np.full((len(feature_sets), num_perm), _PRIME, dtype=np.uint64)
+    rows = np.asarray(rows, dtype=np.int64)
+    tokens = np.asarray(tokens, dtype=np.uint64)
+    for start in range(0, len(tokens), _HASH_CHUNK):
+        hashed = (np.outer(tokens[start:start + _HASH_CHUNK], a) + b) % _PRIME
+        # Rows arrive in order, so each row's tokens are one contiguous run
+        chunk_rows = rows[start:start + _HASH_CHUNK]
+        runs = np.flatnonzero(np.r_[True, chunk_rows[1:] != chunk_rows[:-1]])
+        run_rows = chunk_rows[runs]
+        signatures[run_rows] = np.minimum(signatures[run_rows], np.minimum.reduceat(hashed, runs, axis=0))
+    return signatures
+
+
+def lsh_candidate_pairs(signatures, bands=MINHASH_BANDS, window=SIMILARITY_NEIGHBOURS):
+    """Pairs of rows (first < second) that agree on every hash of at least one band.
+
+    Rows are bucketed per band by sorting on the band's values, so the cost
+    grows with the number of rows rather than pairs.  Within a bucket each
+    row is paired with the next `window` rows only; larger buckets of
+    identical recipes still end up chained together.
+    """
+    count, num_perm = signatures.shape
+    rows_per_band = max(1, num_perm // bands)
+    multipliers = np.random.default_rng(0).integers(1, 1 << 62, rows_per_band, dtype=np.uint64) | np.uint64(1)
+
+    pairs = []
+    for start in range(0, rows_per_band * bands, rows_per_band):
+        band = signatures[:, start:start + rows_per_band]
+        if band.shape[1] == 0:
+            break
+        keys = band @ multipliers  # wraps modulo 2**64
+        order = np.argsort(keys, kind='stable')
+        keys = keys[order]
+        for offset in range(1, min(window, count - 1) + 1):
+            same = np.flatnonzero(keys[:-offset] == keys[offset:])
+            if len(same) == 0:
+                break
+            first, second = order[same], order[same + offset]
+            pairs.append(np.column_stack([np.minimum(first, second), np.maximum(first, second)]))
+
+    if not pairs:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def cluster_labels(count, pairs, max_size=None):
+    """Connected components of `pairs` by union-find; each label is the component's smallest row.
+
+    With `max_size`, pairs that would merge two components into one larger
+    than that are skipped, so pass the strongest pairs first.
+    """
+    parent = list(range(count))
+    size = [1] * count
+
+    def find(row):
+        root = row
+        while parent[root] != root:
+            root = parent[root]
+        while parent[row] != root:
+            parent[row], row = root, parent[row]
+        return root
+
+    for first, second in np.asarray(pairs).tolist():
+        first, second = find(first), find(second)
+        if first != second and (max_size is None or size[first] + size[second] <= max_size):
+            parent[max(first, second)] = min(first, second)
+            size[min(first, second)] += size[max(first, second)]
+
+    return np.array([find(row) for row in range(count)], dtype=np.int64)
+
+
+def graph_version(recipes):
+    """Cheap fingerprint of the fields the similarity graph depends on"""
+    return hash(tuple((r['id'], r['name'], tuple(r['ingredients'])) for r in recipes))
+
+
+def get_similarity_graph(recipes, version=None):
+    """Return the SimilarityGraph for a recipe list, building it once per catalogue version"""
+    if version is None:
+        version = graph_version(recipes)
+
+    with _graph_lock:
+        graph = _graph_cache.get(version)
+        if graph is None:
+            graph = SimilarityGraph(recipes)
+            _graph_cache[version] = graph
+            if len(_graph_cache) > MAX_CACHED_GRAPHS:
+                _graph_cache.popitem(last=False)
+        else:
+            _graph_cache.move_to_end(version)
+
+    return graph
+
+
+class SimilarityGraph:
+    """Nearest-neighbour graph and clusters of near-duplicate recipes.
+
+    Recipes are compared by MinHash estimates of the Jaccard similarity of
+    their ingredient foods and name words, so 'Grilled Chicken Breast #1'
+    and '#6' are neighbours.  Only pairs that collide in an LSH band are
+    compared, which keeps the build close to linear in the catalogue size.
+    Each recipe keeps up to `k` neighbours at or above `threshold`; lookups
+    by recipe index are constant time.  Recipes linked by neighbours form
+    clusters, labelled by their first recipe's index; linking stops once a
+    cluster holds `max_cluster` recipes, so chains of loosely similar
+    recipes cannot grow into one huge cluster.
+
+    Staple ingredients and features found in more than `max_df` of the
+    recipes are left out, so shared tempering does not make different
+    dishes (lemon and tamarind pulihora) look alike.
+    """
+
+    def __init__(self, recipes, k=SIMILARITY_NEIGHBOURS, threshold=SIMILARITY_THRESHOLD,
+                 num_perm=MINHASH_PERMUTATIONS, bands=MINHASH_BANDS, max_df=SIMILARITY_MAX_DF,
+                 max_cluster=SIMILARITY_MAX_CLUSTER):
+        self.threshold = threshold
+        features = drop_common_features([recipe_features(r) for r in recipes], max_df)
+        self.signatures = minhash_signatures(features, num_perm)
+        self._featureless = np.array([not f for f in features], dtype=bool)
+        self.neighbours = []
+        self.similarities = []
+        self._neighbour_sets = []
+        pairs = self._build(k, bands)
+        self.labels = cluster_labels(len(recipes), pairs, max_cluster)
+
+    def __len__(self):
+        return len(self.neighbours)
+
+    def _build(self, k, bands):
+        """Fill the neighbour lists; returns the pairs at or above the threshold, most similar first"""
+        count = len(self.signatures)
+        pairs = lsh_candidate_pairs(self.signatures, bands, window=k)
+        scores = np.concatenate([
+            (self.signatures[chunk[:, 0]] == self.signatures[chunk[:, 1]]).mean(axis=1)
+            for chunk in np.array_split(pairs, max(1, len(pairs) // _HASH_CHUNK))
+        ]) if len(pairs) else np.empty(0)
+        # Recipes left without features would all share one signature
+        keep = (scores >= self.threshold) & ~self._featureless[pairs[:, 0]] & ~self._featureless[pairs[:, 1]]
+        pairs, scores = pairs[keep], scores[keep]
+
+        # Both directions, grouped by recipe with the most similar first
+        rows = np.concatenate([pairs[:, 0], pairs[:, 1]])
+        others = np.concatenate([pairs[:, 1], pairs[:, 0]])
+        both = np.concatenate([scores, scores])
+        order = np.lexsort((others, -both, rows))
+        rows, others, both = rows[order], others[order], both[order]
+        bounds = np.searchsorted(rows, np.arange(count + 1))
+
+        for index in range(count):
+            start = bounds[index]
+            end = min(bounds[index + 1], start + k)
+            self.neighbours.append(others[start:end])
+            self.similarities.append(both[start:end])
+            self._neighbour_sets.append(frozenset(others[start:end].tolist()))
+
+        return pairs[np.argsort(-scores, kind='stable')]
+
+    def neighbours_of(self, index):
+        """(recipe indices, similarities) of a recipe's near-duplicates, most similar first"""
+        return self.neighbours[index], self.similarities[index]
+
+    def neighbour_set(self, index):
+        """Near-duplicates of a recipe as a frozenset of indices"""
+        return self._neighbour_sets[index]
+
+    def similarity(self, first, second):
+        """Estimated Jaccard similarity of two recipes"""
+        return float(np.mean(self.signatures[first] == self.signatures[second]))
+
+    def cluster_of(self, index):
+        """Indices of every recipe in the same near-duplicate cluster"""
+        return np.flatnonzero(self.labels == self.labels[index])
+
+    def clusters(self, min_size=2):
+        """Near-duplicate clusters as lists of recipe indices, largest first"""
+        order = np.argsort(self.labels, kind='stable')
+        labels = self.labels[order]
+        groups = np.split(order, np.flatnonzero(labels[1:] != labels[:-1]) + 1) if len(order) else []
+        groups = [group.tolist() for group in groups if len(group) >= min_size]
+        return sorted(groups, key=lambda group: (-len(group), group[0]))
+
+    def near_duplicate_mask(self, indices):
+        """Boolean mask of recipes in the clusters of, or neighbouring, the given recipes"""
+        indices = list(indices)
+        mask = np.isin(self.labels, self.labels[indices])
+        for index in indices:
+            mask[self.neighbours[index]] = True
+        return mask
@@ -0,0 +1,192 @@
+import numpy as np
+from datetime import timedelta
+
+# Nutrients stored per recipe, in column order
+NUTRIENT_KEYS = ('calories', 'protein', 'carbs', 'fat', 'fiber', 'sugar', 'sodium')
+
+# Nutrients reported as daily averages in plan summaries
+DAILY_SUMMARY_KEYS = ('calories', 'protein', 'carbs', 'fat', 'fiber')
+
+
+def nutrition_matrix(recipes, keys=NUTRIENT_KEYS):
+    """Build an (n_recipes, n_nutrients) array from recipe nutrition dicts"""
+    matrix = np.zeros((len(recipes), len(keys)))
+    for i, recipe in enumerate(recipes):
+        nutrition = recipe.get('nutrition') or {}
+        for j, key in enumerate(keys):
+            value = nutrition.get(key)
+            if value is not None:
+                matrix[i, j] = value
+    return matrix
+
+
+class RecipeTable:
+    """Columnar view of a recipe list: row i of `nutrition` belongs to recipes[i].
+
+    An extra all-zero row is kept at the end so that an index of -1 (an
+    empty meal slot) gathers zeros without any masking.
+    """
+
+    def __init__(self, recipes):
+        self.recipes = recipes
+        matrix = nutrition_matrix(recipes)
+        self._padded = np.vstack([matrix, np.zeros((1, len(NUTRIENT_KEYS)))])
+        self.nutrition = self._padded[:-1]
+
+    def __len__(self):
+        return len(self.recipes)
+
+    def column(self, key):
+        """Nutrient values for every recipe"""
+        return self.nutrition[:, NUTRIENT_KEYS.index(key)]
+
+    def gather(self, indices):
+        """Nutrition rows for an index array of any shape (-1 gives zeros)"""
+        return self._padded[np.asarray(indices, dtype=int)]
+
+
+def summarize_nutrition(totals, meal_count, days_count):
+    """Per-meal averages plus per-day averages and plan totals, from whole-plan totals"""
+    if meal_count == 0:
+        return {key: 0 for key in NUTRIENT_KEYS}
+
+    summary = {key: round(totals[key] / meal_count, 1) for key in NUTRIENT_KEYS}
+    for key in DAILY_SUMMARY_KEYS:
+        summary[f'avg_{key}_per_day'] = round(totals[key] / days_count, 1)
+    summary.update({
+        'total_calories': totals['calories'],
+        'total_protein': totals['protein'],
+        'meal_count': meal_count,
+        'days_count': days_count
+    })
+    return summary
+
+
+def render_day(table, meal_types, start_date, day, picks, telugu_date=None):
+    """(day_key, day_data) for one day of picks, as in the nested meal plan view"""
+    date = start_date + timedelta(days=day)
+    day_data = {
+        'day': day + 1,
+        'date': date.strftime('%A, %B %d'),
+        'meals': {}
+    }
+    if telugu_date is not None:
+        day_data['telugu_date'] = telugu_date(date)
+
+    for meal_type, index in zip(meal_types, picks):
+        if index >= 0:
+            recipe = table.recipes[index]
+            # Catalogue Recipe records render as plain, JSON-ready dicts
+            day_data['meals'][meal_type] = recipe.to_dict() if hasattr(recipe, 'to_dict') else recipe
+
+    return date.strftime('%Y-%m-%d'), day_data
+
+
+class MealPlanArray:
+    """A meal plan as a (days, slots) array of row indices into a RecipeTable.
+
+    Totals and averages come from a single gather-and-sum; the nested
+    {date: {...}} dict is only built by to_dict() for rendering.
+    """
+
+    def __init__(self, table, picks, meal_types, start_date):
+        self.table = table
+        self.meal_types = list(meal_types)
+        self.start_date = start_date
+        self.picks = np.full((len(picks), len(self.meal_types)), -1, dtype=int)
+        for day, day_picks in enumerate(picks):
+            self.picks[day, :len(day_picks)] = day_picks
+
+    @classmethod
+    def from_meal_plan(cls, meal_plan):
+        """Index an existing nested meal plan dict"""
+        recipes = []
+        rows = {}
+        meal_types = []
+        for day_data in meal_plan.values():
+            for meal_type in day_data['meals']:
+                if meal_type not in meal_types:
+                    meal_types.append(meal_type)
+
+        picks = []
+        for day_data in meal_plan.values():
+            day_picks = []
+            for meal_type in meal_types:
+                meal = day_data['meals'].get(meal_type)
+                if not meal or not meal.get('nutrition'):
+                    day_picks.append(-1)
+                    continue
+                if id(meal) not in rows:
+                    rows[id(meal)] = len(recipes)
+                    recipes.append(meal)
+                day_picks.append(rows[id(meal)])
+            picks.append(day_picks)
+
+        return cls(RecipeTable(recipes), picks, meal_types, None)
+
+    @property
+    def days_count(self):
+        return self.picks.shape[0]
+
+    @property
+    def meal_count(self):
+        return int(np.count_nonzero(self.picks >= 0))
+
+    def meal_nutrition(self):
+        """(days, slots, nutrients) array of per-meal nutrition"""
+        return self.table.gather(self.picks)
+
+    def daily_totals(self):
+        """(days, nutrients) array of per-day totals"""
+        return self.meal_nutrition().sum(axis=1)
+
+    def totals(self):
+        """Whole-plan totals keyed by nutrient"""
+        return dict(zip(NUTRIENT_KEYS, self.daily_totals().sum(axis=0).tolist()))
+
+    def per_meal_averages(self):
+        """Average nutrition per served meal, rounded like the summaries"""
+        totals = self.totals()
+        meal_count = self.meal_count
+        if meal_count == 0:
+            return {key: 0 for key in NUTRIENT_KEYS}
+        return {key: round(value / meal_count, 1) for key, value in totals.items()}
+
+    def nutrition_summary(self):
+        """Per-meal averages plus per-day averages and plan totals"""
+        return summarize_nutrition(self.totals(), self.meal_count, self.days_count)
+
+    def iter_days(self, telugu_date=None):
+        """Yield (day_key, day_data) pairs of the nested meal plan view"""
+        for day in range(self.days_count):
+            yield render_day(self.table, self.meal_types, self.start_date, day, self.picks[day], telugu_date)
+
+    def to_dict(self, telugu_date=None):
+        """Materialize the nested {date: {...}} meal plan used for rendering"""
+        return dict(self.iter_days(telugu_date))
+
+
+class PlanSummary:
+    """Nutrition summary built up one rendered day at a time.
+
+    Lets streamed plans report the same summary as MealPlanArray without
+    keeping earlier days around.
+    """
+
+    def __init__(self):
+        self.totals = dict.fromkeys(NUTRIENT_KEYS, 0.0)
+        self.meal_count = 0
+        self.days_count = 0
+
+    def add_day(self, day_data):
+        self.days_count += 1
+        for meal in day_data['meals'].values():
+            nutrition = meal.get('nutrition') if meal else None
+            if not nutrition:
+                continue
+            self.meal_count += 1
+            for key in NUTRIENT_KEYS:
+                self.totals[key] += nutrition.get(key) or 0
+
+    def nutrition_summary(self):
+        return summarize_nutrition(self.totals, self.meal_count, self.days_count)
@@ -0,0 +1,101 @@
+import re
+import mmap
+import threading
+from collections import OrderedDict
+from config import RECIPE_TEXT_CACHE_SIZE
+
+# One CSV field and its terminator; quoted fields may span lines and escape quotes as ""
+_FIELD = re.compile(rb'[ \t]*(?:"((?:[^"]|"")*)"[ \t]*(?=[,\r\n]|$)|([^,\n]*))(,|\r?\n|$)')
+
+
+class TextCache:
+    """Small thread-safe LRU of long text fields, filled by a loader on a miss"""
+
+    def __init__(self, loader, max_entries=RECIPE_TEXT_CACHE_SIZE):
+        self.loader = loader
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        text = self.loader(key)
+        with self._lock:
+            self._entries[key] = text
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def csv_field_spans(buf, column):
+    """(start, end, quoted) byte spans of one column for every data row of a CSV buffer.
+
+    The header names the column; blank lines are skipped like pandas does.
+    """
+    spans = []
+    index = None
+    pos = 0
+    size = len(buf)
+    header = []
+    fields = []
+    while pos < size:
+        match = _FIELD.match(buf, pos)
+        quoted = match.group(1) is not None
+        group = 1 if quoted else 2
+        fields.append((match.start(group), match.end(group), quoted))
+        pos = match.end()
+
+        if match.group(3) != b',':
+            if index is None:
+                header = [bytes(buf[start:end]).decode('utf-8').strip() for start, end, _ in fields]
+                index = header.index(column)
+            elif len(fields) > 1 or fields[0][0] != fields[0][1]:
+                spans.append(fields[index] if index < len(fields) else (0, 0, False))
+            fields = []
+            if not match.group(3):
+                break
+    return spans
+
+
+class CsvTextColumn:
+    """Read one long text column of a CSV file on demand.
+
+    The file is memory-mapped and indexed once into per-row byte offsets;
+    a row's text is decoded only when asked for and kept in a small LRU.
+    """
+
+    def __init__(self, path, column, max_entries=RECIPE_TEXT_CACHE_SIZE):
+        self.path = path
+        self.column = column
+        with open(path, 'rb') as f:
+            try:
+                self._buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                self._buf = b''
+        self.spans = csv_field_spans(self._buf, column)
+        self.cache = TextCache(self._read, max_entries)
+
+    def __len__(self):
+        return len(self.spans)
+
+    def get(self, row):
+        """Stripped text of the column in data row `row` (None if empty)"""
+        return self.cache.get(row)
+
+    def _read(self, row):
+        start, end, quoted = self.spans[row]
+        text = self._buf[start:end].decode('utf-8')
+        if quoted:
+            text = text.replace('""', '"')
+        return text.strip() or None
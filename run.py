@@ -10,6 +10,11 @@ from app import app
 
 def main():
     """Main function to run the application"""
+    if '--prod' in sys.argv:
+        # Pre-forked workers with the app preloaded (see gunicorn.conf.py)
+        print("🍛 Starting Telugu Recipes Application with gunicorn...")
+        os.execvp('gunicorn', ['gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:application'])
+
     print("🍛 Starting Telugu Recipes Application...")
     print("=" * 50)
     print("📱 Web Interface: http://localhost:5000")
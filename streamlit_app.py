@@ -9,24 +9,28 @@ st.set_page_config(
 )
 
 import pandas as pd
+import numpy as np
 import json
 import os
 import sqlite3
 import base64
-import random
-import time
 from streamlit_rag_app import get_display_text
-from datetime import datetime, timedelta
+from datetime import datetime
 from database import RecipeDatabase
 from nutrition_api import NutritionAPI
 from diet_generator import TeluguDietGenerator
+from meal_optimizer import MealPlanOptimizer
+from candidate_pools import get_candidate_pools
+from recipe_similarity import get_similarity_graph
+from recipe_table import RecipeTable, MealPlanArray, render_day
 from streamlit_rag_app import get_download_link
+from streamlit_resources import get_diet_generator
 
 class CalorieAwareMealPlanner:
     """Enhanced meal planner with calorie-based selection and variety"""
 
-    def __init__(self):
-        self.diet_generator = TeluguDietGenerator()
+    def __init__(self, diet_generator=None):
+        self.diet_generator = diet_generator or TeluguDietGenerator()
 
     def load_non_veg_recipes(self):
         """Load only non-vegetarian recipes from CSV"""
@@ -45,37 +49,58 @@ class CalorieAwareMealPlanner:
 
     def filter_recipes_by_calories(self, recipes, target_calories_per_meal, tolerance=150):
         """Filter recipes that fit within calorie range for a meal - with generous tolerance"""
-        # Start with a generous tolerance to ensure variety
-        min_calories = max(50, target_calories_per_meal - tolerance)
-        max_calories = target_calories_per_meal + tolerance
-
-        filtered = [r for r in recipes if
-                   min_calories <= r['nutrition']['calories'] <= max_calories]
-
-        # If no recipes in range, be even more generous
-        if not filtered:
-            tolerance = 300
-            min_calories = max(50, target_calories_per_meal - tolerance)
-            max_calories = target_calories_per_meal + tolerance
-            filtered = [r for r in recipes if
-                       min_calories <= r['nutrition']['calories'] <= max_calories]
+        return [recipes[i] for i in self.calorie_window_indices(recipes, target_calories_per_meal, tolerance)]
+
+    def calorie_window_indices(self, recipes, target_calories_per_meal, tolerance=150, pools=None):
+        """Indices of recipes within the calorie window, found by bisecting the calorie-sorted pool"""
+        if pools is None:
+            pools = get_candidate_pools(recipes)
+
+        # Start with a generous tolerance to ensure variety; if no recipes
+        # are in range, be even more generous
+        for window in (tolerance, 300):
+            min_calories = max(50, target_calories_per_meal - window)
+            max_calories = target_calories_per_meal + window
+            indices = pools.calorie_window(min_calories, max_calories)
+            if indices:
+                return indices
 
         # If still no recipes, return all recipes (no calorie restriction)
-        if not filtered:
-            print(f"Warning: No recipes found for target {target_calories_per_meal} cal, using all recipes")
-            filtered = recipes
+        print(f"Warning: No recipes found for target {target_calories_per_meal} cal, using all recipes")
+        return list(range(len(recipes)))
+
+    def generate_varied_meal_plan(self, total_calories, meals_per_day=3, days=7, diet_type='non_vegetarian',
+                                  seed=None, start_date=None):
+        """Generate a varied meal plan that tracks the daily calorie and macro targets.
+        Passing a seed (and start_date) makes the plan reproducible."""
+        plan = self.generate_varied_plan_array(total_calories, meals_per_day, days, diet_type,
+                                               seed, start_date)
+        return plan.to_dict() if plan is not None else None
+
+    def generate_varied_plan_array(self, total_calories, meals_per_day=3, days=7, diet_type='non_vegetarian',
+                                   seed=None, start_date=None):
+        """Generate the varied meal plan as an index array into the recipe table"""
+        varied_plan = self._varied_plan(total_calories, meals_per_day, days, diet_type, seed, start_date)
+        if varied_plan is None:
+            return None
+
+        table, meal_types, start_date, day_picks = varied_plan
+        return MealPlanArray(table, list(day_picks), meal_types, start_date)
 
-        return filtered
+    def iter_varied_meal_plan(self, total_calories, meals_per_day=3, days=7, diet_type='non_vegetarian',
+                              seed=None, start_date=None):
+        """Yield (day_key, day_data) of the varied meal plan one day at a time.
+        Recipe usage carries over between days, so the days match generate_varied_meal_plan."""
+        varied_plan = self._varied_plan(total_calories, meals_per_day, days, diet_type, seed, start_date)
+        if varied_plan is None:
+            return
 
-    def generate_varied_meal_plan(self, total_calories, meals_per_day=3, days=7, diet_type='non_vegetarian'):
-        """Generate a varied meal plan with enhanced variety across all recipes"""
-        # Enhanced randomization with multiple entropy sources
-        import hashlib
-        entropy_string = f"{time.time()}_{random.random()}_{total_calories}_{meals_per_day}_{diet_type}"
-        seed_hash = hashlib.md5(entropy_string.encode()).hexdigest()
-        seed_value = int(seed_hash[:8], 16) % 100000
-        random.seed(seed_value)
+        table, meal_types, start_date, day_picks = varied_plan
+        for day, picks in enumerate(day_picks):
+            yield render_day(table, meal_types, start_date, day, picks)
 
+    def _varied_plan(self, total_calories, meals_per_day, days, diet_type, seed, start_date):
+        """(table, meal types, start date, iterator of each day's picks), or None without recipes"""
         # Load recipes based on diet type
         all_recipes = self.load_recipes_by_type(diet_type)
 
@@ -85,7 +110,6 @@ class CalorieAwareMealPlanner:
         # Calculate realistic calorie limits based on available recipes
         recipe_calories = [r['nutrition']['calories'] for r in all_recipes]
         max_recipe_calories = max(recipe_calories)
-        avg_recipe_calories = sum(recipe_calories) / len(recipe_calories)
 
         # Adjust target calories to be realistic
         max_possible_daily = max_recipe_calories * meals_per_day
@@ -94,10 +118,6 @@ class CalorieAwareMealPlanner:
             print(f"Adjusting to realistic target based on available recipes")
             total_calories = min(total_calories, max_possible_daily)
 
-        # Create a global recipe usage tracker to ensure variety across all recipes
-        global_used_recipes = set()
-        recipe_usage_count = {recipe['id']: 0 for recipe in all_recipes}
-
         # Calculate calorie distribution
         if meals_per_day == 3:
             # Breakfast: 25%, Lunch: 40%, Dinner: 35%
@@ -112,61 +132,23 @@ class CalorieAwareMealPlanner:
             calorie_distribution = [0.20, 0.10, 0.30, 0.15, 0.25]
             meal_types = ['breakfast', 'mid_morning', 'lunch', 'evening_snack', 'dinner']
 
-        meal_plan = {}
-        used_recipe_ids = set()
-
-        for day in range(1, days + 1):
-            date = datetime.now() + timedelta(days=day-1)
-            day_key = date.strftime('%Y-%m-%d')
-
-            meal_plan[day_key] = {
-                'day': day,
-                'date': date.strftime('%A, %B %d'),
-                'meals': {}
-            }
+        # Restrict each slot to recipes near its share of the daily calories
+        pools = get_candidate_pools(all_recipes)
+        slot_candidates = [self.calorie_window_indices(all_recipes, int(total_calories * share), pools=pools)
+                           for share in calorie_distribution]
 
-            daily_used_ids = set()
+        # Solve each day for the combination closest to the calorie and macro targets,
+        # penalizing recipes already used (and their near-duplicates) so the whole
+        # catalogue gets rotated in
+        table = RecipeTable(all_recipes)
+        optimizer = MealPlanOptimizer(table, similarity=get_similarity_graph(all_recipes))
+        day_picks = optimizer.iter_plan(total_calories, calorie_distribution, days, slot_candidates,
+                                        rng=np.random.default_rng(seed))
 
-            for i, meal_type in enumerate(meal_types):
-                target_calories = int(total_calories * calorie_distribution[i])
+        if start_date is None:
+            start_date = datetime.now()
 
-                # Filter recipes by calorie target
-                suitable_recipes = self.filter_recipes_by_calories(all_recipes, target_calories)
-
-                # Enhanced selection logic for better variety
-                # 1. First priority: unused recipes that fit calorie target
-                unused_suitable = [r for r in suitable_recipes if r['id'] not in used_recipe_ids]
-
-                # 2. Second priority: recipes not used today that fit calorie target
-                daily_unused_suitable = [r for r in suitable_recipes if r['id'] not in daily_used_ids]
-
-                # 3. Third priority: least used recipes that fit calorie target
-                if not unused_suitable and not daily_unused_suitable:
-                    # Sort by usage count (ascending) to prefer least used recipes
-                    suitable_recipes.sort(key=lambda r: recipe_usage_count.get(r['id'], 0))
-                    available_recipes = suitable_recipes[:10]  # Top 10 least used
-                elif unused_suitable:
-                    available_recipes = unused_suitable
-                else:
-                    available_recipes = daily_unused_suitable
-
-                # Select random recipe from available options
-                if available_recipes:
-                    selected_recipe = random.choice(available_recipes)
-                    meal_plan[day_key]['meals'][meal_type] = selected_recipe
-                    daily_used_ids.add(selected_recipe['id'])
-                    used_recipe_ids.add(selected_recipe['id'])
-                    recipe_usage_count[selected_recipe['id']] += 1
-                else:
-                    # Fallback: select any recipe if filtering fails
-                    if all_recipes:
-                        selected_recipe = random.choice(all_recipes)
-                        meal_plan[day_key]['meals'][meal_type] = selected_recipe
-                        daily_used_ids.add(selected_recipe['id'])
-                        used_recipe_ids.add(selected_recipe['id'])
-                        recipe_usage_count[selected_recipe['id']] += 1
-
-        return meal_plan
+        return table, meal_types, start_date, day_picks
 
 def create_meal_table(meal_plan):
     """Create a structured table from meal plan"""
@@ -202,8 +184,8 @@ def create_meal_table(meal_plan):
 
 def main():
     try:
-        # Instantiate enhanced meal planner
-        meal_planner = CalorieAwareMealPlanner()
+        # Enhanced meal planner over the generator and catalogue shared by all sessions
+        meal_planner = CalorieAwareMealPlanner(get_diet_generator())
 
         # Sidebar for language selection
         with st.sidebar:
@@ -294,38 +276,20 @@ def main():
 
             with st.spinner('Generating your personalized diet plan...'):
                 # Generate calorie-aware meal plan based on selected diet type
-                meal_plan_data = meal_planner.generate_varied_meal_plan(
+                plan = meal_planner.generate_varied_plan_array(
                     total_calories=calorie_limit,
                     meals_per_day=meals_per_day,
                     days=7,
                     diet_type=mapped_diet_type
                 )
 
-                if meal_plan_data:
-                    # Create structured table
+                if plan is not None:
+                    # Nested view and table are only built for rendering
+                    meal_plan_data = plan.to_dict()
                     meal_table = create_meal_table(meal_plan_data)
 
-                    # Calculate nutrition summary
-                    total_calories = meal_table['Calories'].sum()
-                    total_protein = meal_table['Protein_g'].sum()
-                    total_carbs = meal_table['Carbs_g'].sum()
-                    total_fat = meal_table['Fat_g'].sum()
-                    total_fiber = meal_table['Fiber_g'].sum()
-
-                    days_count = len(meal_plan_data)
-
-                    nutrition_summary = {
-                        'avg_calories_per_day': round(total_calories / days_count, 1),
-                        'avg_protein_per_day': round(total_protein / days_count, 1),
-                        'avg_carbs_per_day': round(total_carbs / days_count, 1),
-                        'avg_fat_per_day': round(total_fat / days_count, 1),
-                        'avg_fiber_per_day': round(total_fiber / days_count, 1),
-                        'calories': round(total_calories / (days_count * meals_per_day), 1),
-                        'protein': round(total_protein / (days_count * meals_per_day), 1),
-                        'carbs': round(total_carbs / (days_count * meals_per_day), 1),
-                        'fat': round(total_fat / (days_count * meals_per_day), 1),
-                        'fiber': round(total_fiber / (days_count * meals_per_day), 1)
-                    }
+                    # Calculate nutrition summary from the plan's index array
+                    nutrition_summary = plan.nutrition_summary()
 
                     # Generate Telugu recommendations
                     recommendations = meal_planner.diet_generator._generate_telugu_recommendations({
@@ -11,7 +11,7 @@ import time
 
 # Initialize components
 db = RecipeDatabase()
-nutrition_api = NutritionAPI()
+nutrition_api = NutritionAPI(blocking=False)
 
 # Initialize RAG system
 @st.cache_resource
@@ -163,6 +163,10 @@ def get_display_text(key, lang='telugu'):
     
     return text_dict.get(key, {}).get(lang, key)
 
+# Meal plans may be the nested dict or a lazy (day_key, day_data) iterator such as iter_meal_plan()
+def plan_days(meal_plan):
+    return meal_plan.items() if hasattr(meal_plan, 'items') else meal_plan
+
 # Function to create a downloadable link for the diet plan
 def get_download_link(diet_plan, lang):
     now = datetime.now().strftime("%Y-%m-%d")
@@ -194,7 +198,7 @@ def generate_diet_plan_text(diet_plan, lang):
         content.append(f"Daily Calories: {diet_plan['preferences']['calorie_target']}\n")
     
     # Add meal plan
-    for day, day_data in diet_plan['meal_plan'].items():
+    for day, day_data in plan_days(diet_plan['meal_plan']):
         if lang == 'telugu':
             content.append(f"రోజు {day_data['day']}: {day_data['telugu_date']}")
             content.append("----------------------------------")
@@ -269,7 +273,7 @@ def generate_pdf(diet_plan, lang):
         content.append(Spacer(1, 12))
         
         # Meal plan
-        for day, day_data in diet_plan['meal_plan'].items():
+        for day, day_data in plan_days(diet_plan['meal_plan']):
             day_title = f"రోజు {day_data['day']}: {day_data['telugu_date']}" if lang == 'telugu' else f"Day {day_data['day']}: {day_data['date']}"
             day_heading = Paragraph(day_title, styles['Heading2'])
             content.append(day_heading)
@@ -407,9 +411,8 @@ def main():
                 if rag_system is not None:
                     diet_plan = rag_system.generate_diet_plan(user_input, selected_lang)
                 else:
-                    from diet_generator import TeluguDietGenerator
-                    diet_generator = TeluguDietGenerator()
-                    diet_plan = diet_generator.generate_diet_menu(user_input)
+                    from streamlit_resources import get_diet_generator
+                    diet_plan = get_diet_generator().generate_diet_menu(user_input)
                 
                 # Store in session state
                 st.session_state.diet_plan = diet_plan
@@ -0,0 +1,49 @@
+"""
+Resources shared by every Streamlit session and rerun.
+
+Streamlit re-executes the page script on each interaction, but imported
+modules stay loaded, so the diet generator (with its database setup) and
+the candidate pools held here are built once per process.  They are kept
+under the catalogue version, which changes whenever a recipe CSV is
+modified, so an edited CSV replaces them on the next interaction.
+"""
+
+import threading
+from diet_generator import TeluguDietGenerator
+from candidate_pools import get_candidate_pools
+from recipe_similarity import get_similarity_graph
+from recipe_catalogue import get_recipe_catalogue
+
+_lock = threading.Lock()
+_resources = {}
+
+
+def catalogue_version():
+    """Version of the recipe CSVs behind the shared resources"""
+    return get_recipe_catalogue().version()
+
+
+def _load_diet_generator():
+    generator = TeluguDietGenerator()
+    # Load both catalogues, their candidate pools and similarity graphs up front
+    for recipes in (generator._load_veg_recipes(), generator._load_non_veg_recipes()):
+        get_candidate_pools(recipes)
+        get_similarity_graph(recipes)
+    return generator
+
+
+def get_diet_generator():
+    """The shared TeluguDietGenerator for the current recipe CSVs"""
+    version = catalogue_version()
+    with _lock:
+        if _resources.get('version') != version:
+            _resources.clear()
+            _resources['diet_generator'] = _load_diet_generator()
+            _resources['version'] = version
+        return _resources['diet_generator']
+
+
+def clear_resources():
+    """Drop the shared resources so the next call rebuilds them"""
+    with _lock:
+        _resources.clear()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for asynchronous diet plan generation with polling and server-sent events
+"""
+
+import os
+import json
+import time
+import sqlite3
+import tempfile
+from datetime import date
+import app as flask_app
+from job_queue import JobQueue
+from diet_generator import TeluguDietGenerator
+
+def test_days_reported_as_planned():
+    print("📅 Testing day-by-day callbacks...")
+
+    generator = TeluguDietGenerator()
+    reported = []
+    plan = generator.generate_diet_menu('vegetarian 1800 calories for a week', seed=3,
+                                        start_date=date(2024, 1, 1),
+                                        on_day=lambda day_key, day_data: reported.append((day_key, day_data)))
+    print(f"   Reported {len(reported)} days: {[key for key, _ in reported][:3]}...")
+    assert list(plan['meal_plan'].items()) == reported
+
+def test_job_events():
+    print("\n📨 Testing job events...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(db_path=os.path.join(tmp, 'jobs.db'), workers=1)
+
+        def publish(progress=None):
+            for day in range(1, 4):
+                progress(day, 3, event={'day': day})
+            return 'ok'
+
+        job_id = queue.submit('publish', publish)
+        queue.shutdown()
+        assert queue.get(job_id)['done'] == 3
+        assert queue.events(job_id) == [(1, {'day': 1}), (2, {'day': 2}), (3, {'day': 3})]
+        assert [seq for seq, _ in queue.events(job_id, after=2)] == [3]
+
+        # The job and its events are deleted once it has been finished for ttl seconds
+        assert JobQueue(db_path=os.path.join(tmp, 'jobs.db'), workers=1).get(job_id)['result'] == 'ok'
+        queue = JobQueue(db_path=os.path.join(tmp, 'jobs.db'), workers=1, ttl=0)
+        assert queue.get(job_id) is None and queue.events(job_id) == []
+        conn = sqlite3.connect(os.path.join(tmp, 'jobs.db'))
+        rows = [conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0] for table in ('jobs', 'job_events')]
+        conn.close()
+        print(f"   Rows left after pruning: {rows}")
+        assert rows == [0, 0]
+
+def parse_sse(text):
+    events = []
+    for block in text.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if fields:
+            events.append(fields)
+    return events
+
+def test_async_api():
+    print("\n⚡ Testing the async plan API...")
+
+    client = flask_app.app.test_client()
+    started = time.perf_counter()
+    response = client.post('/api/generate_diet/async',
+                           json={'user_input': 'non vegetarian 2000 calories for a month', 'seed': 11})
+    body = response.get_json()
+    print(f"   Accepted in {(time.perf_counter() - started) * 1000:.0f} ms: {body['plan_id']}")
+    assert response.status_code == 202
+
+    # The event stream ends once the plan is done
+    events = parse_sse(client.get(body['events_url']).data.decode('utf-8'))
+    days = [json.loads(event['data']) for event in events if event['event'] == 'day']
+    print(f"   Streamed {len(days)} day events, then '{events[-1]['event']}'")
+    assert len(days) == 30 and [day['day'] for day in days] == list(range(1, 31))
+    assert [int(event['id']) for event in events[:-1]] == list(range(1, 31))
+    assert events[-1]['event'] == 'done'
+    assert 'nutrition_summary' in json.loads(events[-1]['data'])
+
+    # Resuming the stream skips days already received
+    resumed = parse_sse(client.get(body['events_url'], headers={'Last-Event-ID': '28'}).data.decode('utf-8'))
+    assert [event.get('id') for event in resumed] == ['29', '30', None]
+
+    status = client.get(f"{body['status_url']}?after=25").get_json()
+    assert status['status'] == 'done' and status['done'] == status['total'] == 30
+    assert [day['day'] for day in status['days']] == [26, 27, 28, 29, 30]
+    # Incremental pollers get the summary, not the whole plan again
+    assert status['plan'] is None and 'nutrition_summary' in status['summary']
+
+    status = client.get(body['status_url']).get_json()
+    assert list(status['plan']['meal_plan']) == [day['date_key'] for day in days]
+
+    assert client.get('/api/plans/unknown').status_code == 404
+
+if __name__ == "__main__":
+    test_days_reported_as_planned()
+    test_job_events()
+    test_async_api()
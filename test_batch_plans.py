@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for batch diet plan generation
+"""
+
+import os
+import time
+from datetime import date
+import app as flask_app
+from batch_planner import BatchPlanner
+from diet_generator import TeluguDietGenerator
+
+GOALS = ['weight loss', 'weight gain', 'diabetic', 'protein rich']
+
+def batch_requests(count):
+    return [(f'{GOALS[i % 4]} {1500 + 100 * (i % 6)} calories for a month', i) for i in range(count)]
+
+def test_pool_matches_sequential_loop():
+    print("👥 Benchmarking batch plans against a sequential loop...")
+
+    requests = batch_requests(40)
+    start_date = date(2024, 1, 1)
+    generator = TeluguDietGenerator()
+
+    started = time.perf_counter()
+    sequential = [generator.generate_diet_menu(user_input, seed=seed, start_date=start_date)
+                  for user_input, seed in requests]
+    sequential_rate = len(requests) / (time.perf_counter() - started)
+
+    planner = BatchPlanner(workers=max(2, os.cpu_count() or 1))
+    try:
+        planner.generate(requests[:2], start_date)  # start the workers
+        started = time.perf_counter()
+        batched = planner.generate(requests, start_date)
+        batch_rate = len(requests) / (time.perf_counter() - started)
+    finally:
+        planner.shutdown()
+
+    print(f"   Sequential: {sequential_rate:.1f} plans/s, "
+          f"{planner.workers} processes: {batch_rate:.1f} plans/s on {os.cpu_count()} cores")
+    assert batched == sequential
+
+    # Web workers on one host split the cores rather than each taking all of them
+    assert BatchPlanner(workers=0, processes=os.cpu_count() or 1).workers == 1
+    # A single dev server process keeps every core
+    assert flask_app.batch_planner.workers == (os.cpu_count() or 1)
+
+def test_batch_endpoint():
+    print("\n📦 Testing /api/generate_diet/batch...")
+
+    client = flask_app.app.test_client()
+    items = [{'user_input': user_input, 'seed': seed} for user_input, seed in batch_requests(5)]
+    items.append(dict(items[1]))  # a repeat is generated once
+
+    body = client.post('/api/generate_diet/batch', json={'requests': items}).get_json()
+    print(f"   {body['count']} plans, {body['generated']} generated at {body['plans_per_second']} plans/s")
+    assert body['count'] == 6 and body['generated'] == 5
+    assert body['plans'][5] == body['plans'][1]
+    assert [plan['preferences']['calorie_target'] for plan in body['plans']] == [1500, 1600, 1700, 1800, 1900, 1600]
+
+    # Served from the plan cache the second time
+    again = client.post('/api/generate_diet/batch', json={'requests': items}).get_json()
+    assert again['generated'] == 0 and again['plans'] == body['plans']
+
+    plain = client.post('/api/generate_diet/batch', json={'user_inputs': ['2000 calories']}).get_json()
+    assert plain['count'] == 1 and not plain['plans'][0].get('error')
+
+    assert client.post('/api/generate_diet/batch', json={}).status_code == 400
+    for bad in ({'requests': ['vegetarian']}, {'requests': 'vegetarian'}, {'user_inputs': 'vegetarian'},
+                {'user_inputs': [{'user_input': 'vegetarian'}]}, ['vegetarian']):
+        assert client.post('/api/generate_diet/batch', json=bad).status_code == 400
+    too_many = [{'user_input': 'x'}] * (flask_app.PLAN_BATCH_MAX + 1)
+    assert client.post('/api/generate_diet/batch', json={'requests': too_many}).status_code == 400
+
+if __name__ == "__main__":
+    test_pool_matches_sequential_loop()
+    test_batch_endpoint()
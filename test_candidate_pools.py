@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the calorie-sorted per-meal-type candidate pools
+"""
+
+import threading
+import candidate_pools
+from diet_generator import TeluguDietGenerator
+from candidate_pools import get_candidate_pools, MAX_CACHED_POOLS
+from streamlit_app import CalorieAwareMealPlanner
+
+def test_calorie_window_matches_scan():
+    print("🔍 Testing bisect calorie windows against a full scan...")
+
+    generator = TeluguDietGenerator()
+    recipes = generator._load_veg_recipes() + generator._load_non_veg_recipes()
+    pools = get_candidate_pools(recipes)
+
+    for low, high in [(100, 250), (200, 330), (300, 300), (400, 900)]:
+        window = sorted(pools.calorie_window(low, high))
+        scanned = [i for i, r in enumerate(recipes) if low <= r['nutrition']['calories'] <= high]
+        print(f"   {low}-{high} cal: {len(window)} recipes")
+        assert window == scanned
+
+def test_meal_type_pools():
+    print("\n🍳 Testing meal type pools...")
+
+    generator = TeluguDietGenerator()
+    recipes = generator._load_non_veg_recipes()
+    pools = get_candidate_pools(recipes)
+
+    breakfast = pools.meal_type_candidates('breakfast')
+    snack = pools.meal_type_candidates('snack')
+    print(f"   Breakfast pool: {len(breakfast)} recipes, snack pool: {len(snack)} recipes")
+
+    assert all(any(word in recipes[i]['name'].lower() for word in ['egg', 'omelet', 'boiled'])
+               for i in breakfast)
+    assert all(recipes[i]['nutrition']['calories'] < 300 for i in snack)
+
+    # The same catalogue version reuses the pools instead of rebuilding them
+    assert get_candidate_pools(recipes) is pools
+
+def test_select_meal_uses_pools():
+    print("\n🎲 Testing _select_meal with used recipes...")
+
+    generator = TeluguDietGenerator()
+    recipes = generator._load_non_veg_recipes()
+    used = {r['id'] for r in recipes[:10]}
+
+    for _ in range(20):
+        meal = generator._select_meal(recipes, 'lunch', used)
+        assert meal['id'] not in used
+
+def test_plans_fingerprint_once():
+    print("\n🧮 Testing that a plan fingerprints its recipes once...")
+
+    calls = []
+    original = candidate_pools.catalogue_version
+    candidate_pools.catalogue_version = lambda recipes: calls.append(1) or original(recipes)
+    try:
+        TeluguDietGenerator().generate_diet_menu('non vegetarian 4 meals for a week', seed=1)
+        generator_calls = len(calls)
+        CalorieAwareMealPlanner().generate_varied_meal_plan(1500, meals_per_day=5, days=7, seed=1)
+    finally:
+        candidate_pools.catalogue_version = original
+
+    print(f"   Fingerprints: diet generator {generator_calls}, calorie-aware planner {len(calls) - generator_calls}")
+    assert generator_calls == 1 and len(calls) == 2
+
+def test_cache_is_thread_safe():
+    print("\n🧵 Testing the pool cache under concurrent evictions...")
+
+    recipes = TeluguDietGenerator()._load_non_veg_recipes()
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(200):
+                get_candidate_pools(recipes, version=(offset + i) % (MAX_CACHED_POOLS * 2))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+
+if __name__ == "__main__":
+    test_calorie_window_matches_scan()
+    test_meal_type_pools()
+    test_select_meal_uses_pools()
+    test_plans_fingerprint_once()
+    test_cache_is_thread_safe()
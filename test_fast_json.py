@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the fast JSON provider and response compression
+"""
+
+import os
+import gzip
+import time
+import tempfile
+from datetime import date
+from flask.json.provider import DefaultJSONProvider
+import app as flask_app
+from database import RecipeDatabase
+from fast_json import FastJSONProvider, ORJSON_AVAILABLE
+
+def test_provider_output():
+    print("🧾 Testing the fast JSON provider...")
+
+    provider = FastJSONProvider(flask_app.app)
+    stdlib = DefaultJSONProvider(flask_app.app)
+    payload = {'name': 'పులిహోర', 'day': date(2024, 1, 15), 'servings': 4}
+
+    body = provider.dumps_bytes(payload)
+    print(f"   orjson: {ORJSON_AVAILABLE}, body: {body.decode('utf-8').strip()}")
+    assert 'పులిహోర'.encode('utf-8') in body and b'\\u' not in body
+    assert provider.loads(body) == stdlib.loads(stdlib.dumps(payload))
+    assert provider.loads(provider.dumps({1: 'breakfast'})) == {'1': 'breakfast'}
+
+def test_compression():
+    print("\n🗜️ Testing response compression...")
+
+    original_db = flask_app.db
+    with tempfile.TemporaryDirectory() as tmp:
+        flask_app.db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        try:
+            client = flask_app.app.test_client()
+            flask_app.db.add_recipe('Upma', ['1 cup rava'], 'Roast and cook.', 15)
+
+            # Below the size threshold: left alone
+            small = client.get('/api/categories', headers={'Accept-Encoding': 'gzip'})
+            assert 'Content-Encoding' not in small.headers
+            assert 'Accept-Encoding' in small.headers['Vary']
+
+            flask_app.db.add_recipes_bulk(telugu_recipes(50))
+            plain = client.get('/api/recipes')
+            packed = client.get('/api/recipes', headers={'Accept-Encoding': 'gzip'})
+            print(f"   /api/recipes: {len(plain.data)} bytes plain, {len(packed.data)} gzipped")
+            assert packed.headers['Content-Encoding'] == 'gzip'
+            assert gzip.decompress(packed.data) == plain.data
+            assert packed.headers['ETag'].startswith('W/')
+
+            # The weak ETag still revalidates
+            cached = client.get('/api/recipes', headers={'Accept-Encoding': 'gzip',
+                                                         'If-None-Match': packed.headers['ETag']})
+            assert cached.status_code == 304
+        finally:
+            flask_app.db = original_db
+
+def telugu_recipes(count):
+    return [{
+        'name': f'గోంగూర పప్పు {i}',
+        'ingredients': ['1 కప్పు కందిపప్పు', '2 కట్టలు గోంగూర', '4 పచ్చిమిర్చి', 'ఉప్పు రుచికి'],
+        'instructions': 'Cook the dal.',
+        'cooking_time': 30,
+        'category': 'main_course',
+        'tags': ['telugu', 'dal']
+    } for i in range(count)]
+
+def time_requests(client, headers, rounds=20):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        response = client.get('/api/recipes', headers=headers)
+    return (time.perf_counter() - start) / rounds * 1000, len(response.data)
+
+def test_benchmark():
+    print("\n⏱️ Benchmarking /api/recipes payload and latency...")
+
+    original_db, original_json = flask_app.db, flask_app.app.json
+    with tempfile.TemporaryDirectory() as tmp:
+        flask_app.db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        flask_app.db.add_recipes_bulk(telugu_recipes(1000))
+        client = flask_app.app.test_client()
+        try:
+            flask_app.app.json = DefaultJSONProvider(flask_app.app)
+            flask_app.app.json.compact = True  # compare encoders, not indentation
+            stdlib_ms, stdlib_bytes = time_requests(client, {})
+            flask_app.app.json = FastJSONProvider(flask_app.app)
+            fast_ms, fast_bytes = time_requests(client, {})
+            gzip_ms, gzip_bytes = time_requests(client, {'Accept-Encoding': 'gzip'})
+        finally:
+            flask_app.db, flask_app.app.json = original_db, original_json
+
+    print(f"   stdlib jsonify: {stdlib_bytes:>8} bytes  {stdlib_ms:.1f} ms")
+    print(f"   fast provider:  {fast_bytes:>8} bytes  {fast_ms:.1f} ms")
+    print(f"   fast + gzip:    {gzip_bytes:>8} bytes  {gzip_ms:.1f} ms")
+    # UTF-8 Telugu takes 3 bytes a character instead of 6 for \uXXXX
+    assert fast_bytes < stdlib_bytes * 0.8
+    assert gzip_bytes < fast_bytes / 4
+
+if __name__ == "__main__":
+    test_provider_output()
+    test_compression()
+    test_benchmark()
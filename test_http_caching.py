@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for ETag / Last-Modified caching of the read-only API endpoints
+"""
+
+import os
+import sqlite3
+import tempfile
+import app as flask_app
+from database import RecipeDatabase
+
+def test_version_counter():
+    print("🔢 Testing the catalogue version counter...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        start, _ = db.get_catalogue_version()
+
+        recipe_id = db.add_recipe('Gongura Pappu', ['1 cup toor dal', '1 bunch gongura'], 'Cook.', 30)
+        after_recipe, _ = db.get_catalogue_version()
+        db.add_recipe('Gongura Pappu', ['1 cup toor dal', '1 bunch gongura'], 'Cook.', 30)
+        assert db.get_catalogue_version()[0] == after_recipe  # identical reload is not a change
+
+        db.add_nutrition(recipe_id, {'calories': 250})
+        after_nutrition, _ = db.get_catalogue_version()
+
+        # Scripts writing with plain sqlite3 bump it too
+        conn = sqlite3.connect(db.db_path)
+        conn.execute("UPDATE recipes SET difficulty = 'Easy'")
+        conn.commit()
+        conn.close()
+        after_script, _ = db.get_catalogue_version()
+
+        print(f"   Versions: {start} -> {after_recipe} -> {after_nutrition} -> {after_script}")
+        assert start < after_recipe < after_nutrition < after_script
+
+def test_conditional_get():
+    print("\n🏷️ Testing ETag and 304 responses...")
+
+    original_db = flask_app.db
+    with tempfile.TemporaryDirectory() as tmp:
+        flask_app.db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        try:
+            flask_app.db.add_recipe('Pesarattu', ['1 cup moong dal'], 'Grind and spread.', 20, category='breakfast')
+            client = flask_app.app.test_client()
+
+            first = client.get('/api/recipes')
+            etag = first.headers['ETag']
+            print(f"   ETag {etag}, Cache-Control: {first.headers['Cache-Control']}")
+            assert first.status_code == 200 and len(first.get_json()) == 1
+            assert 'must-revalidate' in first.headers['Cache-Control']
+            assert 'Last-Modified' in first.headers
+
+            # Unchanged catalogue: 304 with no body, and no query is run
+            calls = []
+            real_get_all = flask_app.db.get_all_recipes
+            flask_app.db.get_all_recipes = lambda *a, **k: calls.append(1) or real_get_all(*a, **k)
+            cached = client.get('/api/recipes', headers={'If-None-Match': etag})
+            assert cached.status_code == 304 and cached.data == b'' and not calls
+
+            since = client.get('/api/categories', headers={'If-Modified-Since': first.headers['Last-Modified']})
+            assert since.status_code == 304
+
+            # Any write changes the ETag
+            flask_app.db.add_recipe('Upma', ['1 cup rava'], 'Roast and cook.', 15, category='breakfast')
+            fresh = client.get('/api/recipes', headers={'If-None-Match': etag})
+            print(f"   After a new recipe: {fresh.status_code}, ETag {fresh.headers['ETag']}")
+            assert fresh.status_code == 200 and len(fresh.get_json()) == 2
+            assert fresh.headers['ETag'] != etag
+        finally:
+            flask_app.db = original_db
+
+if __name__ == "__main__":
+    test_version_counter()
+    test_conditional_get()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for per-ingredient nutrition lookups and bulk recomputation
+"""
+
+import time
+import numpy as np
+from ingredient_parser import parse_ingredient_line, line_key, split_ingredients
+from ingredient_nutrition import IngredientNutrition
+from nutrition_api import NutritionAPI
+
+def test_parse_ingredient_lines():
+    print("🥄 Testing ingredient line parsing...")
+
+    cases = {
+        '200g chicken breast': (200, 'g', 'chicken breast'),
+        '1/2 cup rice': (0.5, 'cup', 'rice'),
+        '1 1/2 tbsp. olive oil': (1.5, 'tbsp', 'olive oil'),
+        '2-3 green chilies': (2.5, '', 'green chilies'),
+        '1 onion, chopped': (1, '', 'onion'),
+        'Salt to taste': (None, '', 'salt')
+    }
+    for line, expected in cases.items():
+        parsed = parse_ingredient_line(line)
+        print(f"   {line!r} -> {line_key(parsed)!r}")
+        assert tuple(parsed) == expected
+
+    assert line_key(parse_ingredient_line('2 Cups Rice')) == line_key(parse_ingredient_line('2 cup rice'))
+    assert split_ingredients('1 cup mixed vegetables (carrot, beans), 1 tsp salt') == \
+        ['1 cup mixed vegetables (carrot, beans)', '1 tsp salt']
+
+def test_variant_recipe_only_fetches_new_lines():
+    print("\n🧮 Testing memoized per-line lookups...")
+
+    fetched = []
+    def fetch_line(parsed, line):
+        fetched.append(line_key(parsed))
+        return {'calories': 100, 'protein': 1}
+
+    table = IngredientNutrition(fetch_line)
+    base = ['2 cups rice', '1 tbsp oil', '1 tsp turmeric']
+    variant = ['2 cup rice', '1 tbsp oil', '1 tsp turmeric', '1 cup peas']
+
+    assert table.recipe_nutrition(base)['calories'] == 300
+    assert table.recipe_nutrition(variant)['calories'] == 400
+    print(f"   Lines fetched: {fetched}")
+    assert fetched == ['2 cup rice', '1 tbsp oil', '1 tsp turmeric', '1 cup peas']
+
+def test_bulk_matches_per_recipe():
+    print("\n📊 Testing bulk recomputation...")
+
+    api = NutritionAPI(api_key='')
+    recipes = [
+        ['2 cups rice', '1 tbsp oil', '1 onion, chopped'],
+        ['1 cup tamarind', '2 cups rice', 'Salt to taste'],
+        ['1 tsp mustard seeds', 'Curry leaves'],
+        ['2 cups water']
+    ]
+
+    bulk = api.get_bulk_nutrition_data(recipes)
+    single = [api.get_nutrition_data(ingredients) for ingredients in recipes]
+    print(f"   Bulk calories: {[n['calories'] for n in bulk]}")
+    assert bulk == single
+
+    # A recipe with no calories keeps the old default for a typical dish
+    assert bulk[3]['calories'] == 250
+    assert np.isclose(bulk[0]['calories'], api._get_local_nutrition_data(recipes[0])['calories'])
+
+def test_fallback_rows_are_retried():
+    print("\n🔌 Testing recovery after failed API lookups...")
+
+    api_up = [False]
+    def fetch_line(parsed, line):
+        return {'calories': 120} if api_up[0] else None
+
+    table = IngredientNutrition(fetch_line, fallback=lambda parsed, line: {'calories': 90}, fallback_ttl=0.05)
+    assert table.recipe_nutrition(['1 cup rice'])['calories'] == 90
+
+    api_up[0] = True
+    time.sleep(0.1)
+    print(f"   After the API recovers: {table.recipe_nutrition(['1 cup rice'])['calories']} cal")
+    assert table.recipe_nutrition(['1 cup rice'])['calories'] == 120
+    assert len(table) == 1
+
+def test_matrix_growth_is_bounded():
+    print("\n📐 Testing the bounded line matrix...")
+
+    table = IngredientNutrition(lambda parsed, line: {'calories': parsed.quantity}, max_lines=100)
+    lines = [f'{i} g rice' for i in range(1, 151)]
+    totals = table.bulk_nutrition([lines[:80], lines[80:]])
+    print(f"   {len(table)} lines held, matrix capacity {len(table._matrix)}")
+    assert len(table) == 100 and len(table._matrix) == 100
+    assert totals[:, 0].tolist() == [sum(range(1, 81)), sum(range(81, 151))]
+    # Lines beyond the cap are still answered, just not memoized
+    assert table.recipe_nutrition(['150 g rice'])['calories'] == 150
+
+if __name__ == "__main__":
+    test_parse_ingredient_lines()
+    test_variant_recipe_only_fetches_new_lines()
+    test_bulk_matches_per_recipe()
+    test_fallback_rows_are_retried()
+    test_matrix_growth_is_bounded()
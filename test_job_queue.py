@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the background job queue
+"""
+
+import os
+import sys
+import time
+import socket
+import sqlite3
+import tempfile
+import subprocess
+import threading
+from job_queue import JobQueue
+
+def wait_for(queue, job_id, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in ('done', 'failed'):
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f"job {job_id} did not finish")
+
+def test_job_progress_and_result():
+    print("⚙️ Testing job progress and results...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(db_path=os.path.join(tmp, 'jobs.db'), workers=2)
+
+        def load(count, progress=None):
+            for done in range(1, count + 1):
+                progress(done, count)
+            return {'recipes': count}
+
+        job_id = queue.submit('load', load, 5)
+        job = wait_for(queue, job_id)
+        print(f"   Job: {job['status']} {job['done']}/{job['total']} -> {job['result']}")
+        assert job['status'] == 'done'
+        assert job['result'] == {'recipes': 5}
+        assert job['progress'] == 1.0
+
+        def broken(progress=None):
+            raise ValueError("no recipes")
+
+        failed = wait_for(queue, queue.submit('broken', broken))
+        print(f"   Failed job error: {failed['error']}")
+        assert failed['status'] == 'failed' and failed['error'] == 'no recipes'
+        assert queue.get('missing') is None
+        queue.shutdown()
+
+def test_active_job_is_reused():
+    print("\n🔂 Testing repeated submissions while a job runs...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        queue = JobQueue(db_path=os.path.join(tmp, 'jobs.db'), workers=2)
+        release = threading.Event()
+
+        def slow(progress=None):
+            release.wait(5)
+            return 'ok'
+
+        first = queue.submit('initialize', slow)
+        second = queue.submit('initialize', slow)
+        print(f"   Job ids: {first}, {second}")
+        assert first == second
+        # The request path returned while the job is still pending
+        assert queue.get(first)['status'] in ('queued', 'running')
+
+        release.set()
+        assert wait_for(queue, first)['result'] == 'ok'
+        assert queue.submit('initialize', slow) != first
+        queue.shutdown()
+
+def test_restart_fails_unfinished_jobs():
+    print("\n♻️ Testing recovery after a restart...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'jobs.db')
+        JobQueue(db_path=path)
+        conn = sqlite3.connect(path)
+        conn.execute("INSERT INTO jobs (id, name, status) VALUES ('stale', 'initialize', 'running')")
+        # Jobs of a live process (another worker) and of another host are left running
+        exited = subprocess.Popen([sys.executable, '-c', 'pass'])
+        exited.wait()
+        host = socket.gethostname()
+        for job_id, owner_host, owner_pid in (('live', host, os.getpid()), ('dead', host, exited.pid),
+                                              ('remote', 'other-host', exited.pid)):
+            conn.execute("INSERT INTO jobs (id, name, status, owner_host, owner_pid) VALUES (?, ?, 'running', ?, ?)",
+                         (job_id, job_id, owner_host, owner_pid))
+        conn.commit()
+        conn.close()
+
+        queue = JobQueue(db_path=path)
+        statuses = {job_id: queue.get(job_id)['status'] for job_id in ('stale', 'live', 'dead', 'remote')}
+        print(f"   Job statuses after restart: {statuses}")
+        assert statuses == {'stale': 'failed', 'live': 'running', 'dead': 'failed', 'remote': 'running'}
+        assert queue.get('stale')['error'] == 'interrupted by restart'
+
+def test_initialize_returns_immediately():
+    print("\n🌐 Testing /initialize as a background job...")
+
+    import app as flask_app
+    client = flask_app.app.test_client()
+
+    response = client.get('/initialize')
+    assert response.status_code == 302
+    job_id = response.headers['Location'].split('job=')[1]
+    print(f"   Redirected with job {job_id}")
+
+    job = wait_for(flask_app.jobs, job_id, timeout=60)
+    assert job['status'] == 'done', job
+    status = client.get(f'/api/jobs/{job_id}').get_json()
+    print(f"   Status: {status['status']}, result: {status['result']}")
+    assert status['result']['recipes'] > 0
+    assert client.get('/api/jobs/unknown').status_code == 404
+
+if __name__ == "__main__":
+    test_job_progress_and_result()
+    test_active_job_is_reused()
+    test_restart_fails_unfinished_jobs()
+    test_initialize_returns_immediately()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the calorie and macro targeting meal plan optimizer
+"""
+
+import time
+import numpy as np
+from diet_generator import TeluguDietGenerator, MEAL_CALORIE_SHARES
+from meal_optimizer import MealPlanOptimizer
+
+def load_combined_catalogue():
+    generator = TeluguDietGenerator()
+    return generator._load_veg_recipes() + generator._load_non_veg_recipes()
+
+def test_hits_calorie_target():
+    print("🎯 Testing daily calorie targeting...")
+
+    recipes = load_combined_catalogue()
+    optimizer = MealPlanOptimizer(recipes)
+
+    for target in [700, 900, 1100]:
+        plans = optimizer.plan(target, MEAL_CALORIE_SHARES[3], days=7)
+        daily_totals = [sum(recipes[i]['nutrition']['calories'] for i in picks) for picks in plans]
+        worst = max(abs(total - target) for total in daily_totals)
+
+        print(f"   Target {target}: daily totals {daily_totals} (worst miss {worst} cal)")
+        assert worst <= 60, f"Daily total missed {target} cal by {worst}"
+
+def test_no_repeats_within_day():
+    print("\n🔁 Testing no repeated recipes within a day...")
+
+    recipes = load_combined_catalogue()
+    optimizer = MealPlanOptimizer(recipes)
+    plans = optimizer.plan(1000, MEAL_CALORIE_SHARES[4], days=14)
+
+    for picks in plans:
+        assert len(set(picks)) == len(picks), f"Repeated recipe within a day: {picks}"
+
+    used = {i for picks in plans for i in picks}
+    print(f"   {len(used)} distinct recipes used over 14 days")
+
+def test_month_plan_within_budget():
+    print("\n⏱️ Testing 30-day plan over the combined catalogue...")
+
+    recipes = load_combined_catalogue()
+    optimizer = MealPlanOptimizer(recipes)
+
+    start = time.perf_counter()
+    plans = optimizer.plan(1200, [0.20, 0.10, 0.30, 0.15, 0.25], days=30)
+    elapsed = time.perf_counter() - start
+
+    print(f"   {len(plans)} days planned for {len(recipes)} recipes in {elapsed:.2f}s")
+    assert len(plans) == 30
+    assert elapsed < 3.0
+
+def test_budget_is_deterministic():
+    print("\n🎲 Testing that a slow host gets the same seeded plan...")
+
+    recipes = load_combined_catalogue()
+    # Enough work for a few days of dynamic programming, then greedy picks
+    optimizer = MealPlanOptimizer(recipes, work_budget=500000)
+    shares = MEAL_CALORIE_SHARES[4]
+    expected = optimizer.plan(1200, shares, days=10, rng=np.random.default_rng(7))
+
+    original = MealPlanOptimizer._dp_pick
+    MealPlanOptimizer._dp_pick = lambda self, *args: time.sleep(0.05) or original(self, *args)
+    try:
+        slow = optimizer.plan(1200, shares, days=10, rng=np.random.default_rng(7))
+    finally:
+        MealPlanOptimizer._dp_pick = original
+
+    print(f"   Same plan with a slowed-down solver: {slow == expected}")
+    assert slow == expected
+
+if __name__ == "__main__":
+    test_hits_calorie_target()
+    test_no_repeats_within_day()
+    test_month_plan_within_budget()
+    test_budget_is_deterministic()
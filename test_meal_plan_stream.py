@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for day-by-day meal plan generators
+"""
+
+import json
+from datetime import date
+import app as flask_app
+from diet_generator import TeluguDietGenerator
+from meal_optimizer import MealPlanOptimizer
+from recipe_table import PlanSummary
+from streamlit_app import CalorieAwareMealPlanner
+from streamlit_rag_app import generate_diet_plan_text
+
+USER_INPUT = 'weight loss 1600 calories 4 meals for a month'
+
+def test_iter_meal_plan_matches_full_plan():
+    print("📆 Testing iter_meal_plan against generate_diet_menu...")
+
+    generator = TeluguDietGenerator()
+    full = generator.generate_diet_menu(USER_INPUT, seed=5, start_date=date(2024, 3, 1))
+
+    summary = PlanSummary()
+    days = []
+    for day_key, day_data in generator.iter_meal_plan(USER_INPUT, seed=5, start_date=date(2024, 3, 1)):
+        summary.add_day(day_data)
+        days.append((day_key, day_data))
+
+    print(f"   {len(days)} days streamed, {summary.meal_count} meals")
+    assert days == list(full['meal_plan'].items())
+    streamed = summary.nutrition_summary()
+    for key, value in full['nutrition_summary'].items():
+        assert abs(streamed[key] - value) < 1e-6, key
+
+    # Exporters take the lazy days as well
+    lazy_plan = dict(full, meal_plan=generator.iter_meal_plan(USER_INPUT, seed=5, start_date=date(2024, 3, 1)))
+    assert generate_diet_plan_text(lazy_plan, 'english') == generate_diet_plan_text(full, 'english')
+
+def test_days_are_solved_on_demand():
+    print("\n🐢 Testing that days are only solved when asked for...")
+
+    solved = []
+    original = MealPlanOptimizer._solve_day
+    MealPlanOptimizer._solve_day = lambda self, *args: solved.append(1) or original(self, *args)
+    try:
+        days = TeluguDietGenerator().iter_meal_plan(USER_INPUT, seed=1)
+        next(days)
+        next(days)
+        print(f"   Solved after two days: {len(solved)}")
+        assert len(solved) == 2
+    finally:
+        MealPlanOptimizer._solve_day = original
+
+def test_iter_varied_meal_plan():
+    print("\n🥗 Testing the calorie-aware planner's day iterator...")
+
+    planner = CalorieAwareMealPlanner()
+    full = planner.generate_varied_meal_plan(1800, meals_per_day=4, days=10, diet_type='vegetarian',
+                                             seed=9, start_date=date(2024, 3, 1))
+    streamed = list(planner.iter_varied_meal_plan(1800, meals_per_day=4, days=10, diet_type='vegetarian',
+                                                  seed=9, start_date=date(2024, 3, 1)))
+    assert streamed == list(full.items())
+
+def test_stream_endpoint():
+    print("\n🌊 Testing /api/generate_diet/stream...")
+
+    client = flask_app.app.test_client()
+    response = client.post('/api/generate_diet/stream', json={'user_input': USER_INPUT, 'seed': 2})
+    assert response.is_streamed
+    lines = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+    print(f"   {len(lines) - 1} day lines, summary days_count {lines[-1]['nutrition_summary']['days_count']}")
+    assert [line['day'] for line in lines[:-1]] == list(range(1, 31))
+    assert lines[-1]['nutrition_summary']['days_count'] == 30
+    assert lines[-1]['preferences']['calorie_target'] == 1600
+
+if __name__ == "__main__":
+    test_iter_meal_plan_matches_full_plan()
+    test_days_are_solved_on_demand()
+    test_iter_varied_meal_plan()
+    test_stream_endpoint()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for MinHash/LSH near-duplicate detection across recipe sources
+"""
+
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from database import RecipeDatabase
+from recipe_catalogue import RecipeCatalogue, VEG_CSV_PATH, NON_VEG_CSV_PATH
+from recipe_similarity import SimilarityGraph, cluster_labels, lsh_candidate_pairs, minhash_signatures
+from meal_optimizer import MealPlanOptimizer
+
+def synthetic_recipes(dishes, copies=3, seed=0):
+    """`copies` recipes per dish, each copy with one ingredient swapped"""
+    rng = random.Random(seed)
+    foods = [f'food {i}' for i in range(3000)]
+    recipes, dish_of = [], []
+    for dish in range(dishes):
+        ingredients = [f'{rng.randint(1, 3)} cup {food}' for food in rng.sample(foods, 8)]
+        for copy in range(copies):
+            lines = list(ingredients)
+            if copy:
+                lines[rng.randrange(8)] = f'1 tsp {rng.choice(foods)}'
+            recipes.append({'id': len(recipes), 'name': f'Dish {dish} #{copy + 1}', 'ingredients': lines})
+            dish_of.append(dish)
+    return recipes, dish_of
+
+def test_clusters_recover_dishes():
+    print("🧬 Testing clusters on synthetic near-duplicates...")
+
+    timings = {}
+    for dishes in (2000, 8000):
+        recipes, dish_of = synthetic_recipes(dishes)
+        started = time.perf_counter()
+        graph = SimilarityGraph(recipes)
+        timings[len(recipes)] = time.perf_counter() - started
+
+        clusters = graph.clusters()
+        print(f"   {len(recipes)} recipes: {len(clusters)} clusters in {timings[len(recipes)]:.2f}s")
+        assert all(len({dish_of[index] for index in cluster}) == 1 for cluster in clusters)
+        assert len(clusters) >= 0.98 * dishes
+
+    # Four times the recipes would be sixteen times the work if every pair were compared
+    assert timings[24000] < 10 * timings[6000]
+
+def test_lsh_and_union_find():
+    print("\n🪣 Testing LSH buckets and union-find...")
+
+    signatures = minhash_signatures([{'a', 'b', 'c'}, {'a', 'b', 'c'}, {'x', 'y'}, {'a', 'b', 'c'}, set()])
+    assert lsh_candidate_pairs(signatures).tolist() == [[0, 1], [0, 3], [1, 3]]
+    # A bucket larger than the window is still chained into one cluster
+    assert lsh_candidate_pairs(signatures, window=1).tolist() == [[0, 1], [1, 3]]
+    assert cluster_labels(5, [[1, 3], [0, 1]]).tolist() == [0, 0, 2, 0, 4]
+    assert cluster_labels(5, [[1, 3], [0, 1]], max_size=2).tolist() == [0, 1, 2, 1, 4]
+
+def test_chained_clusters_are_capped():
+    print("\n⛓️ Testing that a chain of similar recipes is not one cluster...")
+
+    # Each recipe shares 9 of 10 foods with the next, so neighbours chain end to end
+    recipes = [{'id': i, 'name': 'Chain', 'ingredients': [f'1 cup food {j}' for j in range(i, i + 10)]}
+               for i in range(40)]
+    uncapped = SimilarityGraph(recipes, max_cluster=len(recipes))
+    capped = SimilarityGraph(recipes, max_cluster=5)
+    sizes = [len(cluster) for cluster in capped.clusters(min_size=1)]
+    print(f"   Uncapped: {len(uncapped.clusters())} cluster(s); capped: sizes {sizes}")
+    assert uncapped.clusters() == [list(range(40))]
+    assert max(sizes) <= 5 and sum(sizes) == 40
+    assert capped.near_duplicate_mask([20]).sum() <= 5 + 16
+
+def test_catalogue_clusters_across_sources():
+    print("\n🗂️ Testing duplicate clusters across SQLite and CSV recipes...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'recipes.db')
+        catalogue = RecipeCatalogue(db_path, VEG_CSV_PATH, NON_VEG_CSV_PATH)
+        tuna = catalogue.get('nonveg_3', 'non_veg')
+        db = RecipeDatabase(db_path)
+        db.add_recipe('Tuna Salad', list(tuna['ingredients']), 'Mix and serve', category='salad')
+        db.add_recipe('Sambar', ['1 cup toor dal', '2 cups mixed vegetables', '2 tbsp sambar powder'],
+                      'Cook dal and vegetables with sambar powder')
+
+        clusters = catalogue.duplicate_clusters()
+        for cluster in clusters:
+            print(f"   {cluster[0]['name']}: {len(cluster)} ({', '.join(sorted({r.source for r in cluster}))})")
+        tuna_cluster = next(cluster for cluster in clusters if tuna in cluster)
+        assert {recipe.source for recipe in tuna_cluster} == {'database', 'non_veg'}
+        assert all(recipe['name'] != 'Sambar' for cluster in clusters for recipe in cluster)
+
+        distinct = catalogue.distinct_recipes()
+        assert [recipe['name'] for recipe in distinct if recipe.source == 'database'] == ['Tuna Salad', 'Sambar']
+        assert len(distinct) == 3 + 5 + 1
+
+        # Built once per catalogue version
+        assert catalogue.similarity_graph()[1] is catalogue.similarity_graph()[1]
+
+def test_planner_keeps_clusters_apart():
+    print("\n🍽️ Testing that a day never holds two recipes of one cluster...")
+
+    recipes, _ = synthetic_recipes(6, copies=8)
+    for recipe in recipes:
+        recipe['nutrition'] = {'calories': 400, 'protein': 20, 'carbs': 50, 'fat': 13}
+    # A small neighbour list still bans the whole cluster within a day
+    graph = SimilarityGraph(recipes, k=2)
+    optimizer = MealPlanOptimizer(recipes, similarity=graph)
+    plan = optimizer.plan(1600, [0.25, 0.25, 0.25, 0.25], 14, rng=np.random.default_rng(4))
+    for picks in plan:
+        assert len({int(graph.labels[index]) for index in picks}) == 4
+    print(f"   {len(plan)} days, {len({index for picks in plan for index in picks})} distinct recipes served")
+
+if __name__ == "__main__":
+    test_clusters_recover_dishes()
+    test_lsh_and_union_find()
+    test_chained_clusters_are_capped()
+    test_catalogue_clusters_across_sources()
+    test_planner_keeps_clusters_apart()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the offline, quantity-aware nutrient engine
+"""
+
+import csv
+import time
+from nutrient_engine import NutrientEngine, get_nutrient_engine
+from ingredient_parser import split_ingredients
+
+def test_food_matching():
+    print("🔎 Testing food table matching...")
+
+    foods = get_nutrient_engine().foods
+    cases = {
+        'chicken breast': 'chicken breast',
+        'boneless chicken': 'chicken',
+        'dry red chilies': 'dry red chilies',
+        'green chillies': 'green chilies',
+        'tomatoes': 'tomato',
+        'red chili powder': 'red chili powder',
+        'mint and coriander leaves': 'coriander leaves',
+        'salt and pepper': 'salt',
+        'rice flour': 'rice flour'
+    }
+    for text, expected in cases.items():
+        index = foods.match(text)
+        print(f"   {text!r} -> {foods.names[index]!r}")
+        assert foods.names[index] == expected
+
+    assert foods.match('unobtainium') is None
+
+def test_quantities_to_grams():
+    print("\n⚖️ Testing quantity and unit conversion...")
+
+    engine = get_nutrient_engine()
+    # 200 g at 165 kcal/100 g
+    assert round(engine.line_nutrition('200g chicken breast')['calories']) == 330
+    # 1/2 cup of raw rice is ~92 g
+    assert round(engine.line_nutrition('1/2 cup rice')['calories']) == 338
+    # 1 tbsp of oil is ~13.6 g
+    assert round(engine.line_nutrition('1 tbsp oil')['calories']) == 120
+    # Bare counts use the food's piece weight
+    assert round(engine.line_nutrition('2 eggs')['calories']) == 155
+    assert engine.line_nutrition('3 cups water')['calories'] == 0
+
+def test_counted_leaves_and_spices():
+    print("\n🌿 Testing bare counts of leaves, chillies and spices...")
+
+    engine = get_nutrient_engine()
+    for line in ['10 curry leaves', '10-12 curry leaves', '2 dry red chillies', '3 green chillies',
+                 '2 bay leaves', '4 cloves', '15 mint leaves']:
+        calories = engine.line_nutrition(line)['calories']
+        print(f"   {line}: {calories:.1f} kcal")
+        assert calories < 25
+
+    # Foods without a piece weight are not assumed to weigh 100 g each
+    assert engine.line_nutrition('20 cumin seeds')['calories'] < 1
+
+    tempering = ['2 cups rice', '10-12 curry leaves', '2 tbsp oil', '1 tsp mustard seeds', '2 dry red chillies']
+    rice_and_oil = engine.recipe_nutrition(['2 cups rice', '2 tbsp oil'])['calories']
+    assert engine.recipe_nutrition(tempering)['calories'] - rice_and_oil < 30
+
+def test_catalogue_throughput():
+    print("\n🚀 Testing catalogue throughput...")
+
+    ingredient_lists = []
+    for path in ['veg_diet_recipes.csv', 'non_veg_diet_recipes.csv']:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                column = next(key for key in row if key.startswith('Ingredients'))
+                ingredient_lists.append(split_ingredients(row[column]))
+
+    engine = NutrientEngine()
+    start = time.perf_counter()
+    results = [engine.recipe_nutrition(lines) for lines in ingredient_lists * 20]
+    elapsed = time.perf_counter() - start
+
+    print(f"   {len(results)} recipes in {elapsed:.2f}s ({len(results) / elapsed:.0f} recipes/sec)")
+    assert all(n['calories'] > 0 for n in results)
+
+if __name__ == "__main__":
+    test_food_matching()
+    test_quantities_to_grams()
+    test_counted_leaves_and_spices()
+    test_catalogue_throughput()
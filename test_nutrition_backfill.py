@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test script for the rate-limited concurrent nutrition backfill
+"""
+
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+from database import RecipeDatabase
+from nutrition_api import NutritionAPI
+from nutrition_cache import NutritionCache
+from nutrition_backfill import NutritionBackfill
+from rate_limiter import TokenBucket
+
+def _nutrition_rows(db):
+    conn = sqlite3.connect(db.db_path)
+    rows = conn.execute('SELECT recipe_id, COUNT(*) FROM nutrition GROUP BY recipe_id').fetchall()
+    conn.close()
+    return dict(rows)
+
+def test_token_bucket_rate():
+    print("🪣 Testing token bucket rate limiting...")
+
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.perf_counter()
+    threads = [threading.Thread(target=bucket.acquire) for _ in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    # 5 burst tokens, then 25 more at 50/sec
+    print(f"   30 acquisitions took {elapsed:.2f}s")
+    assert elapsed >= 0.45
+    assert not TokenBucket(rate=0.1, capacity=1).try_acquire(2)
+
+def test_backfill_resumes_from_checkpoint():
+    print("\n⏯️ Testing interrupted backfill resume...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        for i in range(120):
+            db.add_recipe(f'Recipe {i}', [f'{i % 7 + 1} cups rice', '1 tbsp oil', '1 onion'], 'Cook.')
+
+        backfill = NutritionBackfill(db, NutritionAPI(api_key=''), workers=4, batch_size=25)
+        first = backfill.run(limit=60)
+        print(f"   First run: {first}, checkpoint at recipe {backfill.checkpoint()}")
+        assert backfill.checkpoint() == 60
+        assert len(_nutrition_rows(db)) == 60
+
+        second = backfill.run()
+        print(f"   Resumed run: {second}")
+        rows = _nutrition_rows(db)
+        assert len(rows) == 120
+        assert set(rows.values()) == {1}
+        assert backfill.checkpoint() == 0
+
+        # Nothing left to do, and a recompute replaces rather than duplicates rows
+        assert backfill.run()['processed'] == 0
+        backfill.run(recompute=True)
+        assert set(_nutrition_rows(db).values()) == {1}
+
+class FakeSession:
+    """Stands in for the Edamam API: every line has 100 calories"""
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        return FakeResponse()
+
+class FakeResponse:
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'calories': 100, 'totalNutrients': {}}
+
+def test_interactive_lookups_do_not_wait():
+    print("\n⚡ Testing request-path lookups once the quota is used up...")
+
+    session = FakeSession()
+    api = NutritionAPI(api_key='key', session=session, cache=NutritionCache(db_path=''),
+                       rate_limiter=TokenBucket(rate=1 / 60, capacity=2), blocking=False)
+    ingredients = [f'{i} cups rice' for i in range(1, 11)]
+
+    start = time.perf_counter()
+    nutrition = api.get_nutrition_data(ingredients)
+    elapsed = time.perf_counter() - start
+    print(f"   10 lines in {elapsed:.2f}s, {session.calls} API calls, {nutrition['calories']} cal")
+    assert elapsed < 1.0
+    assert session.calls == 2 and nutrition['calories'] > 200
+
+    # The quota is split between the processes sharing it
+    shared = NutritionAPI(api_key='key', session=session, cache=NutritionCache(db_path=''), processes=4)
+    alone = NutritionAPI(api_key='key', session=session, cache=NutritionCache(db_path=''))
+    assert shared.rate_limiter.rate == alone.rate_limiter.rate / 4
+
+    # A single dev server process keeps the whole quota
+    import app as flask_app
+    assert flask_app.nutrition_api.rate_limiter.rate == alone.rate_limiter.rate
+
+if __name__ == "__main__":
+    test_token_bucket_rate()
+    test_backfill_resumes_from_checkpoint()
+    test_interactive_lookups_do_not_wait()
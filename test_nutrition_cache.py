@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Test script for the nutrition lookup cache, against a local stub API server
+"""
+
+import os
+import json
+import tempfile
+import threading
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from nutrition_api import NutritionAPI
+from nutrition_cache import NutritionCache, normalize_ingredients
+
+class StubNutritionHandler(BaseHTTPRequestHandler):
+    requests_served = 0
+
+    def do_GET(self):
+        StubNutritionHandler.requests_served += 1
+        body = json.dumps({
+            'calories': 321,
+            'totalNutrients': {'PROCNT': {'quantity': 12.5}, 'FAT': {'quantity': 7}}
+        }).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_server():
+    server = HTTPServer(('127.0.0.1', 0), StubNutritionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_normalized_keys():
+    print("🔑 Testing ingredient normalization...")
+
+    a = ["2 cups  Rice", "1 tbsp oil"]
+    b = ["1 tbsp OIL", "2 cups rice"]
+    assert normalize_ingredients(a) == normalize_ingredients(b)
+    assert NutritionCache.make_key(a) == NutritionCache.make_key(b)
+    assert NutritionCache.make_key(a) != NutritionCache.make_key(["2 cups rice"])
+
+def test_ttl_expiry():
+    print("\n⏳ Testing TTL expiry...")
+
+    cache = NutritionCache(db_path='', ttl=60)
+    cache.put(["1 cup rice"], {'calories': 200})
+    assert cache.get(["1 cup rice"]) == {'calories': 200}
+
+    # Age the entry past its TTL
+    key = cache.make_key(["1 cup rice"])
+    fetched_at, nutrition = cache._entries[key]
+    cache._entries[key] = (fetched_at - 61, nutrition)
+    assert cache.get(["1 cup rice"]) is None
+    print(f"   Stats: {cache.stats()}")
+
+def test_reingest_hits_cache():
+    print("\n🌐 Testing repeated lookups against a stub API server...")
+
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/nutrition"
+    recipes = [["2 cups rice", "1 tbsp oil"], ["1 cup dal", "1 tsp turmeric"], ["2 cups rice", "1 tbsp oil"]]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'nutrition.db')
+        try:
+            api = NutritionAPI(api_key='test', api_url=url, cache=NutritionCache(db_path=path))
+            first = [api.get_nutrition_data(ingredients) for ingredients in recipes]
+            # Each distinct ingredient line is fetched once and summed per recipe
+            assert first[0]['calories'] == 642 and first[0]['protein'] == 25
+            assert StubNutritionHandler.requests_served == 4
+            print(f"   First ingest: {api.cache_stats()}")
+
+            # A fresh process re-ingesting the catalogue reads everything from SQLite
+            again = NutritionAPI(api_key='test', api_url=url, cache=NutritionCache(db_path=path))
+            second = [again.get_nutrition_data(ingredients) for ingredients in recipes]
+            assert second == first
+            assert again.api_calls == 0
+            assert StubNutritionHandler.requests_served == 4
+            print(f"   Re-ingest: {again.cache_stats()}")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    test_normalized_keys()
+    test_ttl_expiry()
+    test_reingest_hits_cache()
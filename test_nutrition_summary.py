@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized meal plan nutrition summary
+"""
+
+from datetime import date
+from diet_generator import TeluguDietGenerator
+from recipe_table import MealPlanArray
+
+def loop_summary(meal_plan):
+    """Reference implementation: walk the nested plan one nutrient at a time"""
+    totals = {key: 0 for key in ['calories', 'protein', 'carbs', 'fat', 'fiber', 'sugar', 'sodium']}
+    meal_count = 0
+    for day_data in meal_plan.values():
+        for meal in day_data['meals'].values():
+            if meal and meal.get('nutrition'):
+                for key in totals:
+                    totals[key] += meal['nutrition'].get(key) or 0
+                meal_count += 1
+    return totals, meal_count
+
+def test_summary_matches_loop():
+    print("📊 Testing vectorized summary against the nested-dict loop...")
+
+    generator = TeluguDietGenerator()
+    result = generator.generate_diet_menu("vegetarian weight loss 4 meals 1400 calories month",
+                                          seed=3, start_date=date(2025, 1, 1))
+    summary = result['nutrition_summary']
+    totals, meal_count = loop_summary(result['meal_plan'])
+
+    print(f"   {summary['days_count']} days, {summary['meal_count']} meals, "
+          f"{summary['avg_calories_per_day']} cal/day")
+    assert summary['meal_count'] == meal_count
+    assert summary['total_calories'] == totals['calories']
+    assert summary['protein'] == round(totals['protein'] / meal_count, 1)
+    assert summary['avg_fiber_per_day'] == round(totals['fiber'] / len(result['meal_plan']), 1)
+
+    # Summarizing the rendered dict gives the same numbers as the index array
+    assert generator._calculate_nutrition_summary(result['meal_plan']) == summary
+
+def test_daily_totals():
+    print("\n📅 Testing per-day totals from a single gather...")
+
+    generator = TeluguDietGenerator()
+    recipes = generator._load_non_veg_recipes()
+    preferences = generator._parse_user_input("3 meals 900 calories")
+    plan = generator._create_plan_array(recipes, preferences, start_date=date(2025, 1, 1))
+
+    daily = plan.daily_totals()[:, 0]
+    for (day_key, day_data), total in zip(plan.iter_days(), daily):
+        assert total == sum(meal['nutrition']['calories'] for meal in day_data['meals'].values())
+    print(f"   Daily calories: {daily.tolist()}")
+
+def test_empty_plan():
+    print("\n🫙 Testing an empty plan...")
+
+    summary = MealPlanArray.from_meal_plan({}).nutrition_summary()
+    assert summary['calories'] == 0
+
+if __name__ == "__main__":
+    test_summary_matches_loop()
+    test_daily_totals()
+    test_empty_plan()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the diet plan result cache
+"""
+
+import os
+import tempfile
+from datetime import date
+from plan_cache import PlanCache
+
+def test_lru_eviction():
+    print("🗃️ Testing LRU eviction...")
+
+    cache = PlanCache(max_entries=2, db_path='')
+    cache.put('a', {'plan': 1})
+    cache.put('b', {'plan': 2})
+    cache.get('a')
+    cache.put('c', {'plan': 3})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'plan': 1}
+    assert cache.get('c') == {'plan': 3}
+    print(f"   Stats: {cache.stats()}")
+
+    # Callers get their own copy
+    cache.get('c')['plan'] = 4
+    assert cache.get('c') == {'plan': 3}
+
+def test_key_normalization():
+    print("\n🔑 Testing cache key normalization...")
+
+    prefs = {'diet_type': 'vegetarian', 'allergies': ['Peanut', 'milk'], 'duration': 7}
+    same = {'duration': 7, 'allergies': ['milk', 'peanut'], 'diet_type': 'vegetarian'}
+    start = date(2025, 1, 6)
+
+    assert PlanCache.make_key(prefs, 1, start, 'v1') == PlanCache.make_key(same, 1, start, 'v1')
+    assert PlanCache.make_key(prefs, 1, start, 'v1') != PlanCache.make_key(prefs, 2, start, 'v1')
+    assert PlanCache.make_key(prefs, 1, start, 'v1') != PlanCache.make_key(prefs, 1, start, 'v2')
+
+def test_sqlite_persistence():
+    print("\n💾 Testing SQLite persistence...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'plans.db')
+        PlanCache(db_path=path).put('key', {'meal_plan': {'2025-01-06': {'day': 1}}})
+
+        # A fresh cache (e.g. another worker) sees the persisted plan
+        restored = PlanCache(db_path=path).get('key')
+        assert restored == {'meal_plan': {'2025-01-06': {'day': 1}}}
+
+def test_api_serves_repeat_requests_from_cache():
+    print("\n🌐 Testing /api/generate_diet cache hits...")
+
+    import app as flask_app
+    client = flask_app.app.test_client()
+    payload = {'user_input': 'weight loss 1500 calories for a week', 'seed': 11}
+
+    before = flask_app.plan_cache.stats()['hits']
+    first = client.post('/api/generate_diet', json=payload).get_json()
+    second = client.post('/api/generate_diet', json=payload).get_json()
+
+    assert first == second
+    assert flask_app.plan_cache.stats()['hits'] == before + 1
+
+def test_unseeded_requests_stay_varied():
+    print("\n🎲 Testing /api/generate_diet without a seed...")
+
+    import app as flask_app
+    client = flask_app.app.test_client()
+    payload = {'user_input': 'weight gain 2200 calories for a week'}
+
+    before = flask_app.plan_cache.stats()
+    first = client.post('/api/generate_diet', json=payload).get_json()
+    second = client.post('/api/generate_diet', json=payload).get_json()
+    print(f"   Drawn seeds: {first['seed']}, {second['seed']}")
+    # Plans for drawn seeds would never be hit, so they are not cached
+    assert flask_app.plan_cache.stats() == before
+    assert first['seed'] != second['seed']
+    assert first['meal_plan'] != second['meal_plan']
+
+    # The returned seed replays the plan
+    replay = client.post('/api/generate_diet', json=dict(payload, seed=first['seed'])).get_json()
+    assert replay == first
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_key_normalization()
+    test_sqlite_persistence()
+    test_api_serves_repeat_requests_from_cache()
+    test_unseeded_requests_stay_varied()
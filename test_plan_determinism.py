@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script to verify seeded meal plans are reproducible and leave global random state alone
+"""
+
+import json
+import random
+from datetime import date
+from diet_generator import TeluguDietGenerator
+from streamlit_app import CalorieAwareMealPlanner
+
+def test_seeded_plans_are_identical():
+    print("🌱 Testing seeded diet plans...")
+
+    generator = TeluguDietGenerator()
+    user_input = "weight_loss non_vegetarian 4 meals 1200 calories"
+    start = date(2025, 1, 6)
+
+    first = generator.generate_diet_menu(user_input, seed=42, start_date=start)
+    second = generator.generate_diet_menu(user_input, seed=42, start_date=start)
+    other = generator.generate_diet_menu(user_input, seed=43, start_date=start)
+
+    first_json = json.dumps(first, ensure_ascii=False, sort_keys=True)
+    assert first_json == json.dumps(second, ensure_ascii=False, sort_keys=True)
+    assert first_json != json.dumps(other, ensure_ascii=False, sort_keys=True)
+    print("✅ Same seed gives byte-identical plans, different seeds differ")
+
+def test_streamlit_planner_seed():
+    print("\n🌱 Testing seeded calorie-aware planner...")
+
+    planner = CalorieAwareMealPlanner()
+    start = date(2025, 1, 6)
+    plans = [planner.generate_varied_meal_plan(900, meals_per_day=3, days=7, diet_type='vegetarian',
+                                               seed=7, start_date=start)
+             for _ in range(2)]
+
+    assert json.dumps(plans[0], ensure_ascii=False) == json.dumps(plans[1], ensure_ascii=False)
+    print("✅ Same seed gives identical calorie-aware plans")
+
+def test_global_random_untouched():
+    print("\n🔒 Testing that planning does not reseed the global random module...")
+
+    generator = TeluguDietGenerator()
+    recipes = generator._load_non_veg_recipes()
+
+    random.seed(1234)
+    state = random.getstate()
+    generator.generate_diet_menu("protein rich diet 5 meals")
+    for _ in range(10):
+        generator._select_meal(recipes, 'breakfast', set())
+
+    assert random.getstate() == state
+    print("✅ Global random state unchanged")
+
+if __name__ == "__main__":
+    test_seeded_plans_are_identical()
+    test_streamlit_planner_seed()
+    test_global_random_untouched()
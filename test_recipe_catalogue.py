@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the Recipe model and the shared recipe catalogue
+"""
+
+import os
+import json
+import tempfile
+import tracemalloc
+from database import RecipeDatabase
+from diet_generator import TeluguDietGenerator
+from recipe_catalogue import Recipe, RecipeCatalogue, get_recipe_catalogue
+
+def test_recipe_is_compact_and_read_only():
+    print("🧾 Testing the Recipe record...")
+
+    recipe = get_recipe_catalogue().non_veg_recipes()[0]
+    other = get_recipe_catalogue().non_veg_recipes()[1]
+    print(f"   {recipe!r}: {recipe['nutrition']['calories']} cal, tags {recipe['tags']}")
+
+    assert not hasattr(recipe, '__dict__')
+    assert recipe['preparation'] is recipe['instructions']
+    assert recipe.get('tags') is other.get('tags')
+    assert recipe['category'] is other['category']
+    assert recipe.get('missing', 'default') == 'default'
+
+    for mutate in (lambda: setattr(recipe, 'name', 'x'),
+                   lambda: recipe['nutrition'].__setitem__('calories', 0)):
+        try:
+            mutate()
+            assert False, "recipe was modified"
+        except (AttributeError, TypeError):
+            pass
+
+    as_dict = recipe.to_dict()
+    assert set(as_dict) == set(Recipe.KEYS)
+    assert json.loads(json.dumps(as_dict))['nutrition'] == dict(recipe['nutrition'])
+
+    # Equality matches the hash and never reads the instructions
+    reads = []
+    def make(source, recipe_id):
+        return Recipe(recipe_id, 'Pappu', ['1 cup toor dal'], lambda: reads.append(1) or 'Cook.', {}, 'main_course',
+                      source=source)
+    assert make('database', 1) == make('database', 1) and hash(make('database', 1)) == hash(make('database', 1))
+    assert make('database', 1) != make('veg', 1)
+    assert len({make('database', 1), make('database', 1), make('database', 2)}) == 2
+    assert reads == []
+
+def test_memory_per_recipe_drops():
+    print("\n📉 Testing memory per recipe...")
+
+    recipes = get_recipe_catalogue().veg_recipes()
+    texts = [(r['name'], list(r['ingredients']), r['instructions']) for r in recipes]
+
+    def measure(build):
+        tracemalloc.start()
+        built = [build(i, *text) for i, text in enumerate(texts)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size / len(built)
+
+    # The dict shape the loaders used to build, with copied preparation text
+    as_dicts = measure(lambda i, name, ingredients, text: {
+        'id': f'veg_{i}', 'name': name, 'ingredients': list(ingredients),
+        'nutrition': {'calories': 300, 'protein': 10.0, 'carbs': 40.0, 'fat': 10.0, 'fiber': 5.0},
+        'instructions': text, 'preparation': ''.join(text), 'category': 'vegetarian',
+        'tags': ['vegetarian'], 'cooking_time': 30
+    })
+    as_records = measure(lambda i, name, ingredients, text: Recipe(
+        f'veg_{i}', name, ingredients, text,
+        {'calories': 300, 'protein': 10.0, 'carbs': 40.0, 'fat': 10.0, 'fiber': 5.0},
+        'vegetarian', ['vegetarian'], 30, 'veg'
+    ))
+    print(f"   Bytes per recipe: dicts {as_dicts:.0f}, Recipe {as_records:.0f}")
+    assert as_records < as_dicts
+
+def test_modules_share_one_catalogue():
+    print("\n🤝 Testing the shared catalogue...")
+
+    first = TeluguDietGenerator()
+    second = TeluguDietGenerator()
+    assert first.catalogue is second.catalogue is get_recipe_catalogue()
+
+    a = first._load_non_veg_recipes()
+    b = second._load_non_veg_recipes()
+    print(f"   {len(a)} non-vegetarian recipes, same objects: {a[0] is b[0]}")
+    assert a is not b and all(x is y for x, y in zip(a, b))
+    assert get_recipe_catalogue().get('nonveg_1') is a[0]
+    assert get_recipe_catalogue().get('veg_0')['name'] == first._load_veg_recipes()[0]['name']
+
+    plan = first.generate_diet_menu("non vegetarian 3 meals for a week", seed=1)
+    meal = next(iter(plan['meal_plan'].values()))['meals']['lunch']
+    assert isinstance(meal, dict) and meal['preparation'] == meal['instructions']
+
+def test_database_source_loads_lazily():
+    print("\n🗄️ Testing SQLite recipes with lazy instructions...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        recipe_id = db.add_recipe('Tomato Pappu', ['1 cup toor dal'], 'Cook the dal.', 30, tags=['vegetarian'])
+        db.add_nutrition(recipe_id, {'calories': 220, 'protein': 12})
+
+        catalogue = RecipeCatalogue(db_path=db.db_path)
+        recipe = catalogue.get(recipe_id, source='database')
+        assert callable(recipe._instructions)
+        assert recipe['instructions'] == 'Cook the dal.'
+        assert recipe['nutrition']['calories'] == 220
+        assert catalogue.database_recipes()[0] is recipe
+
+        # A new row changes the fingerprint and reloads the source
+        db.add_recipe('Lemon Rice', ['2 cups rice'], 'Mix.', 15)
+        names = [r['name'] for r in catalogue.database_recipes()]
+        print(f"   Database recipes: {names}")
+        assert names == ['Tomato Pappu', 'Lemon Rice']
+        assert len(catalogue.all_recipes()) == 2 + len(catalogue.veg_recipes()) + len(catalogue.non_veg_recipes())
+
+if __name__ == "__main__":
+    test_recipe_is_compact_and_read_only()
+    test_memory_per_recipe_drops()
+    test_modules_share_one_catalogue()
+    test_database_source_loads_lazily()
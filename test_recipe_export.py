@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the streaming recipe export
+"""
+
+import os
+import csv
+import json
+import tempfile
+import tracemalloc
+import app as flask_app
+from database import RecipeDatabase
+from fast_json import FastJSONProvider
+from recipe_export import iter_ndjson
+
+def sample_recipes(count, start=0):
+    return [{
+        'name': f'Pappu {i}',
+        'ingredients': ['1 cup toor dal', f'{i} tomatoes'],
+        'instructions': 'Pressure cook the dal, then temper. ' * 20,
+        'cooking_time': 30,
+        'category': 'main_course',
+        'tags': ['dal']
+    } for i in range(start, start + count)]
+
+def test_export_endpoint():
+    print("📤 Testing /api/recipes/export...")
+
+    original_db = flask_app.db
+    with tempfile.TemporaryDirectory() as tmp:
+        flask_app.db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        try:
+            ids = flask_app.db.add_recipes_bulk(sample_recipes(25))
+            flask_app.db.add_nutrition(ids[0], {'calories': 100})
+            flask_app.db.add_nutrition(ids[0], {'calories': 120})
+            client = flask_app.app.test_client()
+
+            response = client.get('/api/recipes/export')
+            assert response.is_streamed and response.mimetype == 'application/x-ndjson'
+            rows = [json.loads(line) for line in response.data.decode('utf-8').splitlines()]
+            print(f"   NDJSON rows: {len(rows)}, first nutrition: {rows[0]['nutrition']['calories']}")
+            assert [row['id'] for row in rows] == sorted(ids)
+            assert rows[0]['nutrition']['calories'] == 120  # latest nutrition row only
+            assert rows[0]['instructions'].startswith('Pressure cook')
+
+            # Resume after the tenth recipe
+            resumed = client.get(f'/api/recipes/export?after_id={rows[9]["id"]}&instructions=0')
+            tail = [json.loads(line) for line in resumed.data.decode('utf-8').splitlines()]
+            assert [row['id'] for row in tail] == [row['id'] for row in rows[10:]]
+            assert 'instructions' not in tail[0]
+
+            table = list(csv.reader(client.get('/api/recipes/export?format=csv').data.decode('utf-8').splitlines()))
+            print(f"   CSV header: {table[0][:4]}..., {len(table) - 1} rows")
+            assert table[0][:2] == ['id', 'name'] and len(table) == 26
+            assert table[1][6] == '1 cup toor dal; 0 tomatoes'
+            resumed_csv = client.get(f'/api/recipes/export?format=csv&after_id={rows[-2]["id"]}')
+            assert resumed_csv.data.decode('utf-8').count('\n') == 1  # no second header
+
+            assert client.get('/api/recipes/export?format=xml').status_code == 400
+        finally:
+            flask_app.db = original_db
+
+def export_peak(db):
+    provider = FastJSONProvider(flask_app.app)
+    tracemalloc.start()
+    lines = 0
+    for _ in iter_ndjson(db.iter_recipes(batch_size=100), provider.dumps_bytes):
+        lines += 1
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return lines, peak
+
+def test_export_memory_is_flat():
+    print("\n📉 Testing export memory against catalogue size...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        db.add_recipes_bulk(sample_recipes(500))
+        small_lines, small_peak = export_peak(db)
+        db.add_recipes_bulk(sample_recipes(4500, start=500))
+        large_lines, large_peak = export_peak(db)
+
+    print(f"   Peak bytes: {small_lines} recipes {small_peak}, {large_lines} recipes {large_peak}")
+    assert (small_lines, large_lines) == (500, 5000)
+    # Ten times the recipes (~4 MB more text) should not move the peak much
+    assert large_peak < small_peak * 1.5
+
+if __name__ == "__main__":
+    test_export_endpoint()
+    test_export_memory_is_flat()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the document ingestion pipeline
+"""
+
+import os
+import sqlite3
+import tempfile
+from database import RecipeDatabase
+from nutrition_api import NutritionAPI
+from recipe_ingest import iter_docx_lines, split_recipe_blocks, parse_block, ingest_documents
+
+DOCX_PATH = os.path.join(os.path.dirname(__file__), 'Recipes - Pulihora.docx')
+
+SAMPLE_TEXT = """Telugu Favourites
+
+1. Tomato Pappu
+A tangy dal.
+Ingredients:
+1 cup toor dal
+2 tomatoes, chopped
+For tempering:
+1 tsp mustard seeds
+Instructions:
+Cook the dal.
+Add tomatoes and temper.
+
+Translation and notes that are not part of the recipe.
+
+2. Lemon Rice
+Ingredients:
+2 cups cooked rice
+Juice of 1 lemon
+Instructions:
+Mix everything.
+"""
+
+def test_split_docx_blocks():
+    print("📄 Testing .docx block splitting...")
+
+    recipes = [parse_block(block) for block in split_recipe_blocks(iter_docx_lines(DOCX_PATH))]
+    print(f"   {len(recipes)} recipes, first: {recipes[0]['name']}")
+    assert len(recipes) == 25
+    assert recipes[0]['ingredients'][0] == '1 cup Ragi Flour (Finger Millet Flour)'
+    assert all(r['ingredients'] and r['instructions'] for r in recipes)
+    # Sub-headings and pasted citation digits are cleaned up
+    assert not any(line.endswith(':') for r in recipes for line in r['ingredients'])
+    assert recipes[5]['name'].endswith('Toor Dal')
+
+def test_ingest_is_deduplicated():
+    print("\n📥 Testing ingestion with content-hash dedup...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        text_path = os.path.join(tmp, 'recipes.txt')
+        with open(text_path, 'w', encoding='utf-8') as f:
+            f.write(SAMPLE_TEXT)
+
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        api = NutritionAPI(api_key='')
+
+        first = ingest_documents([text_path, text_path], db=db, nutrition_api=api, workers=2)
+        print(f"   First ingest: {first}")
+        assert first['parsed'] == 4 and first['inserted'] == 2 and first['duplicates'] == 2
+
+        second = ingest_documents(text_path, db=db, nutrition_api=api, workers=1)
+        print(f"   Second ingest: {second}")
+        assert second['inserted'] == 0
+
+        recipes = {r['name']: r for r in db.get_all_recipes()}
+        assert recipes['Tomato Pappu']['ingredients'] == ['1 cup toor dal', '2 tomatoes, chopped', '1 tsp mustard seeds']
+        assert recipes['Tomato Pappu']['nutrition']['calories'] > 0
+
+        conn = sqlite3.connect(db.db_path)
+        assert conn.execute('SELECT COUNT(*) FROM nutrition').fetchone()[0] == 2
+        conn.close()
+
+if __name__ == "__main__":
+    test_split_docx_blocks()
+    test_ingest_is_deduplicated()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for the single-pass recipe lexer
+"""
+
+import re
+import time
+from recipe_lexer import tokenize_recipe, parse_recipe_tokens, extract_ingredient_phrases
+from recipe_processor import parse_recipe_text, extract_ingredients_from_text
+
+SAMPLE = """Pulihora
+Cooking time: 1 hour
+Ingredients for Tamarind Pulihora:
+2 cups cooked rice
+1 tbsp tamarind paste
+Salt to taste
+Instructions:
+Combine Ingredients: mix the rice with the tamarind paste.
+Temper the spices for 2 minutes and pour over the rice.
+"""
+
+# Slowest lexer speedup over the legacy parser the benchmark accepts
+MIN_SPEEDUP = 1.3
+
+def legacy_extract_ingredients_from_text(text):
+    """The regex extractor RecipeProcessor used before the lexer"""
+    patterns = [
+        r'(\d+(?:\.\d+)?)\s*(cup|tbsp|tsp|gram|g|kg|ml|l|oz|pound|lb)s?\s+([a-zA-Z\s]+)',
+        r'([a-zA-Z\s]+)\s+(\d+(?:\.\d+)?)\s*(cup|tbsp|tsp|gram|g|kg|ml|l|oz|pound|lb)s?',
+        r'(\d+(?:\.\d+)?)\s*-\s*(\d+(?:\.\d+)?)\s*(cup|tbsp|tsp|gram|g|kg|ml|l|oz|pound|lb)s?\s+([a-zA-Z\s]+)'
+    ]
+    ingredients = []
+    for pattern in patterns:
+        for match in re.findall(pattern, text, re.IGNORECASE):
+            if len(match) >= 2:
+                ingredients.append(' '.join(match).strip())
+    return ingredients
+
+def legacy_parse_recipe_text(text):
+    """The keyword parser RecipeProcessor used before the lexer"""
+    recipe_data = {'name': '', 'ingredients': [], 'instructions': '', 'cooking_time': None,
+                   'difficulty': 'Medium', 'category': 'main_course', 'tags': []}
+    current_section = None
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        if 'ingredients' in line.lower():
+            current_section = 'ingredients'
+            continue
+        elif 'instructions' in line.lower() or 'method' in line.lower():
+            current_section = 'instructions'
+            continue
+        elif 'time' in line.lower():
+            time_match = re.search(r'(\d+)\s*(min|hour|hr)', line, re.IGNORECASE)
+            if time_match:
+                recipe_data['cooking_time'] = int(time_match.group(1))
+            continue
+        if current_section == 'ingredients':
+            recipe_data['ingredients'].append(line)
+        elif current_section == 'instructions':
+            recipe_data['instructions'] += line + '\n'
+        elif not recipe_data['name']:
+            recipe_data['name'] = line
+    return recipe_data
+
+def test_tokens():
+    print("🔤 Testing recipe tokens...")
+
+    tokens = list(tokenize_recipe(SAMPLE))
+    kinds = [token.kind for token in tokens]
+    print(f"   Kinds: {kinds}")
+
+    assert tokens[0] == ('title', 'Pulihora', 0)
+    assert ('time', 60) in [(t.kind, t.value) for t in tokens]
+    assert [t.value for t in tokens if t.kind == 'unit'] == ['cup', 'tbsp']
+    assert [t.value for t in tokens if t.kind == 'quantity'] == [2, 1]
+    assert kinds.count('ingredient') == 3
+    assert kinds.count('step') == 2
+
+def test_parse_recipe_text():
+    print("\n📜 Testing parsed recipe structure...")
+
+    recipe = parse_recipe_text(SAMPLE)
+    print(f"   {recipe['name']}: {recipe['ingredients']} ({recipe['cooking_time']} min)")
+
+    assert recipe['name'] == 'Pulihora'
+    assert recipe['ingredients'] == ['2 cups cooked rice', '1 tbsp tamarind paste', 'Salt to taste']
+    # A step mentioning 'ingredients' stays a step, and hours become minutes
+    assert recipe['instructions'].startswith('Combine Ingredients:')
+    assert recipe['cooking_time'] == 60
+    assert recipe == parse_recipe_tokens(tokenize_recipe(SAMPLE))
+
+def test_phrases_match_once():
+    print("\n🥄 Testing free-text ingredient phrases...")
+
+    text = "Take 2 cups rice and 1 tbsp oil, then add 2-3 tsp salt. Add salt 1 tsp"
+    phrases = extract_ingredients_from_text(text)
+    print(f"   New: {phrases}")
+    print(f"   Legacy: {legacy_extract_ingredients_from_text(text)}")
+
+    assert phrases == ['2 cups rice', '1 tbsp oil', '2-3 tsp salt']
+    assert phrases == extract_ingredient_phrases(text)
+
+def test_benchmark_against_legacy():
+    print("\n⏱️ Benchmarking against the legacy parser...")
+
+    dump = '\n\n'.join(SAMPLE.replace('Pulihora', f'Recipe {i}', 1) for i in range(2000))
+    blocks = dump.split('\n\n')
+
+    def timed(parse, extract):
+        start = time.perf_counter()
+        parsed = [parse(block) for block in blocks]
+        extract(dump)
+        return time.perf_counter() - start, parsed
+
+    # Alternate the two and keep each one's fastest run, so a busy machine slows both alike
+    legacy_seconds = seconds = float('inf')
+    for _ in range(5):
+        elapsed, legacy = timed(legacy_parse_recipe_text, legacy_extract_ingredients_from_text)
+        legacy_seconds = min(legacy_seconds, elapsed)
+        elapsed, parsed = timed(parse_recipe_text, extract_ingredients_from_text)
+        seconds = min(seconds, elapsed)
+
+    print(f"   {len(blocks)} recipes: legacy {legacy_seconds:.3f}s, lexer {seconds:.3f}s "
+          f"({legacy_seconds / seconds:.1f}x)")
+    assert [r['name'] for r in parsed] == [r['name'] for r in legacy]
+    # Typically about 1.7x; falling back to the legacy speed is a regression
+    assert legacy_seconds / seconds >= MIN_SPEEDUP
+
+if __name__ == "__main__":
+    test_tokens()
+    test_parse_recipe_text()
+    test_phrases_match_once()
+    test_benchmark_against_legacy()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the recipe similarity graph and near-duplicate penalties
+"""
+
+import time
+import numpy as np
+from recipe_catalogue import get_recipe_catalogue
+from recipe_similarity import get_similarity_graph, recipe_features, SimilarityGraph
+from meal_optimizer import MealPlanOptimizer
+
+SHARES = [0.25, 0.35, 0.10, 0.30]
+
+def near_duplicates(graph, meals):
+    """Pairs of meals that are the same recipe or neighbours in the graph"""
+    return sum(1 for i, first in enumerate(meals) for second in meals[:i]
+               if first == second or second in graph.neighbour_set(first))
+
+def test_variants_are_neighbours():
+    print("🔗 Testing neighbours in the similarity graph...")
+
+    recipes = get_recipe_catalogue().non_veg_recipes()
+    started = time.perf_counter()
+    graph = SimilarityGraph(recipes)
+    print(f"   Built for {len(graph)} recipes in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    names = [recipe['name'].split('#')[0].strip() for recipe in recipes]
+    for index in range(len(recipes)):
+        neighbours, similarities = graph.neighbours_of(index)
+        assert index not in graph.neighbour_set(index)
+        assert all(names[other] == names[index] for other in neighbours)
+        assert list(similarities) == sorted(similarities, reverse=True)
+    first = names.index(names[0], 1)
+    assert first in graph.neighbour_set(0) and graph.similarity(0, first) == 1.0
+
+    # Variant markers are not features
+    assert recipe_features({'name': 'Tuna Salad #3', 'ingredients': []}) == {'name:tuna', 'name:salad'}
+
+    # Built once per recipe list
+    assert get_similarity_graph(recipes) is get_similarity_graph(list(recipes))
+
+def test_shared_tempering_is_not_similarity():
+    print("\n🍋 Testing pulihora variants that only share their tempering...")
+
+    tempering = ['2 tbsp sesame oil', '1 tsp mustard seeds', '1 tbsp chana dal', '1 tbsp urad dal',
+                 '2 dry red chillies', '10 curry leaves', 'pinch of asafoetida', '1/2 tsp turmeric', 'salt to taste']
+    recipes = [
+        {'id': 1, 'name': 'Classic Tamarind Pulihora', 'ingredients': ['2 cups cooked rice', '1 lemon sized tamarind', '2 tbsp peanuts'] + tempering},
+        {'id': 2, 'name': 'Lemon Pulihora', 'ingredients': ['2 cups cooked rice', '2 lemons', '2 tbsp peanuts'] + tempering},
+        {'id': 3, 'name': 'Coconut Pulihora', 'ingredients': ['2 cups cooked rice', '1 cup grated coconut', '1 tbsp cashews'] + tempering},
+        {'id': 4, 'name': 'Peanut Pulihora', 'ingredients': ['2 cups cooked rice', '1/2 cup roasted peanuts', '1 tbsp jaggery'] + tempering},
+        {'id': 5, 'name': 'Lemon Pulihora #2', 'ingredients': ['2 cups cooked rice', '2 lemons', '2 tbsp peanuts'] + tempering},
+    ]
+    graph = SimilarityGraph(recipes)
+    print(f"   Clusters: {[[recipes[i]['name'] for i in cluster] for cluster in graph.clusters()]}")
+    assert graph.clusters() == [[1, 4]]
+    # The staple list alone is enough, even where no feature is common enough to drop
+    assert SimilarityGraph(recipes, max_df=1.0).clusters() == [[1, 4]]
+    assert 'salt' not in recipe_features(recipes[0])
+
+def test_plans_avoid_near_duplicates():
+    print("\n🍽️ Testing near-duplicate penalties in weekly plans...")
+
+    recipes = get_recipe_catalogue().non_veg_recipes()
+    graph = get_similarity_graph(recipes)
+
+    results = {}
+    for label, similarity in (('without graph', None), ('with graph', graph)):
+        optimizer = MealPlanOptimizer(recipes, similarity=similarity)
+        plan = optimizer.plan(1800, SHARES, 28, rng=np.random.default_rng(3))
+        same_day = sum(near_duplicates(graph, day) for day in plan)
+        same_week = sum(near_duplicates(graph, [meal for day in plan[week:week + 7] for meal in day])
+                        for week in range(0, 28, 7))
+        results[label] = (same_day, same_week)
+        print(f"   {label}: {same_day} same-day, {same_week} same-week near-duplicate pairs")
+
+    assert results['with graph'][0] == 0
+    assert results['with graph'][1] < results['without graph'][1]
+
+    # Plans stay reproducible
+    again = MealPlanOptimizer(recipes, similarity=graph).plan(1800, SHARES, 28, rng=np.random.default_rng(3))
+    assert again == MealPlanOptimizer(recipes, similarity=graph).plan(1800, SHARES, 28, rng=np.random.default_rng(3))
+
+if __name__ == "__main__":
+    test_variants_are_neighbours()
+    test_shared_tempering_is_not_similarity()
+    test_plans_avoid_near_duplicates()
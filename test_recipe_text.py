@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test script for on-demand loading of long recipe text
+"""
+
+import os
+import tempfile
+import tracemalloc
+from database import RecipeDatabase
+from recipe_text import TextCache, CsvTextColumn
+from recipe_catalogue import load_veg_csv
+
+CSV_HEADER = 'Dish,Ingredients,Calories,Protein_g,Carbs_g,Fat_g,Fiber_g,Preparation\r\n'
+
+def write_veg_csv(path, preparation):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        f.write(CSV_HEADER)
+        for i in range(200):
+            f.write(f'Dish {i},"rice, dal",300,10,40,10,5,"{preparation} {i}"\r\n')
+
+def test_csv_text_column():
+    print("📄 Testing CSV text offsets...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'recipes.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(CSV_HEADER)
+            f.write('Upma,"rava, onion",250,6,40,6,3,"Roast rava.\nAdd ""hot"" water, stir."\n')
+            f.write('\n')
+            f.write('Pesarattu, "moong dal" ,220,12,30,5,6, "Grind, then spread thin."\r\n')
+            f.write('Idli,rice,150,4,30,1,1,\n')
+
+        column = CsvTextColumn(path, 'Preparation')
+        texts = [column.get(row) for row in range(len(column))]
+        print(f"   Texts: {texts}")
+        assert texts == ['Roast rava.\nAdd "hot" water, stir.', 'Grind, then spread thin.', None]
+
+def test_text_cache_is_bounded():
+    print("\n🗃️ Testing the text LRU...")
+
+    loads = []
+    cache = TextCache(lambda key: loads.append(key) or f'text {key}', max_entries=2)
+    assert [cache.get(k) for k in (1, 2, 1, 3, 1, 2)] == ['text 1', 'text 2', 'text 1', 'text 3', 'text 1', 'text 2']
+    print(f"   Loads: {loads}")
+    assert loads == [1, 2, 3, 2] and len(cache) == 2
+
+def test_csv_recipes_do_not_hold_text():
+    print("\n📉 Testing catalogue memory against instruction length...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sizes = {}
+        for label, preparation in (('short', 'Cook.'), ('long', 'Stir and simmer gently. ' * 200)):
+            path = os.path.join(tmp, f'{label}.csv')
+            write_veg_csv(path, preparation)
+            load_veg_csv(path)  # warm up pandas' lazy imports
+            tracemalloc.start()
+            recipes = load_veg_csv(path)
+            sizes[label] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            assert len(recipes) == 200
+            assert recipes[7]['instructions'] == f'{preparation} 7'
+            assert recipes[7]['preparation'] == recipes[7]['instructions']
+
+        print(f"   Bytes after load: short {sizes['short']}, long {sizes['long']}")
+        # 200 recipes x ~4.6 KB of text each would add ~900 KB if kept in memory
+        assert sizes['long'] - sizes['short'] < 200 * 1000
+
+def test_list_queries_skip_instructions():
+    print("\n🗄️ Testing deferred instructions in SQL list queries...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        recipe_id = db.add_recipe('Tomato Pappu', ['1 cup toor dal'], 'Cook the dal. ' * 500, 30)
+
+        listed = db.get_all_recipes(with_text=False)[0]
+        assert 'instructions' not in listed
+        assert 'instructions' not in db.search_recipes('Pappu', with_text=False)[0]
+        # Callers that do not opt out (the public JSON API) still get the text
+        assert db.get_all_recipes()[0]['instructions'].startswith('Cook the dal.')
+        assert db.search_recipes('Pappu')[0]['instructions'].startswith('Cook the dal.')
+        assert db.get_recipe_detail(recipe_id)['name'] == 'Tomato Pappu'
+
+        assert db.get_recipe_text(recipe_id).startswith('Cook the dal.')
+        assert len(db.text_cache) == 1
+
+        # Updating the recipe drops cached text
+        db.upsert_recipe('Tomato Pappu', ['1 cup toor dal'], 'Pressure cook the dal.', 30)
+        print(f"   Text after update: {db.get_recipe_text(recipe_id)}")
+        assert db.get_recipe_text(recipe_id) == 'Pressure cook the dal.'
+
+if __name__ == "__main__":
+    test_csv_text_column()
+    test_text_cache_is_bounded()
+    test_csv_recipes_do_not_hold_text()
+    test_list_queries_skip_instructions()
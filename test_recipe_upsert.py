@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test script for idempotent recipe upserts and the content-hash migration
+"""
+
+import os
+import json
+import sqlite3
+import tempfile
+from database import RecipeDatabase
+
+RECIPES = [
+    {'name': 'Tomato Pappu', 'ingredients': ['1 cup toor dal', '2 tomatoes'],
+     'instructions': 'Cook the dal.', 'cooking_time': 30, 'tags': ['vegetarian']},
+    {'name': 'Lemon Rice', 'ingredients': ['2 cups cooked rice', '1 lemon'],
+     'instructions': 'Mix everything.', 'cooking_time': 15}
+]
+
+def count_recipes(db):
+    conn = sqlite3.connect(db.db_path)
+    count = conn.execute('SELECT COUNT(*) FROM recipes').fetchone()[0]
+    conn.close()
+    return count
+
+def test_reload_is_a_no_op():
+    print("🔁 Testing repeated recipe loads...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+
+        first = db.upsert_recipes_bulk(RECIPES)
+        second = db.upsert_recipes_bulk(RECIPES)
+        print(f"   First load ids: {first}, second load ids: {second}")
+        assert first == second
+        assert count_recipes(db) == 2
+
+        # Same name and ingredients (any order or case) is the same recipe
+        same = db.add_recipe('tomato  pappu', ['2 Tomatoes', '1 cup toor dal'], 'Cook the dal.', 30)
+        assert same == first[0]
+        assert count_recipes(db) == 2
+
+def test_changed_fields_are_updated():
+    print("\n✏️ Testing upsert of a changed recipe...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        recipe_id = db.upsert_recipe(**RECIPES[0])
+        db.upsert_recipe(**dict(RECIPES[0], instructions='Cook the dal with tamarind.', cooking_time=35))
+
+        stored = db.get_recipe_detail(recipe_id)
+        print(f"   Stored: {stored['instructions']} ({stored['cooking_time']} min)")
+        assert stored['instructions'] == 'Cook the dal with tamarind.'
+        assert stored['cooking_time'] == 35
+        assert stored['tags'] == ['vegetarian']
+        assert count_recipes(db) == 1
+
+def test_legacy_database_is_migrated():
+    print("\n🧹 Testing migration of a database with duplicate loads...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'recipes.db')
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE recipes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                ingredients TEXT NOT NULL,
+                instructions TEXT NOT NULL,
+                cooking_time INTEGER,
+                difficulty TEXT,
+                category TEXT DEFAULT 'main_course',
+                cuisine_type TEXT DEFAULT 'Telugu',
+                tags TEXT DEFAULT '[]',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        for _ in range(3):  # three clicks on /initialize
+            for recipe in RECIPES:
+                conn.execute('INSERT INTO recipes (name, ingredients, instructions) VALUES (?, ?, ?)',
+                             (recipe['name'], json.dumps(recipe['ingredients']), recipe['instructions']))
+        conn.commit()
+        conn.close()
+
+        db = RecipeDatabase(db_path=path)
+        recipes = db.get_all_recipes()
+        print(f"   Recipes after migration: {[(r['id'], r['name']) for r in recipes]}")
+        assert sorted(r['id'] for r in recipes) == [1, 2]
+        assert recipes[0]['nutrition']['calories'] is None
+        assert len(db.get_content_hashes()) == 2
+
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute('INSERT INTO recipes (name, ingredients, instructions, content_hash) VALUES (?, ?, ?, ?)',
+                         ('Lemon Rice', '[]', '', db.get_content_hashes().pop()))
+            assert False, "duplicate content_hash was accepted"
+        except sqlite3.IntegrityError:
+            print("   Unique index rejects duplicates")
+        conn.close()
+
+def test_repeated_add_keeps_one_nutrition_row():
+    print("\n🥗 Testing nutrition for a recipe posted twice...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = RecipeDatabase(db_path=os.path.join(tmp, 'recipes.db'))
+        for calories in (180, 210):  # what /add_recipe does on each post
+            recipe_id = db.add_recipe(**RECIPES[0])
+            db.add_nutrition(recipe_id, {'calories': calories})
+
+        recipes = db.get_all_recipes()
+        print(f"   Recipes: {[(r['id'], r['name'], r['nutrition']['calories']) for r in recipes]}")
+        assert [(r['id'], r['nutrition']['calories']) for r in recipes] == [(recipe_id, 210)]
+
+        # Bulk loads without replace keep existing nutrition
+        db.add_nutrition_bulk([(recipe_id, {'calories': 999})])
+        assert db.get_recipe_detail(recipe_id)['nutrition']['calories'] == 210
+
+def test_migration_keeps_duplicate_nutrition():
+    print("\n🔀 Testing migration of nutrition stored on duplicates...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'recipes.db')
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE recipes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL,
+                ingredients TEXT NOT NULL,
+                instructions TEXT NOT NULL,
+                cooking_time INTEGER,
+                difficulty TEXT,
+                category TEXT DEFAULT 'main_course',
+                cuisine_type TEXT DEFAULT 'Telugu',
+                tags TEXT DEFAULT '[]',
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE nutrition (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recipe_id INTEGER,
+                calories REAL, protein REAL, carbs REAL, fat REAL, fiber REAL, sugar REAL, sodium REAL,
+                nutrition_data TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        for _ in range(2):
+            for recipe in RECIPES:
+                conn.execute('INSERT INTO recipes (name, ingredients, instructions) VALUES (?, ?, ?)',
+                             (recipe['name'], json.dumps(recipe['ingredients']), recipe['instructions']))
+        # Only the second Tomato Pappu has nutrition; Lemon Rice has two rows
+        conn.execute('INSERT INTO nutrition (recipe_id, calories) VALUES (3, 180)')
+        conn.execute('INSERT INTO nutrition (recipe_id, calories) VALUES (2, 250)')
+        conn.execute('INSERT INTO nutrition (recipe_id, calories) VALUES (2, 260)')
+        conn.commit()
+        conn.close()
+
+        db = RecipeDatabase(db_path=path)
+        recipes = {r['id']: r['nutrition']['calories'] for r in db.get_all_recipes()}
+        print(f"   Calories after migration: {recipes}")
+        assert recipes == {1: 180, 2: 260}
+
+if __name__ == "__main__":
+    test_reload_is_a_no_op()
+    test_changed_fields_are_updated()
+    test_legacy_database_is_migrated()
+    test_repeated_add_keeps_one_nutrition_row()
+    test_migration_keeps_duplicate_nutrition()
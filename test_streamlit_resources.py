@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Test script for the resources shared across Streamlit sessions
+"""
+
+import os
+import time
+from recipe_catalogue import VEG_CSV_PATH
+from streamlit_resources import get_diet_generator, catalogue_version, clear_resources
+from streamlit_app import CalorieAwareMealPlanner
+
+def test_generator_is_shared():
+    print("🔁 Testing the shared diet generator...")
+
+    clear_resources()
+    started = time.perf_counter()
+    first = get_diet_generator()
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    for _ in range(20):
+        assert get_diet_generator() is first
+    warm_ms = (time.perf_counter() - started) * 1000 / 20
+    print(f"   First load {cold_ms:.1f} ms, later reruns {warm_ms:.2f} ms")
+
+    # Each rerun's planner wraps the shared generator
+    planner = CalorieAwareMealPlanner(get_diet_generator())
+    assert planner.diet_generator is first
+    assert planner.generate_varied_meal_plan(1500, days=3, seed=1)
+
+def test_csv_change_rebuilds():
+    print("\n📝 Testing invalidation when a CSV changes...")
+
+    first = get_diet_generator()
+    version = catalogue_version()
+    stat = os.stat(VEG_CSV_PATH)
+    try:
+        os.utime(VEG_CSV_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert catalogue_version() != version
+        assert get_diet_generator() is not first
+    finally:
+        os.utime(VEG_CSV_PATH, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    print(f"   Version back to {catalogue_version()}")
+    assert catalogue_version() == version
+
+if __name__ == "__main__":
+    test_generator_is_shared()
+    test_csv_change_rebuilds()
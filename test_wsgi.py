@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Test script for the production WSGI entry point and load test
+"""
+
+import gc
+import runpy
+import threading
+from werkzeug.serving import make_server
+import config
+from load_test import run_load, worker_counts
+
+def test_preloaded_application():
+    print("🏭 Testing the preloaded WSGI app...")
+
+    import wsgi
+    from recipe_catalogue import get_recipe_catalogue
+
+    assert wsgi.application.debug is False
+    # Catalogue was loaded and frozen before any worker would fork
+    assert set(get_recipe_catalogue()._loaded) == {'veg', 'non_veg', 'database'}
+    print(f"   Frozen objects: {gc.get_freeze_count()}")
+    assert gc.get_freeze_count() > 0
+
+def test_gunicorn_settings():
+    print("\n⚙️ Testing gunicorn settings...")
+
+    try:
+        settings = runpy.run_path('gunicorn.conf.py')
+        # The preloaded app splits per-host resources between the workers
+        assert config.WEB_PROCESSES == config.WEB_WORKERS
+    finally:
+        config.WEB_PROCESSES = 1
+    print(f"   {settings['workers']} workers x {settings['threads']} threads on {settings['bind']}")
+    assert settings['preload_app'] is True
+    assert settings['workers'] == config.WEB_WORKERS
+    assert settings['threads'] == config.WEB_THREADS
+    assert settings['worker_class'] == 'gthread'
+    assert worker_counts(6) == [1, 2, 4, 6]
+
+def test_load_against_dev_server():
+    print("\n🚦 Testing the load generator...")
+
+    import wsgi
+    server = make_server('127.0.0.1', 0, wsgi.application, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        stats = run_load(f'http://127.0.0.1:{server.port}', concurrency=4, duration=1.0, processes=2)
+    finally:
+        server.shutdown()
+
+    print(f"   {stats}")
+    assert stats['requests'] > 0 and stats['errors'] == 0
+    assert stats['p95_ms'] >= stats['p50_ms']
+
+if __name__ == "__main__":
+    test_preloaded_application()
+    test_gunicorn_settings()
+    test_load_against_dev_server()
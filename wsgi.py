@@ -0,0 +1,36 @@
+"""
+Production WSGI entry point.
+
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+With preload_app the master imports this module once: the app, its
+database/nutrition/diet components and the recipe catalogue are built
+before the workers fork, so every worker shares them copy-on-write.
+"""
+
+import gc
+from app import app, diet_generator
+from recipe_catalogue import get_recipe_catalogue
+from candidate_pools import get_candidate_pools
+from recipe_similarity import get_similarity_graph
+
+application = app
+application.debug = False
+
+
+def warm_up():
+    """Load the read-mostly state every worker needs, then freeze it for copy-on-write"""
+    catalogue = get_recipe_catalogue()
+    for recipes in (catalogue.veg_recipes(), catalogue.non_veg_recipes()):
+        get_candidate_pools(recipes)
+        get_similarity_graph(recipes)
+    catalogue.database_recipes()
+    diet_generator.catalogue_version()
+
+    # Move everything loaded so far out of the collector's generations, so
+    # gc passes in the workers do not write to (and un-share) those pages
+    gc.collect()
+    gc.freeze()
+
+
+warm_up()